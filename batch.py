@@ -0,0 +1,242 @@
+"""Corpus batch mode: fan analysis targets out over forked worker processes"""
+
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+from multiprocessing.connection import wait
+
+import global_params
+
+log = logging.getLogger(__name__)
+
+ADDRESS_PATTERN = re.compile(r"^0x[0-9a-fA-F]{40}$")
+
+DEFECTS = (
+    "privileged_address",
+    "unrestricted_from_and_owner_inconsistency",
+    "empty_transfer_event",
+)
+
+
+def is_address(target):
+    return bool(ADDRESS_PATTERN.match(target))
+
+
+def load_targets(path):
+    """Collect analysis targets from a CSV, a directory or a file list
+
+    Args:
+        path (str): a CSV whose first column holds contract addresses or source files,
+            a directory whose top-level *.sol files are analyzed,
+            or a text file with one address or source file per line.
+
+    Returns:
+        list: de-duplicated targets in input order
+    """
+    if os.path.isdir(path):
+        targets = [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if name.endswith(".sol")
+        ]
+    elif path.endswith(".csv"):
+        with open(path, "r", encoding="utf-8") as f:
+            targets = [row[0].strip() for row in csv.reader(f) if row]
+        # skip the header row and anything else that is not analyzable
+        targets = [t for t in targets if is_address(t) or t.endswith(".sol")]
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            targets = [line.strip() for line in f]
+        targets = [t for t in targets if t and not t.startswith("#")]
+    return list(dict.fromkeys(targets))
+
+
+def load_completed(output):
+    """Read the targets already recorded in a JSONL result file
+
+    A line cut short by a crash is dropped from the file so that appending
+    resumes right after the last completed record.
+
+    Args:
+        output (str): path of the JSONL result file
+
+    Returns:
+        set: targets that already have a record
+    """
+    completed = set()
+    if not os.path.exists(output):
+        return completed
+    valid_size = 0
+    with open(output, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            completed.add(record["target"])
+            valid_size += len(line)
+    if valid_size != os.path.getsize(output):
+        log.warning("Dropping incomplete record at the end of %s", output)
+        with open(output, "r+b") as f:
+            f.truncate(valid_size)
+    return completed
+
+
+def summarize(results):
+    """Flatten the per-contract results of one target into a JSONL record
+
+    Args:
+        results (dict): results keyed by contract source then contract name,
+            as returned by run_solidity_analysis
+
+    Returns:
+        dict: defect flags of the target and the flags, coverage and timing of each contract
+    """
+    record = {
+        "bool_defect": dict((defect, False) for defect in DEFECTS),
+        "contracts": {},
+    }
+    for c_source in results or {}:
+        for c_name, result in results[c_source].items():
+            for defect in DEFECTS:
+                if result["bool_defect"][defect]:
+                    record["bool_defect"][defect] = True
+            record["contracts"][c_source + ":" + c_name] = {
+                "bool_defect": result["bool_defect"],
+                "evm_code_coverage": result["evm_code_coverage"],
+                "instructions": result["instructions"],
+                "time": result["time"],
+            }
+    return record
+
+
+def _run_target(analyze, target, conn):
+    """Worker body: analyze one target and send its record to the parent"""
+    # the JSONL stream is the batch output, keep the prints out of the way
+    global_params.HEADLESS = 1
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    global_params.AST_JSON = "temp.%d.json" % os.getpid()
+
+    begin = time.time()
+    record = {"target": target}
+    try:
+        results, exit_code = analyze(target)
+        record.update(summarize(results))
+        record["status"] = "ok"
+        record["exit_code"] = exit_code
+    except SystemExit as e:
+        record["status"] = "error"
+        record["exit_code"] = e.code
+    except Exception as e:
+        record["status"] = "error"
+        record["exit_code"] = 1
+        record["error"] = str(e)
+    finally:
+        if os.path.exists(global_params.AST_JSON):
+            os.unlink(global_params.AST_JSON)
+    record["wall_time"] = round(time.time() - begin, 2)
+    conn.send(record)
+    conn.close()
+
+
+def run_batch(targets, analyze, output, workers=1, timeout=900):
+    """Analyze targets in forked workers and stream one JSON line per target
+
+    Each target runs in its own process forked from the already initialized
+    parent, so interpreter start-up and imports are paid once while the
+    class-level state of the inputter starts fresh for every contract.
+
+    Args:
+        targets (list): contract addresses or source files
+        analyze (callable): target -> (results, exit_code)
+        output (str): JSONL file receiving the records, resumed if it exists
+        workers (int, optional): number of concurrent workers. Defaults to 1.
+        timeout (int, optional): wall-clock budget per target in secs. Defaults to 900.
+
+    Returns:
+        int: number of targets that did not finish with status "ok"
+    """
+    completed = load_completed(output)
+    pending = [target for target in targets if target not in completed]
+    log.info(
+        "Batch: %d targets, %d already done, %d workers",
+        len(targets),
+        len(targets) - len(pending),
+        workers,
+    )
+    pending.reverse()
+    total = len(pending)
+    finished = 0
+    failures = 0
+    ctx = multiprocessing.get_context("fork")
+    running = {}  # receiving end => (process, target, start time)
+
+    with open(output, "a", encoding="utf-8") as out:
+
+        def emit(record):
+            nonlocal finished, failures
+            finished += 1
+            if record["status"] != "ok":
+                failures += 1
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            log.info(
+                "[%d/%d] %s: %s", finished, total, record["target"], record["status"]
+            )
+
+        while pending or running:
+            while pending and len(running) < workers:
+                target = pending.pop()
+                recv_end, send_end = ctx.Pipe(duplex=False)
+                process = ctx.Process(
+                    target=_run_target, args=(analyze, target, send_end)
+                )
+                process.start()
+                send_end.close()
+                running[recv_end] = (process, target, time.time())
+
+            for conn in wait(list(running.keys()), timeout=0.5):
+                process, target, start = running.pop(conn)
+                try:
+                    record = conn.recv()
+                except EOFError:
+                    # the worker died before reporting, e.g. killed by the OOM killer
+                    record = None
+                conn.close()
+                process.join()
+                if record is None:
+                    record = {
+                        "target": target,
+                        "status": "error",
+                        "exit_code": process.exitcode,
+                        "wall_time": round(time.time() - start, 2),
+                    }
+                emit(record)
+
+            now = time.time()
+            for conn, (process, target, start) in list(running.items()):
+                if now - start > timeout:
+                    process.kill()
+                    process.join()
+                    conn.close()
+                    ast_json = "temp.%d.json" % process.pid
+                    if os.path.exists(ast_json):
+                        os.unlink(ast_json)
+                    del running[conn]
+                    emit(
+                        {
+                            "target": target,
+                            "status": "timeout",
+                            "exit_code": None,
+                            "wall_time": round(now - start, 2),
+                        }
+                    )
+    return failures
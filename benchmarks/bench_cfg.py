@@ -0,0 +1,84 @@
+"""Benchmark of the CFG construction (collect_vertices, construct_bb) by code size
+
+Compares the former construct_bb, which found the first instruction of every
+block with a linear search in the sorted addresses, against the current one
+on random code of growing size, to show how both scale.
+
+Usage: python benchmarks/bench_cfg.py [runtime bytecode file ...]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_dispatch import synthetic_bytecode
+
+from cfg_builder import sym_exec
+from cfg_builder.basicblock import BasicBlock
+from cfg_builder.disassembler import disassemble
+
+SIZES = (5000, 10000, 20000, 40000)
+
+
+def construct_bb_linear_search():
+    """construct_bb before the instructions were sliced out of one list"""
+    instructions = sym_exec.instructions
+    sorted_addresses = sorted(instructions.keys())
+    size = len(sorted_addresses)
+    for key in sym_exec.end_ins_dict:
+        end_address = sym_exec.end_ins_dict[key]
+        block = BasicBlock(key, end_address)
+        if key not in instructions:
+            continue
+        block.add_instruction(instructions[key])
+        i = sorted_addresses.index(key) + 1
+        while i < size and sorted_addresses[i] <= end_address:
+            block.add_instruction(instructions[sorted_addresses[i]])
+            i += 1
+        block.set_block_type(sym_exec.jump_type[key])
+        sym_exec.vertices[key] = block
+        sym_exec.blocks[key] = end_address
+        sym_exec.edges[key] = []
+
+
+def build(disassembly, construct_bb):
+    sym_exec.g_src_map = None
+    for name in ("end_ins_dict", "instructions", "jump_type", "vertices", "edges", "blocks"):
+        setattr(sym_exec, name, {})
+    sym_exec.collect_vertices(disassembly)
+    construct_bb()
+    sym_exec.construct_static_edges()
+
+
+def main():
+    if len(sys.argv) > 1:
+        bytecodes = []
+        for path in sys.argv[1:]:
+            with open(path) as f:
+                bytecodes.append((os.path.basename(path), f.read().strip()))
+    else:
+        bytecodes = [
+            ("%d bytes" % size, synthetic_bytecode(size, seed=size)) for size in SIZES
+        ]
+
+    for label, bytecode in bytecodes:
+        disassembly = list(disassemble(bytecode))
+        build(disassembly, sym_exec.construct_bb)
+        blocks = len(sym_exec.vertices)
+        for variant, construct_bb in (
+            ("linear search", construct_bb_linear_search),
+            ("sliced", sym_exec.construct_bb),
+        ):
+            best = min(
+                timeit.repeat(lambda: build(disassembly, construct_bb), number=1, repeat=3)
+            )
+            print(
+                "%-12s %-14s %8.1f ms (%d instructions, %d blocks)"
+                % (label, variant, best * 1e3, len(disassembly), blocks)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Microbenchmark of the per-instruction dispatch of sym_exec_ins
+
+Compares the former if/elif chain on opcode names against the opcode-indexed
+handler table, with no-op handlers so that only the dispatch is measured.
+
+Usage: python benchmarks/bench_dispatch.py [runtime bytecode file]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cfg_builder.disassembler import OPCODE_NAMES, disassemble
+
+# branch order of the former chain in sym_exec_ins
+CHAIN = [
+    "STOP", "ADD", "MUL", "SUB", "DIV", "SDIV", "MOD", "SMOD", "ADDMOD", "MULMOD",
+    "EXP", "SIGNEXTEND", "LT", "GT", "SLT", "SGT", "EQ", "ISZERO", "AND", "OR",
+    "XOR", "NOT", "BYTE", ("KECCAK256", "SHA3"), "ADDRESS", "BALANCE", "CALLER",
+    "ORIGIN", "CALLVALUE", "CALLDATALOAD", "CALLDATASIZE", "CALLDATACOPY",
+    "CODESIZE", "CODECOPY", "RETURNDATACOPY", "RETURNDATASIZE", "GASPRICE",
+    "EXTCODESIZE", "EXTCODECOPY", "BLOCKHASH", "COINBASE", "TIMESTAMP", "NUMBER",
+    "DIFFICULTY", "GASLIMIT", "POP", "MLOAD", "MSTORE", "MSTORE8", "SLOAD",
+    "SSTORE", "JUMP", "JUMPI", "PC", "MSIZE", "GAS", "JUMPDEST", "PUSH*", "DUP*",
+    "SWAP*", ("LOG0", "LOG1", "LOG2", "LOG3", "LOG4"), ("CREATE", "CREATE2"),
+    "CALL", "CALLCODE", ("DELEGATECALL", "STATICCALL"), ("RETURN", "REVERT"),
+    "SELFDESTRUCT", "SHL", "SHR", "SAR", "SELFBALANCE", "CHAINID", "BASEFEE",
+]
+
+
+def handler(params, block, instr, func_call, current_func_name):
+    pass
+
+
+def build_chain():
+    lines = ["def dispatch_chain(instr):", "    opcode = instr.name"]
+    for i, branch in enumerate(CHAIN):
+        keyword = "if" if i == 0 else "elif"
+        if isinstance(branch, tuple):
+            condition = "opcode in %r" % (branch,)
+        elif branch.endswith("*"):
+            condition = "opcode.startswith(%r, 0)" % branch[:-1]
+        else:
+            condition = "opcode == %r" % branch
+        lines.append("    %s %s:" % (keyword, condition))
+        lines.append("        handler(None, 0, instr, False, '')")
+    lines.append("    else:")
+    lines.append("        raise Exception('UNKNOWN INSTRUCTION: ' + opcode)")
+    namespace = {"handler": handler}
+    exec("\n".join(lines), namespace)
+    return namespace["dispatch_chain"]
+
+
+def build_table():
+    table = [None] * 256
+    for opcode, name in OPCODE_NAMES.items():
+        if name not in ("INVALID", "EXTCODEHASH"):
+            table[opcode] = handler
+
+    def dispatch_table(instr):
+        opcode = instr.name
+        handler = table[instr.opcode]
+        if handler is None:
+            raise Exception("UNKNOWN INSTRUCTION: " + opcode)
+        handler(None, 0, instr, False, "")
+
+    return dispatch_table
+
+
+def synthetic_bytecode(size=20000, seed=0):
+    """Random code with roughly the opcode mix of solc output"""
+    rng = random.Random(seed)
+    common = [0x60, 0x61, 0x80, 0x81, 0x82, 0x90, 0x91, 0x50, 0x5B, 0x56, 0x57,
+              0x52, 0x51, 0x01, 0x03, 0x14, 0x15, 0x16, 0x1B, 0x1C, 0x54, 0x55]
+    code = bytearray()
+    while len(code) < size:
+        opcode = rng.choice(common) if rng.random() < 0.85 else rng.choice(
+            list(OPCODE_NAMES)
+        )
+        code.append(opcode)
+        if 0x60 <= opcode <= 0x7F:
+            code += bytes(rng.randrange(256) for _ in range(opcode - 0x5F))
+    return code.hex()
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            bytecode = f.read().strip()
+    else:
+        bytecode = synthetic_bytecode()
+    instrs = [
+        instr
+        for instr in disassemble(bytecode)
+        if instr.name not in ("INVALID", "EXTCODEHASH") and instr.opcode in OPCODE_NAMES
+    ]
+
+    for label, dispatch in (("if/elif chain", build_chain()), ("table", build_table())):
+
+        def run():
+            for instr in instrs:
+                dispatch(instr)
+
+        best = min(timeit.repeat(run, number=5, repeat=5)) / 5
+        print(
+            "%-14s %8.1f ns/instruction (%d instructions)"
+            % (label, best / len(instrs) * 1e9, len(instrs))
+        )
+
+
+if __name__ == "__main__":
+    main()
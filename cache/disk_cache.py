@@ -0,0 +1,77 @@
+import json
+import logging
+import os
+import tempfile
+
+log = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Size-bounded key/value store of JSON documents in a directory
+
+    Every entry is one file named by its key. Reading an entry refreshes its
+    mtime, and writes evict the least recently used entries once the
+    directory grows beyond max_bytes. Entries are replaced atomically, so
+    concurrent batch workers may share a cache directory.
+    """
+
+    SUFFIX = ".json"
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + DiskCache.SUFFIX)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            log.warning("Could not write cache entry %s: %s", path, e)
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(DiskCache.SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+
+import global_params
+from cache.disk_cache import DiskCache
+
+# parameters that change what symbolic execution reports for the same bytecode
+RESULT_PARAMS = (
+    "LOOP_LIMIT",
+    "DEPTH_LIMIT",
+    "GAS_LIMIT",
+    "TIMEOUT",
+    "SHORT_TIMEOUT",
+    "UNKNOWN_POLICY",
+    "PORTFOLIO",
+    "PORTFOLIO_THRESHOLD",
+    "GLOBAL_TIMEOUT",
+    "TARGET_FUNCTION",
+    "SEARCH",
+)
+
+
+def _cache():
+    return DiskCache(
+        os.path.join(global_params.CACHE_DIR, "results"),
+        global_params.RESULT_CACHE_SIZE,
+    )
+
+
+def source_map_fingerprint(source_map):
+    """Hash what the detectors read from the source map
+
+    The detectors match the source snippet of each instruction and the names
+    of the public functions, not offsets or paths, so byte-identical clones
+    that only differ in file names, comments or layout share a fingerprint.
+    """
+    content = source_map.source.content
+    snippets = [
+        None
+        if position is None
+        else [
+            position.get("name"),
+            position.get("value"),
+            content[position["begin"] : position["end"]],
+        ]
+        for position in source_map.positions
+    ]
+    document = json.dumps(
+        {"snippets": snippets, "sig_to_func": source_map.sig_to_func}, sort_keys=True
+    )
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def result_key(inp):
+    """Cache key of one analysis input
+
+    Args:
+        inp (dict): an input of InputHelper.get_inputs
+
+    Returns:
+        str: hex digest over the swarm-stripped runtime bytecode, the source map
+            fingerprint and the analysis parameters
+    """
+    document = json.dumps(
+        {
+            "version": global_params.RESULT_CACHE_VERSION,
+            "bytecode": hashlib.sha256(inp["bytecode"].encode("utf-8")).hexdigest(),
+            "source_map": source_map_fingerprint(inp["source_map"]),
+            "params": dict(
+                (param, getattr(global_params, param)) for param in RESULT_PARAMS
+            ),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def get(key):
+    """Look up the (result, return_code) of a previous analysis, None on a miss"""
+    entry = _cache().get(key)
+    if entry is None:
+        return None
+    return entry["result"], entry["return_code"]
+
+
+def put(key, result, return_code):
+    _cache().put(key, {"result": result, "return_code": return_code})
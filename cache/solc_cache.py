@@ -0,0 +1,177 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+
+import global_params
+from cache.disk_cache import DiskCache
+from cfg_builder.utils import run_command, run_command_with_err
+
+log = logging.getLogger(__name__)
+
+# every artifact the inputter reads, requested from a single solc run
+COMPILE_KINDS = "asm,ast,bin-runtime,hashes,storage-layout"
+
+# solc 0.4/0.5 predates storage-layout, the low version inputter does without it
+LOW_VERSION_COMPILE_KINDS = "asm,ast,hashes"
+
+# (kinds, source file, solc arguments, solc version) => combined json output of
+# this process
+_compilations = {}
+
+IMPORT_PATTERN = re.compile(
+    r"""^\s*import\s+(?:[^;"']*?\s+from\s+)?["']([^"']+)["']""", re.MULTILINE
+)
+COMMENT_PATTERN = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+class CompilationError(Exception):
+    pass
+
+
+def _cache():
+    return DiskCache(
+        os.path.join(global_params.CACHE_DIR, "solc"), global_params.SOLC_CACHE_SIZE
+    )
+
+
+def _parse_remaps(options):
+    """Collect the prefix=target remappings among solc command line arguments"""
+    remaps = []
+    for arg in options.split():
+        if "=" not in arg or arg.startswith("-"):
+            continue
+        prefix, target = arg.split("=", 1)
+        # drop the optional context of a remapping (context:prefix=target)
+        prefix = prefix.split(":", 1)[-1]
+        remaps.append((prefix, target))
+    # the longest prefix wins, as in solc
+    remaps.sort(key=lambda remap: len(remap[0]), reverse=True)
+    return remaps
+
+
+def _resolve_import(path, importer, root_dir, remaps):
+    if path.startswith("./") or path.startswith("../"):
+        candidates = [os.path.join(os.path.dirname(importer), path)]
+    else:
+        candidates = []
+        for prefix, target in remaps:
+            if path.startswith(prefix):
+                candidates.append(target + path[len(prefix) :])
+                break
+        candidates += [path, os.path.join(root_dir, path)]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return os.path.normpath(candidate)
+    return None
+
+
+def source_tree_hash(filename, options=""):
+    """Hash the content of a source file and everything it imports
+
+    Args:
+        filename (str): the compiled source file
+        options (str): the remaining solc arguments, remappings included
+
+    Returns:
+        str: hex digest, or None when an import cannot be located on disk
+    """
+    remaps = _parse_remaps(options)
+    root_dir = os.path.dirname(filename)
+    digests = {}
+    pending = [os.path.normpath(filename)]
+    while pending:
+        path = pending.pop()
+        if path in digests:
+            continue
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        digests[path] = hashlib.sha256(content).hexdigest()
+        code = COMMENT_PATTERN.sub("", content.decode("utf-8", "replace"))
+        for imported in IMPORT_PATTERN.findall(code):
+            resolved = _resolve_import(imported, path, root_dir, remaps)
+            if resolved is None:
+                log.debug("Cannot locate import %s of %s", imported, path)
+                return None
+            pending.append(resolved)
+    document = json.dumps(sorted(digests.items()))
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def solc_version():
+    """Output of solc --version, cleared by the switches of solc version"""
+    return run_command("solc --version")
+
+
+def solc_key(kinds, filename, options=""):
+    tree_hash = source_tree_hash(filename, options)
+    if tree_hash is None:
+        return None
+    document = json.dumps([tree_hash, solc_version(), kinds, filename, options])
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def combined_json(kinds, filename, options=""):
+    """Run solc --combined-json, reusing the output of an identical compilation
+
+    The output is reused when the source file and its imports, the solc version
+    and the remaining arguments (e.g. remappings) are unchanged.
+
+    Args:
+        kinds (str): comma separated output kinds, e.g. "ast,storage-layout"
+        filename (str): the compiled source file
+        options (str, optional): the remaining solc arguments. Defaults to "".
+
+    Returns:
+        dict: the decoded combined json output
+    """
+    key = solc_key(kinds, filename, options) if global_params.USE_CACHE else None
+    if key:
+        out = _cache().get(key)
+        if out is not None:
+            return out
+    out, err = run_command_with_err(
+        "solc --combined-json %s %s %s" % (kinds, filename, options)
+    )
+    try:
+        out = json.loads(out)
+    except ValueError:
+        raise CompilationError(err)
+    if key:
+        _cache().put(key, out)
+    return out
+
+
+def solc_options(remap, allow_paths=""):
+    """solc arguments of the inputter: the remappings, then --allow-paths"""
+    options = list(remap)
+    if allow_paths:
+        options.append("--allow-paths %s" % allow_paths)
+    return " ".join(options)
+
+
+def compile_all(filename, options="", kinds=COMPILE_KINDS):
+    """Compile a source file once per process for all of the inputter
+
+    InputHelper, SourceMap, AstHelper and SlotMap all read the output of this
+    single solc run: the output is memoized per source file, solc arguments
+    and solc version, and they all pass the arguments of solc_options().
+
+    Args:
+        filename (str): the compiled source file
+        options (str, optional): the remaining solc arguments. Defaults to "".
+        kinds (str, optional): comma separated output kinds. Defaults to COMPILE_KINDS.
+
+    Returns:
+        dict: the decoded combined json output
+    """
+    key = (kinds, filename, options, solc_version())
+    if key not in _compilations:
+        _compilations[key] = combined_json(kinds, filename, options)
+    return _compilations[key]
@@ -7,7 +7,7 @@ class BasicBlock:
     def __init__(self, start_address, end_address):
         self.start = start_address
         self.end = end_address
-        self.instructions = []  # each instruction is a string
+        self.instructions = []  # each instruction is a decoded Instruction
         self.jump_target = 0
 
     def get_start_address(self):
@@ -19,6 +19,9 @@ class BasicBlock:
     def add_instruction(self, instruction):
         self.instructions.append(instruction)
 
+    def set_instructions(self, instructions):
+        self.instructions = instructions
+
     def get_instructions(self):
         return self.instructions
 
@@ -0,0 +1,160 @@
+"""Checking constraints one independent group at a time
+
+Constraints that share no variable, directly or through other constraints,
+are satisfied independently of each other, so a set of constraints is
+satisfiable when each of its independent groups is. A branch condition
+usually involves a few variables of the path: only its group is new to the
+solver, the other groups were decided by earlier queries and come from the
+query cache.
+"""
+
+import time
+
+from z3 import Z3_OP_UNINTERPRETED, is_app, is_quantifier, sat, unknown, unsat
+
+from cfg_builder import portfolio
+from cfg_builder.query_cache import query_cache
+
+# id of an expression => (expression, names of its variables), the expression
+# is kept so that its id is not reused
+_variables = {}
+
+
+def reset():
+    _variables.clear()
+
+
+def variables(expression):
+    """Names of the uninterpreted constants and functions in expression"""
+    key = expression.get_id()
+    entry = _variables.get(key)
+    if entry is not None:
+        return entry[1]
+    names = set()
+    seen = set()
+    todo = [expression]
+    while todo:
+        node = todo.pop()
+        node_id = node.get_id()
+        if node_id in seen:
+            continue
+        seen.add(node_id)
+        if is_quantifier(node):
+            todo.append(node.body())
+        elif is_app(node):
+            decl = node.decl()
+            if decl.kind() == Z3_OP_UNINTERPRETED:
+                names.add(decl.name())
+            todo.extend(node.children())
+    names = frozenset(names)
+    _variables[key] = (expression, names)
+    return names
+
+
+def independent_groups(constraints):
+    """Partition constraints into groups that share no variable
+
+    Constraints without variables form one group of their own.
+
+    Returns:
+        list: (constraints, variable names) of every group
+    """
+    parent = {}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    constraint_names = []
+    for constraint in constraints:
+        names = variables(constraint)
+        constraint_names.append(names)
+        root = None
+        for name in names:
+            if name not in parent:
+                parent[name] = name
+            if root is None:
+                root = find(name)
+            else:
+                other = find(name)
+                if other != root:
+                    parent[other] = root
+
+    groups = {}
+    for constraint, names in zip(constraints, constraint_names):
+        root = find(next(iter(names))) if names else None
+        group = groups.get(root)
+        if group is None:
+            group = groups[root] = ([], set())
+        group[0].append(constraint)
+        group[1].update(names)
+    return list(groups.values())
+
+
+def check_constraints(solver, conditions=()):
+    """Check the constraints of a PathSolver and conditions, group by group
+
+    Groups decided before come from the query cache. The others are checked
+    on their own when they hold at most half of the constraints, otherwise
+    the incremental solver, which has the constraints already internalized,
+    checks everything at once and its model is kept for every group. When
+    it cannot decide them within portfolio.local_budget, the groups are
+    raced in the portfolio one by one with the rest of the budget.
+
+    Returns:
+        tuple: sat, unsat or unknown, and when sat the (variable names, model)
+            of every group
+    """
+    constraints = solver.assertions() + list(conditions)
+    models = []
+    undecided = []
+    for group, names in independent_groups(constraints):
+        entry = query_cache.lookup(group)
+        if entry is None:
+            undecided.append((group, names))
+        elif entry[0] == unsat:
+            return unsat, []
+        else:
+            models.append((names, entry[1]))
+    if not undecided:
+        return sat, models
+
+    most = 2 * sum(len(group) for group, _ in undecided) > len(constraints)
+    if most:
+        begin = time.time()
+        result, model = solver.check_incremental(conditions)
+        if result == unsat:
+            if len(undecided) == 1:
+                query_cache.store(undecided[0][0], unsat)
+            return result, []
+        if result == sat:
+            for group, names in undecided:
+                query_cache.store(group, sat, model)
+                models.append((names, model))
+            return sat, models
+        deadline = begin + solver.timeout / 1000.0
+        if not portfolio.enabled() or time.time() >= deadline:
+            return result, []
+
+    result = sat
+    for group, names in undecided:
+        if most:
+            remaining = int((deadline - time.time()) * 1000)
+            if remaining > 0:
+                group_result, model = query_cache.race(group, remaining)
+            else:
+                group_result, model = unknown, None
+        else:
+            group_result, model = query_cache.check(group, solver.timeout)
+        if group_result == unsat:
+            return unsat, []
+        if group_result == unknown:
+            solver.reason = query_cache.reason_unknown
+            result = unknown
+        else:
+            models.append((names, model))
+    if result != sat:
+        return result, []
+    return result, models
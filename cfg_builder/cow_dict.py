@@ -0,0 +1,103 @@
+def is_container(value):
+    """Whether value is part of the state to copy on write, see CowDict"""
+    return isinstance(value, (dict, list)) or hasattr(value, "fork")
+
+
+def cow_copy(value):
+    """Copy one level of a state container, sharing everything below it"""
+    if isinstance(value, dict):
+        return CowDict(value)
+    if isinstance(value, list):
+        return value.copy()
+    if hasattr(value, "fork"):
+        return value.fork()
+    return value
+
+
+class CowDict(dict):
+    """Dictionary whose containers are copied the first time they are looked up
+
+    fork() makes a shallow copy and marks the dict and list values, and the
+    values with a fork() method of their own, as shared on both sides.
+    Whichever side indexes a shared value first replaces it with its own
+    one-level copy (nested dicts become CowDicts in turn), so the value the
+    two sides had in common is never modified. A transition only
+    copies the parts of the state it reaches instead of the whole state.
+
+    Shared values are protected when they are reached through the mapping
+    interface: indexing, get, pop, setdefault, values and items. References
+    obtained before fork() must not be used to modify the state afterwards.
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self._shared = set(
+            key for key, value in dict.items(self) if is_container(value)
+        )
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key in self._shared:
+            self._shared.discard(key)
+            value = cow_copy(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        self._shared.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._shared.discard(key)
+        dict.__delitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *default):
+        if key in self._shared:
+            # the other side keeps the value, hand out a copy of it
+            self._shared.discard(key)
+            return cow_copy(dict.pop(self, key))
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        if key in self._shared:
+            self._shared.discard(key)
+            value = cow_copy(value)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        for other in args + (kwargs,):
+            # items() of a CowDict copies its shared values, dict() would not
+            pairs = other.items() if hasattr(other, "items") else other
+            for key, value in pairs:
+                self[key] = value
+
+    def clear(self):
+        self._shared.clear()
+        dict.clear(self)
+
+    def values(self):
+        """The values, shared ones copied first like __getitem__ does"""
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def fork(self):
+        child = CowDict(self)
+        self._shared = set(child._shared)
+        return child
+
+    def copy(self):
+        return self.fork()
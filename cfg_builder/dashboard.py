@@ -0,0 +1,98 @@
+"""Live tables of the exploration, redrawn apart from the instruction loop
+
+The instruction loop only records where it is in a Progress. A Dashboard
+thread samples it, together with the coverage sets of the executor, RATE
+times a second and redraws the tables. With HEADLESS = 1 no dashboard is
+started and nothing is drawn.
+
+The explorer forks workers (PARALLEL, PORTFOLIO) while the dashboard runs.
+A fork waits for the redraw in progress, so that no child starts with the
+lock of the console held by the dashboard thread, and the dashboard leaves
+stdout and stderr alone for the children to write to.
+"""
+
+import contextlib
+import os
+import threading
+
+from rich.console import Console
+from rich.live import Live
+from rich.table import Table
+
+import global_params
+
+# redraws per second
+RATE = 4
+
+# held while the tables are redrawn, and by a fork for the time it takes
+_redrawing = threading.Lock()
+os.register_at_fork(
+    before=_redrawing.acquire,
+    after_in_parent=_redrawing.release,
+    after_in_child=_redrawing.release,
+)
+
+
+class Progress:
+    """Last instruction executed, written by the instruction loop"""
+
+    __slots__ = ("pc", "opcode", "function")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pc = 0
+        self.opcode = ""
+        self.function = ""
+
+
+class Dashboard:
+    """Context redrawing render() RATE times a second while it is entered
+
+    render is called on the thread of the dashboard and returns the tables.
+    """
+
+    def __init__(self, render, rate=RATE):
+        self.render = render
+        self.interval = 1.0 / rate
+        self.live = Live(
+            Table(),
+            console=Console(),
+            vertical_overflow="crop",
+            auto_refresh=False,
+            redirect_stdout=False,
+            redirect_stderr=False,
+        )
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def __enter__(self):
+        self.live.start()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+        # last state of the exploration
+        self.redraw()
+        self.live.stop()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.redraw()
+
+    def redraw(self):
+        with _redrawing:
+            self.live.update(self.render(), refresh=True)
+
+
+def dashboard(render):
+    """A Dashboard of render, or a context that does nothing when headless"""
+    if global_params.HEADLESS:
+        return contextlib.nullcontext()
+    return Dashboard(render)
+
+
+progress = Progress()
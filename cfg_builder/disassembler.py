@@ -0,0 +1,191 @@
+"""In-process EVM disassembler, with the opcode names of geth's evm disasm"""
+
+import logging
+
+log = logging.getLogger(__name__)
+
+OPCODE_NAMES = {
+    0x00: "STOP",
+    0x01: "ADD",
+    0x02: "MUL",
+    0x03: "SUB",
+    0x04: "DIV",
+    0x05: "SDIV",
+    0x06: "MOD",
+    0x07: "SMOD",
+    0x08: "ADDMOD",
+    0x09: "MULMOD",
+    0x0A: "EXP",
+    0x0B: "SIGNEXTEND",
+    0x10: "LT",
+    0x11: "GT",
+    0x12: "SLT",
+    0x13: "SGT",
+    0x14: "EQ",
+    0x15: "ISZERO",
+    0x16: "AND",
+    0x17: "OR",
+    0x18: "XOR",
+    0x19: "NOT",
+    0x1A: "BYTE",
+    0x1B: "SHL",
+    0x1C: "SHR",
+    0x1D: "SAR",
+    0x20: "KECCAK256",
+    0x30: "ADDRESS",
+    0x31: "BALANCE",
+    0x32: "ORIGIN",
+    0x33: "CALLER",
+    0x34: "CALLVALUE",
+    0x35: "CALLDATALOAD",
+    0x36: "CALLDATASIZE",
+    0x37: "CALLDATACOPY",
+    0x38: "CODESIZE",
+    0x39: "CODECOPY",
+    0x3A: "GASPRICE",
+    0x3B: "EXTCODESIZE",
+    0x3C: "EXTCODECOPY",
+    0x3D: "RETURNDATASIZE",
+    0x3E: "RETURNDATACOPY",
+    0x3F: "EXTCODEHASH",
+    0x40: "BLOCKHASH",
+    0x41: "COINBASE",
+    0x42: "TIMESTAMP",
+    0x43: "NUMBER",
+    0x44: "DIFFICULTY",
+    0x45: "GASLIMIT",
+    0x46: "CHAINID",
+    0x47: "SELFBALANCE",
+    0x48: "BASEFEE",
+    0x50: "POP",
+    0x51: "MLOAD",
+    0x52: "MSTORE",
+    0x53: "MSTORE8",
+    0x54: "SLOAD",
+    0x55: "SSTORE",
+    0x56: "JUMP",
+    0x57: "JUMPI",
+    0x58: "PC",
+    0x59: "MSIZE",
+    0x5A: "GAS",
+    0x5B: "JUMPDEST",
+    0x5F: "PUSH0",
+    0xF0: "CREATE",
+    0xF1: "CALL",
+    0xF2: "CALLCODE",
+    0xF3: "RETURN",
+    0xF4: "DELEGATECALL",
+    0xF5: "CREATE2",
+    0xFA: "STATICCALL",
+    0xFD: "REVERT",
+    0xFE: "INVALID",
+    0xFF: "SELFDESTRUCT",
+}
+for i in range(32):
+    OPCODE_NAMES[0x60 + i] = "PUSH%d" % (i + 1)
+for i in range(16):
+    OPCODE_NAMES[0x80 + i] = "DUP%d" % (i + 1)
+    OPCODE_NAMES[0x90 + i] = "SWAP%d" % (i + 1)
+for i in range(5):
+    OPCODE_NAMES[0xA0 + i] = "LOG%d" % i
+
+# opcode name => opcode byte
+OPCODES = dict((name, opcode) for opcode, name in OPCODE_NAMES.items())
+
+PUSH0 = 0x5F
+PUSH1 = 0x60
+PUSH32 = 0x7F
+DUP1 = 0x80
+SWAP1 = 0x90
+LOG0 = 0xA0
+
+
+class Instruction:
+    """A decoded instruction, built once per contract when the CFG is constructed
+
+    Attributes:
+        pc (int): offset of the instruction in the runtime bytecode
+        opcode (int): the opcode byte
+        name (str): the opcode name
+        operand (int): the pushed value of a PUSH instruction, None otherwise
+    """
+
+    __slots__ = ("pc", "opcode", "name", "operand")
+
+    def __init__(self, pc, opcode, name, operand=None):
+        self.pc = pc
+        self.opcode = opcode
+        self.name = name
+        self.operand = operand
+
+    def push_size(self):
+        return self.opcode - PUSH0
+
+    def __str__(self):
+        """Text form of evm disasm, e.g. "PUSH1 0x80 " or "ADD " """
+        if self.operand is None:
+            return self.name + " "
+        if self.opcode == PUSH0:
+            return "PUSH0 0 "
+        return "%s 0x%0*x " % (self.name, 2 * self.push_size(), self.operand)
+
+    def __repr__(self):
+        return "Instruction(%d, %s)" % (self.pc, str(self).strip())
+
+
+def opcode_name(opcode):
+    try:
+        return OPCODE_NAMES[opcode]
+    except KeyError:
+        return "opcode %#x not defined" % opcode
+
+
+def disassemble(bytecode):
+    """Decode runtime bytecode into instructions
+
+    Decoding stops at a PUSH whose immediate runs past the end of the code,
+    like evm disasm does.
+
+    Args:
+        bytecode (str): hex encoded bytecode, with or without 0x prefix
+
+    Returns:
+        list: the decoded Instructions in code order
+    """
+    bytecode = bytecode.strip()
+    if bytecode.startswith("0x"):
+        bytecode = bytecode[2:]
+    try:
+        code = bytes.fromhex(bytecode)
+    except ValueError as e:
+        # e.g. unlinked library placeholders
+        log.critical("Disassembly failed: %s", e)
+        return []
+
+    disassembly = []
+    pc = 0
+    size = len(code)
+    while pc < size:
+        opcode = code[pc]
+        name = opcode_name(opcode)
+        if PUSH1 <= opcode <= PUSH32:
+            end = pc + 1 + opcode - PUSH0
+            if end > size:
+                log.debug("Incomplete push instruction at %d", pc)
+                break
+            operand = int.from_bytes(code[pc + 1 : end], "big")
+            disassembly.append(Instruction(pc, opcode, name, operand))
+            pc = end
+        else:
+            operand = 0 if opcode == PUSH0 else None
+            disassembly.append(Instruction(pc, opcode, name, operand))
+            pc += 1
+    return disassembly
+
+
+def format_disassembly(bytecode):
+    """Render bytecode like evm disasm: the code, then one "pc: instruction" line each"""
+    lines = [bytecode]
+    for instr in disassemble(bytecode):
+        lines.append("%05x: %s" % (instr.pc, str(instr).strip()))
+    return "\n".join(lines) + "\n"
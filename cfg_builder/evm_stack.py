@@ -0,0 +1,28 @@
+class EVMStack(list):
+    """Symbolic EVM stack, stored bottom first so the top is the end of the list
+
+    Pushing and popping are O(1). Handlers address items relative to the top
+    with peek, dup and swap; plain indexing counts from the bottom.
+    """
+
+    __slots__ = ()
+
+    push = list.append
+
+    def peek(self, depth=0):
+        """Return the item depth positions below the top, e.g. peek(0) is the top"""
+        return self[-1 - depth]
+
+    def dup(self, n):
+        """DUPn: push a copy of the nth item, counting the top as 1"""
+        self.append(self[-n])
+
+    def swap(self, n):
+        """SWAPn: exchange the top with the item n positions below it"""
+        self[-1], self[-1 - n] = self[-1 - n], self[-1]
+
+    def copy(self):
+        return EVMStack(self)
+
+    def __repr__(self):
+        return "EVMStack(%s)" % list.__repr__(self)
@@ -0,0 +1,81 @@
+"""simplify(), get_vars() and str() of z3 expressions, computed once per expression
+
+z3 hash-conses its terms: structurally equal expressions are one node, with
+one id while the node is alive. Every path through a block builds the same
+terms again, and the executor simplifies them, collects their variables and
+renders storage positions and memory addresses as the keys of
+global_state["Ia"] and mem. The results are kept by id, together with the
+expression so that its id is not reused.
+"""
+
+from collections import OrderedDict
+
+from z3 import is_expr, simplify
+from z3.z3util import get_vars
+
+import global_params
+
+# positions of the results in an entry, after the expression
+_SIMPLIFIED = 1
+_VARS = 2
+_KEY = 3
+
+
+class ExprCache:
+    """Least recently used results per expression, cleared for every contract"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.entries = OrderedDict()
+        self.max_size = global_params.EXPR_CACHE_SIZE
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, expression, index, compute):
+        key = expression.get_id()
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = [expression, None, None, None]
+            if self.max_size > 0:
+                self.entries[key] = entry
+                if len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        value = entry[index]
+        if value is None:
+            self.misses += 1
+            value = entry[index] = compute(expression)
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return "%d hits, %d misses (%.1f%% reused)" % (
+            self.hits,
+            self.misses,
+            100.0 * self.hits / lookups if lookups else 0.0,
+        )
+
+
+def cached_simplify(expression):
+    """simplify(expression), expression being a z3 expression"""
+    return expr_cache.get(expression, _SIMPLIFIED, simplify)
+
+
+def cached_get_vars(expression):
+    """get_vars(expression), a new list the caller may modify"""
+    return list(expr_cache.get(expression, _VARS, get_vars))
+
+
+def expr_key(value):
+    """str(value), the key of a symbolic position in global_state["Ia"] or mem"""
+    if not is_expr(value):
+        return str(value)
+    return expr_cache.get(value, _KEY, str)
+
+
+expr_cache = ExprCache()
@@ -0,0 +1,127 @@
+"""Deciding the sides of a JUMPI without the solver where possible
+
+The explorer needs to know which of a branch condition and its negation are
+satisfiable together with the path condition. A condition that does not
+depend on symbolic values decides itself, and an assignment satisfying the
+path condition proves the side the condition evaluates to under it. Only the
+sides left undecided go to the solver.
+"""
+
+from z3 import BoolRef, Model, is_false, is_true
+
+from cfg_builder.constraint_slicing import variables
+from cfg_builder.expr_cache import cached_simplify
+
+
+def concrete_truth(expression):
+    """True or False if expression simplifies to a constant, otherwise None"""
+    if isinstance(expression, bool):
+        return expression
+    if isinstance(expression, BoolRef):
+        expression = cached_simplify(expression)
+        if is_true(expression):
+            return True
+        if is_false(expression):
+            return False
+    return None
+
+
+class PathModel:
+    """The most recent satisfying assignment and the path condition it was found for
+
+    Every constraint of the explorer's solver is also in the path condition,
+    so an assignment under which the path condition holds proves the solver
+    satisfiable, whatever path it was found on. The initial constraints at
+    the start of a path condition never reach the solver, the model found
+    by the solver need not satisfy them and they are not relied upon.
+
+    The assignment is made of the models of the independent groups of
+    constraints (see constraint_slicing), each the owner of the variables
+    of its group. An expression is evaluated under the one model owning
+    its variables, and is undecided when they belong to several models.
+    """
+
+    def __init__(self):
+        self.conditions = ()
+        # variable name => model assigning it, None before the first record
+        self.owners = None
+        self.free = None
+
+    def record(self, conditions, models):
+        """Keep the (variable names, model) of every group of the solver constraints
+
+        A group decided without a model (see portfolio) leaves no assignment.
+        """
+        if any(model is None for _, model in models):
+            self.conditions = ()
+            self.owners = None
+            return
+        self.conditions = tuple(conditions)
+        self.owners = {}
+        for names, model in models:
+            for name in names:
+                self.owners[name] = model
+        # assigns the variables no group constrains
+        self.free = Model()
+
+    def models(self):
+        """The distinct models the assignment is made of"""
+        return list(dict((id(model), model) for model in self.owners.values()).values())
+
+    def evaluate(self, expression):
+        """True or False under the model, None if it does not reduce to a constant"""
+        if isinstance(expression, bool):
+            return expression
+        names = variables(expression)
+        owners = dict(
+            (id(self.owners[name]), self.owners[name])
+            for name in names
+            if name in self.owners
+        )
+        if len(owners) > 1:
+            return None
+        model = owners.popitem()[1] if owners else self.free
+        value = concrete_truth(model.eval(expression, model_completion=True))
+        # the completion assigned the variables no model owned yet
+        for name in names:
+            self.owners.setdefault(name, model)
+        return value
+
+    def satisfies(self, conditions):
+        """Whether the solver constraints among conditions hold under the model
+
+        Only the conditions after the prefix shared (by identity) with the
+        ones of the model are evaluated.
+        """
+        if self.owners is None:
+            return False
+        common = 0
+        limit = min(len(self.conditions), len(conditions))
+        while common < limit and self.conditions[common] is conditions[common]:
+            common += 1
+        for condition in conditions[common:]:
+            if self.evaluate(condition) is not True:
+                return False
+        if common < len(conditions):
+            self.conditions = tuple(conditions)
+        return True
+
+
+def decide_branch(path_model, conditions, expression):
+    """Feasibility of expression and of its negation after conditions
+
+    Returns:
+        tuple: (jump, falls_to), each True or False when decided without the
+            solver, None when the solver has to check that side
+    """
+    truth = concrete_truth(expression)
+    if truth is not None:
+        feasible = True if path_model.satisfies(conditions) else None
+        return (feasible, False) if truth else (False, feasible)
+    if path_model.satisfies(conditions):
+        value = path_model.evaluate(expression)
+        if value is True:
+            return (True, None)
+        if value is False:
+            return (None, True)
+    return (None, None)
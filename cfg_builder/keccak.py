@@ -0,0 +1,39 @@
+"""KECCAK256 of concrete memory, computed natively
+
+A mapping entry lives at keccak256(key . slot). With a concrete key, the
+real digest is the storage position of the entry, as in the storage layout
+of the contract. Every path through a mapping access hashes the same bytes,
+so the digests are kept in a process-wide LRU keyed by the raw bytes.
+
+The slot of every such digest is remembered in mapping_slots, so that a
+concrete storage position can be traced back to the mapping it belongs to.
+"""
+
+from functools import lru_cache
+
+from Crypto.Hash import keccak
+
+CACHE_SIZE = 4096
+
+# digest of (key . slot) => slot
+mapping_slots = {}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def keccak256(data):
+    """keccak256 of data (bytes), as an int"""
+    digest = int.from_bytes(keccak.new(digest_bits=256, data=data).digest(), "big")
+    if len(data) == 64:
+        mapping_slots[digest] = int.from_bytes(data[32:], "big")
+    return digest
+
+
+def mapping_slot(position):
+    """the slot of the mapping declaring the storage position, None if unknown
+
+    Nested mappings are followed down to the slot of the outermost one.
+    """
+    slot = None
+    while position in mapping_slots:
+        slot = position = mapping_slots[position]
+    return slot
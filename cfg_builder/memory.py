@@ -0,0 +1,132 @@
+"""EVM memory of a path
+
+MLOAD reads back the words MSTORE wrote, by address, while KECCAK256 hashes
+a range of bytes. Memory keeps both views in one place: the words as they
+were stored, and the bytes they were stored as, concrete bytes in pages of
+a bytearray and the bytes of symbolic values in an overlay.
+"""
+
+from z3 import is_expr
+
+from cfg_builder.expr_cache import expr_key
+
+PAGE_SIZE = 4096
+
+# bytes, KECCAK256 of a larger range is not keyed by its content
+MAX_KEY_SIZE = 1 << 20
+
+WORD_MASK = 2**256 - 1
+
+
+class Memory:
+    """Words by address, over the bytes of the concrete addresses written
+
+    The mapping interface is the word view: a word is keyed by its
+    concrete address, or by the expr_key of a symbolic one, and clear()
+    forgets the words only. write_word() and write_byte() lay out the
+    bytes of concrete addresses; a byte of a symbolic value is kept as
+    (value, index of the byte from the most significant one).
+
+    fork() shares the pages with the copy, each side copies a page the
+    first time it writes to it. Only the pages written are allocated, so
+    a store to a large offset does not grow the memory up to it.
+    """
+
+    __slots__ = ("words", "pages", "owned", "overlay")
+
+    def __init__(self):
+        self.words = {}
+        self.pages = {}
+        # pages this memory may write to, the others are shared or missing
+        self.owned = set()
+        # offset => (symbolic value, index of the byte)
+        self.overlay = {}
+
+    def fork(self):
+        child = Memory.__new__(Memory)
+        child.words = dict(self.words)
+        child.pages = dict(self.pages)
+        child.owned = set()
+        child.overlay = dict(self.overlay)
+        self.owned = set()
+        return child
+
+    def __getitem__(self, key):
+        return self.words[key]
+
+    def __setitem__(self, key, value):
+        self.words[key] = value
+
+    def __contains__(self, key):
+        return key in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+    def keys(self):
+        return self.words.keys()
+
+    def clear(self):
+        self.words.clear()
+
+    def write_word(self, offset, value):
+        """Lay out the 32 bytes of value, big-endian, from the concrete offset"""
+        if is_expr(value):
+            for index in range(32):
+                self.overlay[offset + index] = (value, index)
+            return
+        self._write(offset, (int(value) & WORD_MASK).to_bytes(32, "big"))
+
+    def write_byte(self, offset, value):
+        if is_expr(value):
+            self.overlay[offset] = (value, 31)
+            return
+        self._write(offset, bytes((int(value) & 0xFF,)))
+
+    def _write(self, offset, data):
+        if self.overlay:
+            for position in range(offset, offset + len(data)):
+                self.overlay.pop(position, None)
+        start = 0
+        while start < len(data):
+            page_index, page_offset = divmod(offset + start, PAGE_SIZE)
+            page = self.pages.get(page_index)
+            if page_index not in self.owned:
+                page = bytearray(page) if page is not None else bytearray(PAGE_SIZE)
+                self.pages[page_index] = page
+                self.owned.add(page_index)
+            end = min(len(data), start + PAGE_SIZE - page_offset)
+            page[page_offset : page_offset + end - start] = data[start:end]
+            start = end
+
+    def read(self, offset, size):
+        """Concrete bytes of a range, zero where nothing was written"""
+        data = bytearray(size)
+        start = 0
+        while start < size:
+            page_index, page_offset = divmod(offset + start, PAGE_SIZE)
+            end = min(size, start + PAGE_SIZE - page_offset)
+            page = self.pages.get(page_index)
+            if page is not None:
+                data[start:end] = page[page_offset : page_offset + end - start]
+            start = end
+        return bytes(data)
+
+    def key(self, offset, size):
+        """Hashable content of a range: bytes, or a tuple if it has symbolic bytes
+
+        Equal keys are equal contents, KECCAK256 of a range is keyed by it.
+        """
+        data = self.read(offset, size)
+        if not self.overlay or not any(
+            position in self.overlay for position in range(offset, offset + size)
+        ):
+            return data
+        content = []
+        for position in range(offset, offset + size):
+            byte = self.overlay.get(position)
+            if byte is None:
+                content.append(data[position - offset])
+            else:
+                content.append((expr_key(byte[0]), byte[1]))
+        return tuple(content)
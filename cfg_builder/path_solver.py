@@ -0,0 +1,243 @@
+"""The solver through which the explorer and the analyses reach z3
+
+The constraints of a path are added once and kept in scopes that follow the
+exploration. The many questions asked along a path (is this side of a JUMPI
+feasible, can this divisor be zero, can this address alias that one) are
+conditions checked together with the constraints without being kept, see
+PathSolver.check.
+
+A query is first given a short budget and only the ones it cannot decide
+are retried with longer ones, see timeout_tiers.
+"""
+
+import time
+
+from z3 import BoolVal, FreshBool, Implies, Solver, sat, unknown
+
+import global_params
+from cfg_builder import portfolio
+from cfg_builder.constraint_slicing import check_constraints
+
+SOLVER_MODES = ("assumptions", "push")
+
+
+def timeout_tiers():
+    """Budgets (in ms) a query is tried with, from SHORT_TIMEOUT up to TIMEOUT
+
+    Every budget is ten times the previous one.
+    """
+    tiers = []
+    timeout = global_params.SHORT_TIMEOUT
+    while 0 < timeout < global_params.TIMEOUT:
+        tiers.append(timeout)
+        timeout *= 10
+    return tiers + [global_params.TIMEOUT]
+
+
+class SolverStats:
+    """Incremental checks, seconds spent in them, pushes and pops per mode
+
+    Summed over the solvers of the current contract, to compare the modes.
+    """
+
+    def __init__(self):
+        self.counters = dict((mode, [0, 0.0, 0, 0]) for mode in SOLVER_MODES)
+
+    def reset(self):
+        for counters in self.counters.values():
+            counters[:] = [0, 0.0, 0, 0]
+
+    def merge(self, counters):
+        for mode, values in counters.items():
+            for i, value in enumerate(values):
+                self.counters[mode][i] += value
+
+    def __str__(self):
+        return ", ".join(
+            "%s: %d checks in %.2fs, %d pushes, %d pops" % ((mode,) + tuple(counters))
+            for mode, counters in self.counters.items()
+            if counters[0] or counters[2]
+        )
+
+
+class TierStats:
+    """JUMPI sides decided at every tier of timeout_tiers()
+
+    deferred counts the sides put off to a longer budget, undecided the ones
+    explored without the solver deciding them.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.decided = []
+        self.deferred = 0
+        self.undecided = 0
+
+    def count(self, tier, result):
+        if result == unknown:
+            self.undecided += 1
+            return
+        while len(self.decided) <= tier:
+            self.decided.append(0)
+        self.decided[tier] += 1
+
+    def counters(self):
+        return list(self.decided), self.deferred, self.undecided
+
+    def merge(self, counters):
+        decided, deferred, undecided = counters
+        for tier, count in enumerate(decided):
+            while len(self.decided) <= tier:
+                self.decided.append(0)
+            self.decided[tier] += count
+        self.deferred += deferred
+        self.undecided += undecided
+
+    def __str__(self):
+        tiers = timeout_tiers()
+        decided = [
+            "%d within %d ms" % (count, tiers[min(tier, len(tiers) - 1)])
+            for tier, count in enumerate(self.decided)
+        ]
+        return ", ".join(
+            decided + ["%d deferred" % self.deferred, "%d undecided" % self.undecided]
+        )
+
+
+class PathSolver:
+    """Constraints of a path, and checks of conditions that are not kept
+
+    push(), pop() and add() are meant for the scopes of the exploration.
+    check(*conditions) slices the constraints and the conditions into
+    independent groups and decides the ones the query cache does not know.
+    What reaches the incremental solver is checked according to
+    global_params.SOLVER_MODE:
+
+    - "assumptions": every condition is asserted once, as the implication
+      of a fresh literal, and the literals are passed to z3 as assumptions;
+    - "push": the conditions are added in a scope popped after the check.
+
+    models holds the (variable names, model) of every group after a sat
+    check.
+    """
+
+    def __init__(self, mode=None):
+        self.solver = Solver()
+        self.timeout = None
+        self.mode = mode or global_params.SOLVER_MODE
+        self.stats = solver_stats.counters[self.mode]
+        # id of a condition => (literal, implication, scope it was asserted in)
+        self.literals = {}
+        self.implications = set()
+        self.models = []
+        self.reason = ""
+
+    def set(self, *args, **kwargs):
+        self.solver.set(*args, **kwargs)
+
+    def add(self, *constraints):
+        self.solver.add(*constraints)
+
+    def push(self):
+        self.stats[2] += 1
+        self.solver.push()
+
+    def pop(self, num=1):
+        self.stats[3] += 1
+        self.solver.pop(num)
+        if self.literals:
+            scopes = self.solver.num_scopes()
+            for key, (literal, implication, scope) in list(self.literals.items()):
+                if scope > scopes:
+                    del self.literals[key]
+                    self.implications.discard(implication.get_id())
+
+    def num_scopes(self):
+        return self.solver.num_scopes()
+
+    def assertions(self):
+        """The constraints of the path, without the implications of assumptions"""
+        assertions = self.solver.assertions()
+        if not self.implications:
+            return list(assertions)
+        return [
+            assertion
+            for assertion in assertions
+            if assertion.get_id() not in self.implications
+        ]
+
+    def check(self, *conditions):
+        """Whether the constraints and conditions are satisfiable together
+
+        The budgets of timeout_tiers() are tried in turn until one decides.
+
+        Returns:
+            sat, unsat or unknown
+        """
+        for timeout in timeout_tiers():
+            result = self.check_within(timeout, *conditions)
+            if result != unknown:
+                break
+        return result
+
+    def check_within(self, timeout, *conditions):
+        """Like check, with a single budget of timeout ms"""
+        if timeout != self.timeout:
+            self.solver.set("timeout", portfolio.local_budget(timeout))
+            self.timeout = timeout
+        conditions = [
+            BoolVal(condition) if isinstance(condition, bool) else condition
+            for condition in conditions
+        ]
+        result, self.models = check_constraints(self, conditions)
+        return result
+
+    def reason_unknown(self):
+        return self.reason
+
+    def check_incremental(self, conditions):
+        """Check every constraint and condition at once on the incremental solver
+
+        Returns:
+            tuple: sat, unsat or unknown, and the model when sat
+        """
+        begin = time.time()
+        self.stats[0] += 1
+        try:
+            if self.mode == "push" and conditions:
+                self.push()
+                try:
+                    self.solver.add(conditions)
+                    return self.outcome(self.solver.check())
+                finally:
+                    self.pop()
+            literals = [self.literal(condition) for condition in conditions]
+            return self.outcome(self.solver.check(*literals))
+        finally:
+            self.stats[1] += time.time() - begin
+
+    def outcome(self, result):
+        if result == sat:
+            return result, self.solver.model()
+        if result == unknown:
+            self.reason = self.solver.reason_unknown()
+        return result, None
+
+    def literal(self, condition):
+        key = condition.get_id()
+        entry = self.literals.get(key)
+        if entry is None:
+            literal = FreshBool()
+            implication = Implies(literal, condition)
+            self.solver.add(implication)
+            self.implications.add(implication.get_id())
+            # the implication keeps the condition, and so its id, alive
+            entry = (literal, implication, self.solver.num_scopes())
+            self.literals[key] = entry
+        return entry[0]
+
+
+solver_stats = SolverStats()
+tier_stats = TierStats()
@@ -0,0 +1,77 @@
+"""What the source code of an instruction means to the analysis, per pc
+
+The executor reacts to a few source snippets: the statement returning the
+owner of a token, the require of ERC721Pausable, the ownership check of
+ERC721A, the call of a function. Their source code is looked up once per pc
+before the exploration, tag_pcs() turns it into flags, and the block loop
+reads one byte per instruction instead of slicing and comparing the source.
+"""
+
+from enum import IntFlag
+
+
+class PcTag(IntFlag):
+    # the top of the stack after the instruction is the owner of the token
+    OWNER_RETURN = 1
+    # require(!paused()) of ERC721Pausable
+    PAUSABLE_CHECK = 2
+    # ownership check of ERC721A, which loads the owner in assembly
+    ERC721A_LOAD = 4
+    # source code of the instruction is the call of a function
+    FUNC_CALL = 8
+
+
+PAUSABLE_CHECK_SOURCE = (
+    'require(!paused(), "ERC721Pausable: token transfer while paused")'
+)
+
+# besides the return statement found in the AST
+OWNER_RETURN_SOURCES = ("prevOwnership.addr", "return packed")
+
+ERC721A_LOAD_SOURCES = (
+    "result := or(eq(msgSender, owner), eq(msgSender, approvedAddress))",
+    "result := or(eq(msgSender, from), eq(msgSender, approvedAddress))",
+)
+
+
+def source_tag(source_code, return_owner, func_call_names):
+    tag = 0
+    if source_code == PAUSABLE_CHECK_SOURCE:
+        tag |= PcTag.PAUSABLE_CHECK
+    if source_code == return_owner or source_code in OWNER_RETURN_SOURCES:
+        tag |= PcTag.OWNER_RETURN
+    elif source_code in ERC721A_LOAD_SOURCES:
+        tag |= PcTag.ERC721A_LOAD
+    if source_code in func_call_names:
+        tag |= PcTag.FUNC_CALL
+    return int(tag)
+
+
+class PcTags(bytearray):
+    """Tags indexed by pc, see tag_pcs()"""
+
+    def tag(self, pc):
+        """Tags of pc, for a pc that may be past the code"""
+        if 0 <= pc < len(self):
+            return self[pc]
+        return self.no_source
+
+
+def tag_pcs(src_map, return_owner, size):
+    """Tags of the pcs below size
+
+    A pc without source code gets the tags of "", which get_source_code()
+    returns for it; so does a pc past the code in PcTags.tag().
+    """
+    func_call_names = frozenset(src_map.func_call_names) if src_map else ()
+    no_source = source_tag("", return_owner, func_call_names)
+    tags = PcTags(bytes((no_source,)) * size)
+    tags.no_source = no_source
+    if not src_map:
+        return tags
+    for pc in src_map.instr_positions:
+        if 0 <= pc < size:
+            tags[pc] = source_tag(
+                src_map.get_source_code(pc), return_owner, func_call_names
+            )
+    return tags
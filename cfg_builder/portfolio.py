@@ -0,0 +1,202 @@
+"""Racing hard solver queries across processes with different configurations
+
+A few queries per contract (signed arithmetic, large EXP terms) take most of
+the solver time, and which configuration of z3 decides them fastest varies
+from one query to the other. A query is first checked in the analysis
+process for at most PORTFOLIO_THRESHOLD ms. Only when that check runs out of
+time or gives up is the query serialized to SMT-LIB and checked by one
+forked process per configuration, with the rest of its budget. The first
+sat or unsat answer wins and the other processes are killed.
+
+The winning process sends back the values its model gives to the constants
+of the query, and a model of the query under those values is rebuilt in the
+analysis process. With PORTFOLIO = 0 (the default) queries never leave the
+analysis process.
+"""
+
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+
+from z3 import (
+    Context,
+    Solver,
+    SolverFor,
+    Tactic,
+    parse_smt2_string,
+    sat,
+    unknown,
+    unsat,
+)
+
+import global_params
+
+# name => settings of a z3 solver, in the order they are picked
+PORTFOLIO_CONFIGS = (
+    ("default", {}),
+    ("qf_aufbv", {"logic": "QF_AUFBV"}),
+    ("qfbv-tactic", {"tactic": "qfbv"}),
+    ("seed-1", {"random_seed": 1}),
+    ("seed-2", {"random_seed": 2}),
+    ("seed-3", {"random_seed": 3}),
+)
+
+# seconds a process is given on top of the budget to start and answer
+_GRACE = 0.5
+
+_RESULTS = {"sat": sat, "unsat": unsat}
+
+
+class PortfolioStats:
+    """Queries raced, and the ones won by every configuration"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.queries = 0
+        self.wins = {}
+
+    def counters(self):
+        return self.queries, dict(self.wins)
+
+    def merge(self, counters):
+        queries, wins = counters
+        self.queries += queries
+        for name, count in wins.items():
+            self.wins[name] = self.wins.get(name, 0) + count
+
+    def __str__(self):
+        won = ", ".join("%s %d" % item for item in sorted(self.wins.items()))
+        return "%d queries raced, won by: %s" % (self.queries, won or "none")
+
+
+def enabled():
+    """Whether the queries the analysis process cannot decide go to the portfolio"""
+    return (
+        global_params.PORTFOLIO > 0
+        # daemonic processes (e.g. server workers) cannot have children
+        and not multiprocessing.current_process().daemon
+    )
+
+
+def local_budget(timeout):
+    """Budget in ms the analysis process checks a query of timeout ms with"""
+    if enabled():
+        return min(timeout, global_params.PORTFOLIO_THRESHOLD)
+    return timeout
+
+
+def make_solver(config, ctx=None):
+    if "tactic" in config:
+        solver = Tactic(config["tactic"], ctx=ctx).solver()
+    elif "logic" in config:
+        solver = SolverFor(config["logic"], ctx=ctx)
+    else:
+        solver = Solver(ctx=ctx)
+    if "random_seed" in config:
+        solver.set("random_seed", config["random_seed"])
+    return solver
+
+
+def _worker(smt2, config, timeout, conn):
+    """Process body: check the SMT-LIB query with one configuration
+
+    Sends the answer, and when sat the values of the constants as SMT-LIB.
+    """
+    try:
+        # the context of the parent is not safe to use after fork
+        ctx = Context()
+        solver = make_solver(config, ctx)
+        solver.set("timeout", timeout)
+        solver.add(parse_smt2_string(smt2, ctx=ctx))
+        result = solver.check()
+        if result != sat:
+            conn.send((str(result), None))
+        else:
+            conn.send(("sat", _values(solver.model(), ctx)))
+    except Exception:
+        conn.send(("unknown", None))
+    conn.close()
+
+
+def _values(model, ctx):
+    """The values model gives to the constants, as SMT-LIB assertions"""
+    values = Solver(ctx=ctx)
+    for decl in model.decls():
+        if decl.arity() == 0:
+            values.add(decl() == model[decl])
+    return values.to_smt2()
+
+
+def _rebuild_model(constraints, values, timeout):
+    """A model of constraints under the values sent by a process, None if none is found"""
+    solver = Solver()
+    solver.set("timeout", timeout)
+    solver.add(constraints)
+    try:
+        solver.add(parse_smt2_string(values))
+    except Exception:
+        return None
+    if solver.check() != sat:
+        return None
+    return solver.model()
+
+
+def solve(constraints, timeout):
+    """Check constraints with the first PORTFOLIO configurations at once
+
+    Returns:
+        tuple: sat, unsat or unknown, and the model when sat (None when it
+            cannot be rebuilt)
+    """
+    query = Solver()
+    query.add(constraints)
+    smt2 = query.to_smt2()
+
+    portfolio_stats.queries += 1
+    ctx = multiprocessing.get_context("fork")
+    running = {}  # receiving end => (process, name of the configuration)
+    answer, values = "unknown", None
+    try:
+        for name, config in PORTFOLIO_CONFIGS[: global_params.PORTFOLIO]:
+            recv_end, send_end = ctx.Pipe(duplex=False)
+            process = ctx.Process(
+                target=_worker, args=(smt2, config, timeout, send_end)
+            )
+            process.start()
+            send_end.close()
+            running[recv_end] = (process, name)
+
+        deadline = time.time() + timeout / 1000.0 + _GRACE
+        while running and answer not in _RESULTS:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            for conn in wait(list(running.keys()), remaining):
+                process, name = running.pop(conn)
+                try:
+                    answer, values = conn.recv()
+                except EOFError:
+                    answer, values = "unknown", None
+                conn.close()
+                process.join()
+                if answer in _RESULTS:
+                    wins = portfolio_stats.wins
+                    wins[name] = wins.get(name, 0) + 1
+                    break
+    finally:
+        for conn, (process, _) in running.items():
+            process.kill()
+            process.join()
+            conn.close()
+
+    if answer not in _RESULTS:
+        return unknown, None
+    model = None
+    if values is not None:
+        model = _rebuild_model(constraints, values, timeout)
+    return _RESULTS[answer], model
+
+
+portfolio_stats = PortfolioStats()
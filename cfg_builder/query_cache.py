@@ -0,0 +1,113 @@
+"""Outcomes of solver queries, reused when the same constraints are checked again
+
+Start blocks re-explore the same internal functions and the analyses repeat
+their checks on every path, so the same sets of constraints reach the solver
+many times. z3 hash-conses its expressions: structurally equal expressions
+are one node with one id while the node is alive. A query is therefore keyed
+by the set of ids of the asserted constraints, and the entry keeps the
+constraints alive so that their ids are not reused.
+"""
+
+import time
+from collections import OrderedDict
+
+from z3 import SolverFor, sat, unknown
+
+import global_params
+from cfg_builder import portfolio
+
+
+class QueryCache:
+    """Least recently used sat/unsat outcomes, with the model of sat queries
+
+    Unknown outcomes (timeouts) are not kept. hits and misses count the
+    queries of the current contract.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.entries = OrderedDict()
+        self.max_size = global_params.QUERY_CACHE_SIZE
+        self.hits = 0
+        self.misses = 0
+        # reason given by the solver for the last query it could not decide
+        self.reason_unknown = ""
+        # reset for every query, a solver for a logic starts faster than Solver()
+        self.solver = None
+
+    def lookup(self, constraints):
+        """(outcome, model) of a set of constraints checked before, otherwise None"""
+        key = self.key(constraints)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def store(self, constraints, result, model=None):
+        if result == unknown or self.max_size <= 0:
+            return
+        self.entries[self.key(constraints)] = (result, model, list(constraints))
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def check(self, constraints, timeout=None):
+        """Check constraints on their own, from the cache when seen before
+
+        timeout is the budget in ms, global_params.TIMEOUT by default. A query
+        the analysis process cannot decide within portfolio.local_budget is
+        raced in the portfolio with the rest of the budget.
+
+        Returns:
+            tuple: sat, unsat or unknown, and the model when sat
+        """
+        entry = self.lookup(constraints)
+        if entry is not None:
+            return entry
+        timeout = timeout or global_params.TIMEOUT
+        begin = time.time()
+        if self.solver is None:
+            self.solver = SolverFor("QF_AUFBV")
+        self.solver.reset()
+        self.solver.set("timeout", portfolio.local_budget(timeout))
+        self.solver.add(constraints)
+        result = self.solver.check()
+        if result == unknown:
+            self.reason_unknown = self.solver.reason_unknown()
+            remaining = timeout - int((time.time() - begin) * 1000)
+            if portfolio.enabled() and remaining > 0:
+                return self.race(constraints, remaining)
+        model = self.solver.model() if result == sat else None
+        self.store(constraints, result, model)
+        return result, model
+
+    def race(self, constraints, timeout):
+        """Check constraints in the portfolio, with a budget of timeout ms
+
+        Returns:
+            tuple: sat, unsat or unknown, and the model when sat
+        """
+        result, model = portfolio.solve(constraints, timeout)
+        if result == unknown:
+            self.reason_unknown = "portfolio: no configuration decided"
+        self.store(constraints, result, model)
+        return result, model
+
+    @staticmethod
+    def key(constraints):
+        return frozenset(constraint.get_id() for constraint in constraints)
+
+    def stats(self):
+        queries = self.hits + self.misses
+        return "%d hits, %d misses (%.1f%% reused)" % (
+            self.hits,
+            self.misses,
+            100.0 * self.hits / queries if queries else 0.0,
+        )
+
+
+query_cache = QueryCache()
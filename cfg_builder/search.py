@@ -0,0 +1,160 @@
+"""Orders in which the explorer picks its next pending path
+
+Depth first search is built into sym_exec_block, where a branch keeps its
+solver scope open while the paths below it are explored. The searchers
+here hold BlockTasks of paths that are resumed in any order, see
+explore_with_searcher in sym_exec.
+"""
+
+import heapq
+import random
+from collections import deque
+
+SEARCH_STRATEGIES = ("dfs", "bfs", "random-path", "coverage-new-block", "shortest-to-log")
+
+
+class BFSSearcher:
+    """Oldest path first, i.e. breadth first"""
+
+    def __init__(self):
+        self.tasks = deque()
+
+    def push(self, task):
+        self.tasks.append(task)
+
+    def pop(self):
+        return self.tasks.popleft()
+
+    def __len__(self):
+        return len(self.tasks)
+
+
+class RandomPathSearcher:
+    """Random path of the execution tree, shallow paths are likelier
+
+    Walking down the binary tree of branches with a fair coin reaches a
+    path at depth d with probability 2^-d, so a path that forks in a loop
+    cannot take over the search.
+    """
+
+    def __init__(self, seed=0):
+        self.tasks = []
+        self.random = random.Random(seed)
+
+    def push(self, task):
+        self.tasks.append(task)
+
+    def pop(self):
+        min_depth = min(task.depth for task in self.tasks)
+        weights = [0.5 ** (task.depth - min_depth) for task in self.tasks]
+        index = self.random.choices(range(len(self.tasks)), weights)[0]
+        self.tasks[index], self.tasks[-1] = self.tasks[-1], self.tasks[index]
+        return self.tasks.pop()
+
+    def __len__(self):
+        return len(self.tasks)
+
+
+class PrioritySearcher:
+    """Lowest priority(task) first, the most recently pushed among equals
+
+    Priorities may only grow while a task waits (e.g. its block gets
+    covered), a stale task is pushed back with its current priority.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.count = 0
+
+    def priority(self, task):
+        raise NotImplementedError
+
+    def push(self, task):
+        self.count += 1
+        heapq.heappush(self.heap, (self.priority(task), -self.count, task))
+
+    def pop(self):
+        while True:
+            priority, order, task = heapq.heappop(self.heap)
+            current = self.priority(task)
+            if current == priority or not self.heap:
+                return task
+            heapq.heappush(self.heap, (current, order, task))
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class CoverageNewBlockSearcher(PrioritySearcher):
+    """Paths about to execute a block no path has visited yet first"""
+
+    def __init__(self, visited_blocks):
+        PrioritySearcher.__init__(self)
+        self.visited_blocks = visited_blocks
+
+    def priority(self, task):
+        return task.block in self.visited_blocks
+
+
+class ShortestToLogSearcher(PrioritySearcher):
+    """Paths closest to a LOG4 (the Transfer event) in the CFG first
+
+    Args:
+        distances (dict): block => number of edges to the nearest block with a
+            LOG4, blocks that cannot reach one are missing
+    """
+
+    def __init__(self, distances):
+        PrioritySearcher.__init__(self)
+        self.distances = distances
+
+    def priority(self, task):
+        return self.distances.get(task.block, float("inf"))
+
+
+def distances_to(targets, edges):
+    """Number of CFG edges from every block to the nearest target block
+
+    Args:
+        targets (iterable): blocks to reach
+        edges (dict): block => list of successor blocks
+
+    Returns:
+        dict: block => distance, for the blocks that reach a target
+    """
+    predecessors = {}
+    for block, successors in edges.items():
+        for successor in successors:
+            predecessors.setdefault(successor, []).append(block)
+    distances = dict((block, 0) for block in targets)
+    queue = deque(distances)
+    while queue:
+        block = queue.popleft()
+        for predecessor in predecessors.get(block, []):
+            if predecessor not in distances:
+                distances[predecessor] = distances[block] + 1
+                queue.append(predecessor)
+    return distances
+
+
+class DeferredQueue:
+    """JUMPI sides put off until the paths decided within the short budget are done
+
+    A side is waiting for the tier (index in timeout_tiers) it is retried
+    with, the lowest tier first and then the order they were put off.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.count = 0
+
+    def push(self, tier, side):
+        self.count += 1
+        heapq.heappush(self.heap, (tier, self.count, side))
+
+    def pop(self):
+        tier, _, side = heapq.heappop(self.heap)
+        return tier, side
+
+    def __len__(self):
+        return len(self.heap)
@@ -1,23 +1,49 @@
-import base64
+import copy
 import errno
+import multiprocessing
 import pickle
 import signal
 import time
-import tokenize
 import traceback
-import zlib
+from bisect import bisect_right
 from collections import namedtuple
-from tokenize import NAME, NEWLINE, NUMBER
+from multiprocessing.connection import wait
 
 from numpy import mod
-from rich.console import Console
-from rich.live import Live
 from rich.table import Table
 from rich import box
-from rich.console import Console
 
 from cfg_builder.basicblock import BasicBlock
+from cfg_builder.constraint_slicing import reset as reset_slicing
+from cfg_builder.cow_dict import CowDict
+from cfg_builder.dashboard import dashboard, progress
+from cfg_builder.disassembler import (
+    DUP1,
+    LOG0,
+    OPCODES,
+    PUSH0,
+    PUSH32,
+    SWAP1,
+    disassemble,
+)
+from cfg_builder.evm_stack import EVMStack
 from cfg_builder.execution_states import EXCEPTION, PICKLE_PATH, UNKNOWN_INSTRUCTION
+from cfg_builder.expr_cache import cached_simplify, expr_cache, expr_key
+from cfg_builder.feasibility import PathModel, decide_branch
+from cfg_builder.keccak import keccak256
+from cfg_builder.memory import MAX_KEY_SIZE, Memory
+from cfg_builder.pc_tags import PcTag, tag_pcs
+from cfg_builder.path_solver import PathSolver, solver_stats, tier_stats, timeout_tiers
+from cfg_builder.portfolio import portfolio_stats
+from cfg_builder.query_cache import query_cache
+from cfg_builder.search import (
+    BFSSearcher,
+    CoverageNewBlockSearcher,
+    DeferredQueue,
+    RandomPathSearcher,
+    ShortestToLogSearcher,
+    distances_to,
+)
 from cfg_builder.utils import *
 from cfg_builder.vargenerator import *
 from defect_identifier.defect import *
@@ -25,11 +51,6 @@ from defect_identifier.identifier import Identifier
 from feature_detector.semantic_analysis import *
 from feature_detector.sleepmint_analysis import *
 
-# Initiate table for live print.
-console = Console()
-table = Table()
-live = Live(table, console=console, vertical_overflow="crop", auto_refresh=True)
-
 log = logging.getLogger(__name__)
 
 # Store visited blocks
@@ -116,6 +137,22 @@ def generate_table(
     reporter.add_row(defect_table, state_table)
     return reporter
 
+
+def render_dashboard():
+    """Tables of the last instruction executed and of the coverage so far"""
+    # no CFG between two contracts
+    block_coverage = len(visited_blocks) / len(vertices) * 100 if vertices else 0.0
+    perc = float(len(visited_pcs)) / len(instructions) * 100 if instructions else 0.0
+    return generate_table(
+        progress.opcode,
+        block_coverage,
+        progress.pc,
+        perc,
+        g_src_map,
+        global_problematic_pcs,
+        progress.function,
+    )
+
 # def generate_table(
 #     opcode, block_cov, pc, perc, g_src_map, global_problematic_pcs, current_func_name
 # ) -> Table:
@@ -191,26 +228,63 @@ def generate_table(
 #     return reporter
 
 
+# Factory Function for tuples is used as dictionary key
+Edge = namedtuple("Edge", ["v1", "v2"])
+
+
 class Parameter:
+    """Symbolic state of one path
+
+    The fields live in a CowDict, so copy() is O(number of fields) and a
+    successor only copies the containers it reaches. visited is a persistent
+    (block, previous visited) chain shared by all the successors of a path.
+    """
+
     def __init__(self, **kwargs):
         attr_defaults = {
-            "stack": [],
+            "stack": EVMStack(),
             "calls": [],
-            "memory": [],
-            "visited": [],
+            "visited": (),
             "overflow_pcs": [],
-            "mem": {},
+            "mem": Memory(),
             "analysis": {},
             "sha3_list": {},
             "global_state": {},
             "path_conditions_and_vars": {},
         }
+        fields = {}
         for attr, default in six.iteritems(attr_defaults):
-            setattr(self, attr, kwargs.get(attr, default))
+            fields[attr] = kwargs.get(attr, default)
+        self._fields = CowDict(fields)
 
     def copy(self):
-        _kwargs = custom_deepcopy(self.__dict__)
-        return Parameter(**_kwargs)
+        new_params = Parameter.__new__(Parameter)
+        new_params._fields = self._fields.fork()
+        return new_params
+
+
+def _parameter_field(name):
+    def getter(params):
+        return params._fields[name]
+
+    def setter(params, value):
+        params._fields[name] = value
+
+    return property(getter, setter)
+
+
+for _name in (
+    "stack",
+    "calls",
+    "visited",
+    "overflow_pcs",
+    "mem",
+    "analysis",
+    "sha3_list",
+    "global_state",
+    "path_conditions_and_vars",
+):
+    setattr(Parameter, _name, _parameter_field(_name))
 
 
 def initGlobalVars():
@@ -218,8 +292,23 @@ def initGlobalVars():
     global g_src_map
     global solver
     # Z3 solver
-    solver = Solver()
-    solver.set("timeout", global_params.TIMEOUT)
+    solver = PathSolver()
+    solver_stats.reset()
+    tier_stats.reset()
+    portfolio_stats.reset()
+
+    global deferred
+    deferred = DeferredQueue()
+
+    global path_model
+    path_model = PathModel()
+    query_cache.reset()
+    expr_cache.reset()
+    reset_slicing()
+    progress.reset()
+
+    global pc_tags
+    pc_tags = tag_pcs(None, None, 0)
 
     global MSIZE
     MSIZE = False
@@ -227,12 +316,6 @@ def initGlobalVars():
     global revertible_overflow_pcs
     revertible_overflow_pcs = set()
 
-    global g_disasm_file
-    with open(g_disasm_file, "r") as f:
-        disasm = f.read()
-    if "MSIZE" in disasm:
-        MSIZE = True
-
     global g_timeout
     g_timeout = False
 
@@ -352,48 +435,16 @@ def compare_storage_and_gas_unit_test(global_state, analysis):
     exit(test_status)
 
 
-def change_format():
-    """Change format for tokenization and buildng CFG"""
-    with open(g_disasm_file) as disasm_file:
-        file_contents = disasm_file.readlines()
-        i = 0
-        firstLine = file_contents[0].strip("\n")
-        for line in file_contents:
-            line = line.replace(":", "")
-            lineParts = line.split(" ")
-            try:  # removing initial zeroes
-                lineParts[0] = str(int(lineParts[0], 16))
-
-            except:
-                lineParts[0] = lineParts[0]
-            lineParts[-1] = lineParts[-1].strip("\n")
-            try:  # adding arrow if last is a number
-                lastInt = lineParts[-1]
-                if (int(lastInt, 16) or int(lastInt, 16) == 0) and len(lineParts) > 2:
-                    lineParts[-1] = "=>"
-                    lineParts.append(lastInt)
-            except Exception:
-                pass
-            file_contents[i] = " ".join(lineParts)
-            i = i + 1
-        file_contents[0] = firstLine
-        file_contents[-1] += "\n"
-
-    with open(g_disasm_file, "w") as disasm_file:
-        disasm_file.write("\n".join(file_contents))
-
-
 def build_cfg_and_analyze():
     """Build cfg and perform symbolic execution"""
-    change_format()
+    global MSIZE
     log.info("Building CFG...")
-    with open(g_disasm_file, "r") as disasm_file:
-        disasm_file.readline()  # Remove first line
-        tokens = tokenize.generate_tokens(disasm_file.readline)  # tokenization
-        collect_vertices(tokens)  # find vertices
-        construct_bb()
-        construct_static_edges()  # find static edges from stack top
-        full_sym_exec()  # jump targets are constructed on the fly
+    disassembly = disassemble(g_bytecode)
+    MSIZE = any(instr.name == "MSIZE" for instr in disassembly)
+    collect_vertices(disassembly)  # find vertices
+    construct_bb()
+    construct_static_edges()  # find static edges from stack top
+    full_sym_exec()  # jump targets are constructed on the fly
 
 
 def print_cfg():
@@ -402,9 +453,7 @@ def print_cfg():
     log.debug(str(edges))
 
 
-def mapping_push_instruction(
-    current_line_content, current_ins_address, idx, positions, length
-):
+def mapping_push_instruction(instr, current_ins_address, idx, positions, length):
     global g_src_map
     while idx < length:
         if not positions[idx]:
@@ -416,8 +465,7 @@ def mapping_push_instruction(
             if name.startswith("PUSH"):
                 if name == "PUSH":
                     value = positions[idx]["value"]
-                    instr_value = current_line_content.split(" ")[1]
-                    if int(value, 16) == int(instr_value, 16):
+                    if int(value, 16) == instr.operand:
                         g_src_map.instr_positions[current_ins_address] = (
                             g_src_map.positions[idx]
                         )
@@ -425,7 +473,7 @@ def mapping_push_instruction(
                         break
                     else:
                         # print(idx, positions[idx])
-                        # print(value, instr_value, current_line_content)
+                        # print(value, instr)
                         raise Exception("Source map error")
                 else:
                     g_src_map.instr_positions[current_ins_address] = (
@@ -438,9 +486,7 @@ def mapping_push_instruction(
     return idx
 
 
-def mapping_non_push_instruction(
-    current_line_content, current_ins_address, idx, positions, length
-):
+def mapping_non_push_instruction(instr, current_ins_address, idx, positions, length):
     global g_src_map
     while idx < length:
         if not positions[idx]:
@@ -449,7 +495,7 @@ def mapping_non_push_instruction(
         if name.startswith("tag"):
             idx += 1
         else:
-            instr_name = current_line_content.split(" ")[0]
+            instr_name = instr.name
             if (
                 name == instr_name
                 or name == "INVALID"
@@ -471,12 +517,12 @@ def mapping_non_push_instruction(
     return idx
 
 
-# 1. Parse the disassembled file
+# 1. Walk the disassembled instructions
 # 2. Then identify each basic block (i.e. one-in, one-out)
 # 3. Store them in vertices
 
 
-def collect_vertices(tokens):
+def collect_vertices(disassembly):
     global g_src_map
     if g_src_map:
         idx = 0
@@ -488,113 +534,51 @@ def collect_vertices(tokens):
 
     current_ins_address = 0
     last_ins_address = 0
-    is_new_line = True
     current_block = 0
-    current_line_content = ""
-    wait_for_push = False
     is_new_block = False
 
-    for tok_type, tok_string, (srow, scol), _, line_number in tokens:
-        if wait_for_push is True:
-            push_val = ""
-            if current_line_content == "PUSH0 " and tok_type == NEWLINE:
-                is_new_line = True
-                current_line_content += "0 "
-                instructions[current_ins_address] = current_line_content
-                idx = (
-                        mapping_push_instruction(
-                        current_line_content,
-                        current_ins_address,
-                        idx,
-                        positions,
-                        length,
-                    )
-                    if g_src_map
-                    else None
+    for instr in disassembly:
+        name = instr.name
+        last_ins_address = current_ins_address
+        current_ins_address = instr.pc
+        if is_new_block:
+            current_block = current_ins_address
+            is_new_block = False
+
+        if name == "JUMPDEST":
+            if last_ins_address not in end_ins_dict:
+                end_ins_dict[current_block] = last_ins_address
+            current_block = current_ins_address
+            is_new_block = False
+        elif (
+            name == "STOP"
+            or name == "RETURN"
+            or name == "SUICIDE"
+            or name == "REVERT"
+            or name == "ASSERTFAIL"
+        ):
+            jump_type[current_block] = "terminal"
+            end_ins_dict[current_block] = current_ins_address
+        elif name == "JUMP":
+            jump_type[current_block] = "unconditional"
+            end_ins_dict[current_block] = current_ins_address
+            is_new_block = True
+        elif name == "JUMPI":
+            jump_type[current_block] = "conditional"
+            end_ins_dict[current_block] = current_ins_address
+            is_new_block = True
+
+        log.debug(instr)
+        instructions[current_ins_address] = instr
+        if g_src_map:
+            if name.startswith("PUSH"):
+                idx = mapping_push_instruction(
+                    instr, current_ins_address, idx, positions, length
                 )
-                current_line_content = ""
-                wait_for_push = False
-                continue
-
-            for ptok_type, ptok_string, _, _, _ in tokens:
-                if ptok_type == NEWLINE:
-                    is_new_line = True
-                    current_line_content += push_val + " "
-                    instructions[current_ins_address] = current_line_content
-                    idx = (
-                        mapping_push_instruction(
-                            current_line_content,
-                            current_ins_address,
-                            idx,
-                            positions,
-                            length,
-                        )
-                        if g_src_map
-                        else None
-                    )
-                    current_line_content = ""
-                    wait_for_push = False
-                    break
-                try:
-                    int(ptok_string, 16)
-                    push_val += ptok_string
-                except ValueError:
-                    pass
-
-            continue
-        elif is_new_line is True and tok_type == NUMBER:  # looking for a line number
-            last_ins_address = current_ins_address
-            try:
-                current_ins_address = int(tok_string)
-            except ValueError:
-                log.critical("ERROR when parsing row %d col %d", srow, scol)
-                quit()
-            is_new_line = False
-            if is_new_block:
-                current_block = current_ins_address
-                is_new_block = False
-            continue
-        elif tok_type == NEWLINE:
-            is_new_line = True
-            log.debug(current_line_content)
-            instructions[current_ins_address] = current_line_content
-            idx = (
-                mapping_non_push_instruction(
-                    current_line_content, current_ins_address, idx, positions, length
+            else:
+                idx = mapping_non_push_instruction(
+                    instr, current_ins_address, idx, positions, length
                 )
-                if g_src_map
-                else None
-            )
-            current_line_content = ""
-            continue
-        elif tok_type == NAME:
-            if tok_string == "JUMPDEST":
-                if last_ins_address not in end_ins_dict:
-                    end_ins_dict[current_block] = last_ins_address
-                current_block = current_ins_address
-                is_new_block = False
-            elif (
-                tok_string == "STOP"
-                or tok_string == "RETURN"
-                or tok_string == "SUICIDE"
-                or tok_string == "REVERT"
-                or tok_string == "ASSERTFAIL"
-            ):
-                jump_type[current_block] = "terminal"
-                end_ins_dict[current_block] = current_ins_address
-            elif tok_string == "JUMP":
-                jump_type[current_block] = "unconditional"
-                end_ins_dict[current_block] = current_ins_address
-                is_new_block = True
-            elif tok_string == "JUMPI":
-                jump_type[current_block] = "conditional"
-                end_ins_dict[current_block] = current_ins_address
-                is_new_block = True
-            elif tok_string.startswith("PUSH", 0):
-                wait_for_push = True
-            is_new_line = False
-        if tok_string != "=" and tok_string != ">":
-            current_line_content += tok_string + " "
 
     if current_block not in end_ins_dict:
         log.debug("current block: %d", current_block)
@@ -610,22 +594,26 @@ def collect_vertices(tokens):
 
 
 def construct_bb():
+    """Make the basic blocks of the start and end addresses of collect_vertices
+
+    The instructions are laid out once in pc order; a block holds the slice
+    from its first instruction up to its end address, found by bisection.
+    """
     global vertices
     global edges
     global blocks
     sorted_addresses = sorted(instructions.keys())
-    size = len(sorted_addresses)
-    # logging.info("instruction size: %d" % size)
+    code = [instructions[address] for address in sorted_addresses]
+    index = {address: i for i, address in enumerate(sorted_addresses)}
+    # logging.info("instruction size: %d" % len(code))
     for key in end_ins_dict:
         end_address = end_ins_dict[key]
         block = BasicBlock(key, end_address)
         if key not in instructions:
             continue
-        block.add_instruction(instructions[key])
-        i = sorted_addresses.index(key) + 1
-        while i < size and sorted_addresses[i] <= end_address:
-            block.add_instruction(instructions[sorted_addresses[i]])
-            i += 1
+        first = index[key]
+        last = bisect_right(sorted_addresses, end_address, first + 1)
+        block.set_instructions(code[first:last])
         block.set_block_type(jump_type[key])
         vertices[key] = block
         blocks[key] = end_address
@@ -839,16 +827,14 @@ def get_start_block_to_func_sig():
     state = 0
     func_sig = None
     for pc, instr in six.iteritems(instructions):
-        if state == 0 and instr.startswith("PUSH4"):
+        if state == 0 and instr.name == "PUSH4":
             state += 1
-            func_sig = instr.split(" ")[1][2:]
-        elif state == 1 and instr.startswith("EQ"):
+            func_sig = "%08x" % instr.operand
+        elif state == 1 and instr.name == "EQ":
             state += 1
-        elif state == 2 and instr.startswith("PUSH"):
+        elif state == 2 and instr.name.startswith("PUSH"):
             state = 0
-            pc = instr.split(" ")[1]
-            pc = int(pc, 16)
-            start_block_to_func_sig[pc] = func_sig
+            start_block_to_func_sig[instr.operand] = func_sig
         else:
             state = 0
     return start_block_to_func_sig
@@ -885,6 +871,8 @@ def full_sym_exec():
         return_owner = "return owner"
     if return_owner == None:
         return_owner = "return owner"
+    global pc_tags
+    pc_tags = tag_pcs(g_src_map, return_owner, max(instructions, default=-1) + 1)
 
     # executing, starting from beginning
     path_conditions_and_vars = {"path_condition": []}
@@ -947,17 +935,24 @@ def full_sym_exec():
             except:
                 pass
 
-    with live:
-        for start_block in start_blocks:
-            pre_length3 = len(test_results[2])
-            sym_exec_block(params, start_block, 0, 0, -1, "fallback")
-            if len(test_results[2]) > pre_length3 and sstore_mark:
-                for i in range(pre_length3, len(test_results[2])):
-                    if test_results[2][i].split(":")[1] == "standard1":
-                        test_results[2].pop(i)
-                        break
-                if len(test_results[2]) == 1:
-                    test_results[2][0] = 0
+    with dashboard(render_dashboard):
+        owner_found = False
+        if start_blocks:
+            # the first start block (transferFrom) sets up owner and the storage
+            # layout, every later start block is explored from the state it leaves
+            explore_start_block(params, start_blocks[0])
+            owner_found = owner is not None
+            state = save_start_block_state(params)
+            if global_params.PARALLEL > 1 and len(start_blocks) > 2:
+                summaries = explore_in_workers(state, start_blocks[1:])
+            else:
+                summaries = (
+                    explore_from_state(state, start_block)
+                    for start_block in start_blocks[1:]
+                )
+            for summary in summaries:
+                owner_found = merge_start_block(state, summary) or owner_found
+            end_start_blocks(state)
             # print("return_owner: ", return_owner)
             # print("_from: ", _from)
             # print("_to: ", _to)
@@ -966,7 +961,7 @@ def full_sym_exec():
 
         if not start_blocks:
             test_results = [[-1], [-1], [-1]]
-        elif owner == None:
+        elif not owner_found:
             test_results[0] = [-2]
             test_results[1] = [-2]
         elif ERC721A_load_type:
@@ -997,8 +992,227 @@ def full_sym_exec():
                         results["analysis"]["empty_transfer_event"].append(test_results[i][j])
 
 
+def explore_start_block(params, start_block):
+    """Symbolically execute every path of the function starting at start_block"""
+    pre_length3 = len(test_results[2])
+    sym_exec_block(params, start_block, 0, 0, -1, "fallback")
+    if len(test_results[2]) > pre_length3 and sstore_mark:
+        for i in range(pre_length3, len(test_results[2])):
+            if test_results[2][i].split(":")[1] == "standard1":
+                test_results[2].pop(i)
+                break
+        if len(test_results[2]) == 1:
+            test_results[2][0] = 0
+
+
+def save_start_block_state(params):
+    """Snapshot the state the first start block leaves for the later ones
+
+    Everything a start block reads and the ones before it may have changed
+    is part of the snapshot: the parameters, loop counters, detector
+    globals, variable generator, solver scopes and the findings the
+    detectors deduplicate against. Serially and in workers, every later
+    start block is explored from it, so they do not depend on each other.
+    """
+    solver.push()
+    return {
+        "params": params.copy(),
+        "visited_edges": dict(visited_edges),
+        "gen": copy.copy(gen),
+        "path_model": copy.copy(path_model),
+        "visited_blocks": set(visited_blocks),
+        "var_names": len(g_src_map.var_names) if g_src_map else 0,
+        "solver_scopes": solver.num_scopes() - 1,
+        "detectors": detector_state(),
+        "test_results": [list(test_result) for test_result in test_results],
+        "flags": (ERC721A_load_type, ERC721Pausable_trait),
+        # merged findings and coverage of the start blocks explored so far
+        "merged": [list(test_result) for test_result in test_results],
+        "covered": set(visited_blocks),
+    }
+
+
+def restore_start_block_state(state):
+    """Reset the explorer to a snapshot and return fresh parameters to start from"""
+    global visited_edges
+    global gen
+    global path_model
+    global visited_blocks
+    global test_results
+    global ERC721A_load_type
+    global ERC721Pausable_trait
+
+    solver.pop(solver.num_scopes() - state["solver_scopes"])
+    solver.push()
+    visited_edges = dict(state["visited_edges"])
+    gen = copy.copy(state["gen"])
+    path_model = copy.copy(state["path_model"])
+    visited_blocks = set(state["visited_blocks"])
+    if g_src_map:
+        del g_src_map.var_names[state["var_names"] :]
+    restore_detector_state(state["detectors"])
+    test_results = [list(test_result) for test_result in state["test_results"]]
+    ERC721A_load_type, ERC721Pausable_trait = state["flags"]
+    return state["params"].copy()
+
+
+def explore_from_state(state, start_block):
+    """Explore a later start block from the snapshot and summarize what it found"""
+    explore_start_block(restore_start_block_state(state), start_block)
+    return {
+        "test_results": test_results,
+        "owner_found": owner is not None,
+        "ERC721A_load_type": ERC721A_load_type,
+        "ERC721Pausable_trait": ERC721Pausable_trait,
+        "visited_blocks": visited_blocks,
+    }
+
+
+def merge_start_block(state, summary):
+    """Add the findings of a later start block to the ones merged so far
+
+    A finding is kept once, like the detectors do within a start block.
+
+    Returns:
+        bool: whether owner was resolved in the start block
+    """
+    merged = state["merged"]
+    for i in range(3):
+        block_results = summary["test_results"][i]
+        merged[i][0] = max(merged[i][0], block_results[0])
+        for result in block_results[len(state["test_results"][i]) :]:
+            if result not in merged[i]:
+                merged[i].append(result)
+    flags = state["flags"]
+    state["flags"] = (
+        flags[0] or summary["ERC721A_load_type"],
+        flags[1] or summary["ERC721Pausable_trait"],
+    )
+    state["covered"] |= summary["visited_blocks"]
+    return summary["owner_found"]
+
+
+def end_start_blocks(state):
+    """Leave the snapshot, with the merged findings and coverage of all start blocks"""
+    global test_results
+    global ERC721A_load_type
+    global ERC721Pausable_trait
+    global visited_blocks
+
+    solver.pop(solver.num_scopes() - state["solver_scopes"])
+    test_results = state["merged"]
+    ERC721A_load_type, ERC721Pausable_trait = state["flags"]
+    visited_blocks = state["covered"]
+
+
+def _start_block_worker(state, start_block, alarm, conn):
+    """Worker body: explore one start block and send its findings to the parent"""
+    if alarm:
+        signal.alarm(alarm)
+    no_of_paths = total_no_of_paths
+    query_cache.hits = query_cache.misses = 0
+    expr_cache.hits = expr_cache.misses = 0
+    solver_stats.reset()
+    tier_stats.reset()
+    portfolio_stats.reset()
+    try:
+        summary = explore_from_state(state, start_block)
+        summary.update(
+            {
+                "status": "ok",
+                "visited_pcs": visited_pcs,
+                "paths": total_no_of_paths - no_of_paths,
+                "query_cache": (query_cache.hits, query_cache.misses),
+                "expr_cache": (expr_cache.hits, expr_cache.misses),
+                "solver_stats": solver_stats.counters,
+                "tier_stats": tier_stats.counters(),
+                "portfolio_stats": portfolio_stats.counters(),
+            }
+        )
+    except TimeoutError:
+        summary = {"status": "timeout"}
+    except Exception:
+        summary = {"status": "error", "error": traceback.format_exc()}
+    signal.alarm(0)
+    conn.send(summary)
+    conn.close()
+
+
+def explore_in_workers(state, start_blocks):
+    """Explore start blocks in forked workers, from the snapshot of the first one
+
+    Every worker inherits the CFG and explores its start block exactly like
+    the serial explorer does, see explore_from_state. The summaries are
+    returned in start block order for merge_start_block, so the merged
+    findings are those of a serial run whatever the scheduling.
+
+    Returns:
+        list: the summary of every start block
+    """
+    global visited_pcs
+    global total_no_of_paths
+
+    ctx = multiprocessing.get_context("fork")
+    # pending alarms are not inherited, hand the rest of the budget to the workers
+    alarm = signal.alarm(0)
+    signal.alarm(alarm)
+
+    summaries = {}
+    pending = list(enumerate(start_blocks))
+    pending.reverse()
+    running = {}  # receiving end => (process, index of the start block)
+    try:
+        while pending or running:
+            while pending and len(running) < global_params.PARALLEL:
+                index, start_block = pending.pop()
+                recv_end, send_end = ctx.Pipe(duplex=False)
+                process = ctx.Process(
+                    target=_start_block_worker,
+                    args=(state, start_block, alarm, send_end),
+                )
+                process.start()
+                send_end.close()
+                running[recv_end] = (process, index)
+
+            for conn in wait(list(running.keys())):
+                process, index = running.pop(conn)
+                try:
+                    summary = conn.recv()
+                except EOFError:
+                    summary = None
+                conn.close()
+                process.join()
+                if summary is None:
+                    raise Exception(
+                        "Worker of start block %d exited with code %s"
+                        % (start_blocks[index], process.exitcode)
+                    )
+                if summary["status"] == "timeout":
+                    raise TimeoutError(os.strerror(errno.ETIME))
+                if summary["status"] == "error":
+                    raise Exception(summary["error"])
+                summaries[index] = summary
+    finally:
+        for process, _ in running.values():
+            process.kill()
+            process.join()
+
+    for summary in summaries.values():
+        visited_pcs |= summary["visited_pcs"]
+        total_no_of_paths += summary["paths"]
+        query_cache.hits += summary["query_cache"][0]
+        query_cache.misses += summary["query_cache"][1]
+        expr_cache.hits += summary["expr_cache"][0]
+        expr_cache.misses += summary["expr_cache"][1]
+        solver_stats.merge(summary["solver_stats"])
+        tier_stats.merge(summary["tier_stats"])
+        portfolio_stats.merge(summary["portfolio_stats"])
+    return [summaries[index] for index in range(len(start_blocks))]
+
+
 # Symbolically executing a block from the start address
-def sym_exec_block(params, block, pre_block, depth, func_call, current_func_name):
+def exec_block(worklist, params, block, pre_block, depth, func_call, current_func_name):
+    """Execute a basic block and schedule its successors on the worklist"""
     global solver
     global visited_edges
     global money_flow_all_paths
@@ -1019,15 +1233,9 @@ def sym_exec_block(params, block, pre_block, depth, func_call, current_func_name
     global ERC721A_load_type
     global ERC721Pausable_trait
 
-    visited = params.visited
     stack = params.stack
-    mem = params.mem
-    memory = params.memory
     global_state = params.global_state
-    sha3_list = params.sha3_list
-    path_conditions_and_vars = params.path_conditions_and_vars
     analysis = params.analysis
-    calls = params.calls
 
     if current_func_name != pre_func_name:
         # print(pre_func_name, current_func_name, block)
@@ -1036,11 +1244,9 @@ def sym_exec_block(params, block, pre_block, depth, func_call, current_func_name
         sstore_mark = False
     # if current_func_name == "assertOwnership":
     #     print("pause")
-    # Factory Function for tuples is used as dictionary key
-    Edge = namedtuple("Edge", ["v1", "v2"])
     if block < 0:
         log.debug("UNKNOWN JUMP ADDRESS. TERMINATING THIS PATH")
-        return ["ERROR"]
+        return
 
     log.debug("Reach block address %d \n", block)
 
@@ -1065,25 +1271,25 @@ def sym_exec_block(params, block, pre_block, depth, func_call, current_func_name
     log.debug(visited_edges[current_edge])
     if visited_edges[current_edge] > global_params.LOOP_LIMIT:
         log.debug("Overcome a number of loop limit. Terminating this path ...")
-        return stack
+        return
 
     current_gas_used = analysis["gas"]
     if current_gas_used > global_params.GAS_LIMIT:
         log.debug("Run out of gas. Terminating this path ... ")
-        return stack
+        return
 
     # Execute every instruction, one at a time
     try:
         block_ins = vertices[block].get_instructions()
     except KeyError:
         log.debug("This path results in an exception, possibly an invalid jump address")
-        return ["ERROR"]
+        return
     for instr in block_ins:
-        source_code = g_src_map.get_source_code(global_state["pc"])
-        instr = instr.strip()
+        tag = pc_tags[global_state["pc"]]
         sym_exec_ins(params, block, instr, func_call, current_func_name)
-        # print(instr, source_code)
-        if source_code == 'require(!paused(), "ERC721Pausable: token transfer while paused")':
+        if not tag:
+            continue
+        if tag & PcTag.PAUSABLE_CHECK:
             ERC721Pausable_trait = True
         # if source_code == "_tokenOwner[tokenId] = to":
         #     print("-------------------------------------------------------")
@@ -1094,11 +1300,10 @@ def sym_exec_block(params, block, pre_block, depth, func_call, current_func_name
         # if "_owner" in source_code:
         #     print(instr, source_code)
         # ERC721A
-        if source_code == return_owner or  source_code == "prevOwnership.addr" or source_code == "return packed":
-            owner = stack[0]
+        if tag & PcTag.OWNER_RETURN:
+            owner = stack.peek()
             # print("hello", source_code, owner)
-        elif (source_code == "result := or(eq(msgSender, owner), eq(msgSender, approvedAddress))" or
-              source_code == "result := or(eq(msgSender, from), eq(msgSender, approvedAddress))"):
+        elif tag & PcTag.ERC721A_LOAD:
             ERC721A_load_type = True
             # print(owner)
             # print("owner: ", owner)
@@ -1110,7 +1315,7 @@ def sym_exec_block(params, block, pre_block, depth, func_call, current_func_name
         #     print(stack)
 
     # Mark that this basic block in the visited blocks
-    visited.append(block)
+    params.visited = (block, params.visited)
     depth += 1
 
     # Go to next Basic Block(s)
@@ -1122,12 +1327,21 @@ def sym_exec_block(params, block, pre_block, depth, func_call, current_func_name
 
         if global_params.GENERATE_TEST_CASES:
             try:
-                model = solver.model()
+                # the last check may have been skipped
+                path_condition = params.path_conditions_and_vars["path_condition"]
+                if path_model.satisfies(path_condition):
+                    models = path_model.models()
+                else:
+                    solver.check()
+                    models = [model for _, model in solver.models if model is not None]
                 no_of_test_cases += 1
                 filename = "test%s.otest" % no_of_test_cases
                 with open(filename, "w") as f:
-                    for variable in model.decls():
-                        f.write(str(variable) + " = " + str(model[variable]) + "\n")
+                    for model in models:
+                        for variable in model.decls():
+                            f.write(
+                                str(variable) + " = " + str(model[variable]) + "\n"
+                            )
                 if os.stat(filename).st_size == 0:
                     os.remove(filename)
                     no_of_test_cases -= 1
@@ -1144,127 +1358,531 @@ def sym_exec_block(params, block, pre_block, depth, func_call, current_func_name
         new_params = params.copy()
         new_params.global_state["pc"] = successor
         if g_src_map:
-            source_code = g_src_map.get_source_code(global_state["pc"])
-            if source_code in g_src_map.func_call_names:
+            if pc_tags.tag(global_state["pc"]) & PcTag.FUNC_CALL:
                 func_call = global_state["pc"]
-        sym_exec_block(
-            new_params, successor, block, depth, func_call, current_func_name
+        worklist.append(
+            BlockTask(new_params, successor, block, depth, func_call, current_func_name)
         )
     elif jump_type[block] == "falls_to":  # just follow to the next basic block
         successor = vertices[block].get_falls_to()
         new_params = params.copy()
         new_params.global_state["pc"] = successor
-        sym_exec_block(
-            new_params, successor, block, depth, func_call, current_func_name
+        worklist.append(
+            BlockTask(new_params, successor, block, depth, func_call, current_func_name)
         )
     elif jump_type[block] == "conditional":  # executing "JUMPI"
         # A choice point, we proceed with depth first search
 
         branch_expression = vertices[block].get_branch_expression()
-        
-        log.debug("Branch expression: " + str(branch_expression))
-        # log.info("Branch expression: " + str(branch_expression))
-
-        solver.push()  # SET A BOUNDARY FOR SOLVER
-        solver.add(branch_expression)
-        # if current_func_name == "transferFrom":
-        #     print("-------------------------2-----------------------------")
-        #     print(solver)
+        feasible = decide_branch(
+            path_model,
+            params.path_conditions_and_vars["path_condition"],
+            branch_expression,
+        )
+
+        log.debug("Branch expression: %s", branch_expression)
+        worklist.append(
+            BranchTask(
+                params,
+                block,
+                depth,
+                func_call,
+                current_func_name,
+                current_edge,
+                branch_expression,
+                feasible,
+                False,
+            )
+        )
+    else:
+        updated_count_number = visited_edges[current_edge] - 1
+        visited_edges.update({current_edge: updated_count_number})
+        raise Exception("Unknown Jump-Type")
+
+
+def explore_branch(worklist, branch):
+    """Explore one side of a JUMPI if feasible, with its condition in a new scope"""
+    if branch.negated:
+        branch_expression = Not(branch.branch_expression)
+        log.debug("Negated branch expression: %s", branch_expression)
+    else:
+        branch_expression = branch.branch_expression
+    worklist.append(BranchEnd(branch, solver.num_scopes()))
+
+    try:
+        feasible = is_feasible(branch, branch_expression)
+        if feasible:
+            solver.push()  # SET A BOUNDARY FOR SOLVER
+            solver.add(branch_expression)
+            worklist.append(branch_successor(branch, branch_expression))
+        elif feasible is not None:
+            log.debug("INFEASIBLE PATH DETECTED")
+    except TimeoutError:
+        raise
+    except Exception:
+        if global_params.DEBUG_MODE:
+            traceback.print_exc()
+
+
+def is_feasible(branch, branch_expression, tier=0):
+    """Whether one side of a JUMPI, branch_expression being its condition, can be taken
+
+    The solver is only checked for a side decide_branch left undecided, with
+    the budget of tier. A side it cannot decide is deferred to the next tier
+    (None is returned) when UNKNOWN_POLICY is "defer", and explored otherwise.
+    """
+    feasible = branch.feasible[branch.negated]
+    if feasible is not None:
+        return feasible
+    tiers = timeout_tiers()
+    result = solver.check_within(tiers[tier], branch_expression)
+    if (
+        result == unknown
+        and tier + 1 < len(tiers)
+        and global_params.UNKNOWN_POLICY == "defer"
+    ):
+        log.debug("Branch deferred to a budget of %d ms" % tiers[tier + 1])
+        deferred.push(tier + 1, (branch, branch_expression, detector_state()))
+        tier_stats.deferred += 1
+        return None
+    tier_stats.count(tier, result)
+    if result == sat:
+        path_model.record(
+            branch.params.path_conditions_and_vars["path_condition"]
+            + [branch_expression],
+            solver.models,
+        )
+    return result != unsat
+
+
+def branch_successor(branch, branch_expression):
+    """The path taking one side of a JUMPI, branch_expression being its condition"""
+    if branch.negated:
+        successor = vertices[branch.block].get_falls_to()
+    else:
+        successor = vertices[branch.block].get_jump_target()
+    new_params = branch.params.copy()
+    new_params.global_state["pc"] = successor
+    new_params.path_conditions_and_vars["path_condition"].append(branch_expression)
+    return BlockTask(
+        new_params,
+        successor,
+        branch.block,
+        branch.depth,
+        branch.func_call,
+        branch.current_func_name,
+    )
+
+
+def end_branch(worklist, branch, num_scopes):
+    """Leave a branch once its paths are explored, then try the other side"""
+    # POP SOLVER CONTEXT, with the scopes a failed path left open
+    if solver.num_scopes() > num_scopes:
+        solver.pop(solver.num_scopes() - num_scopes)
+    if not branch.negated:
+        worklist.append(
+            BranchTask(
+                branch.params,
+                branch.block,
+                branch.depth,
+                branch.func_call,
+                branch.current_func_name,
+                branch.edge,
+                branch.branch_expression,
+                branch.feasible,
+                True,
+            )
+        )
+    else:
+        updated_count_number = visited_edges[branch.edge] - 1
+        visited_edges.update({branch.edge: updated_count_number})
+
+
+class BlockTask:
+    """A path waiting to execute a basic block
+
+    frame, the innermost BranchFrame of the path, is only tracked outside of
+    depth first search.
+    """
+
+    __slots__ = (
+        "params",
+        "block",
+        "pre_block",
+        "depth",
+        "func_call",
+        "current_func_name",
+        "frame",
+    )
+
+    def __init__(self, params, block, pre_block, depth, func_call, current_func_name):
+        self.params = params
+        self.block = block
+        self.pre_block = pre_block
+        self.depth = depth
+        self.func_call = func_call
+        self.current_func_name = current_func_name
+        self.frame = None
+
+    def run(self, worklist):
+        exec_block(
+            worklist,
+            self.params,
+            self.block,
+            self.pre_block,
+            self.depth,
+            self.func_call,
+            self.current_func_name,
+        )
+
+
+class BranchTask:
+    """One side of a JUMPI to explore, the jump target unless negated
+
+    feasible holds what decide_branch found for the (jump, falls_to) sides.
+    """
+
+    __slots__ = (
+        "params",
+        "block",
+        "depth",
+        "func_call",
+        "current_func_name",
+        "edge",
+        "branch_expression",
+        "feasible",
+        "negated",
+    )
+
+    def __init__(
+        self,
+        params,
+        block,
+        depth,
+        func_call,
+        current_func_name,
+        edge,
+        branch_expression,
+        feasible,
+        negated,
+    ):
+        self.params = params
+        self.block = block
+        self.depth = depth
+        self.func_call = func_call
+        self.current_func_name = current_func_name
+        self.edge = edge
+        self.branch_expression = branch_expression
+        self.feasible = feasible
+        self.negated = negated
+
+    def run(self, worklist):
+        explore_branch(worklist, self)
+
+
+class BranchEnd:
+    """Closes the solver scope of a branch once the paths below it are explored
+
+    An exception raised on one of these paths abandons the pending work up to
+    the nearest BranchEnd, like it unwound the recursive explorer up to the
+    branch being explored. num_scopes is the solver depth before the branch.
+    """
+
+    __slots__ = ("branch", "num_scopes")
+
+    def __init__(self, branch, num_scopes):
+        self.branch = branch
+        self.num_scopes = num_scopes
+
+    def run(self, worklist):
+        end_branch(worklist, self.branch, self.num_scopes)
+
+
+def sym_exec_block(params, block, pre_block, depth, func_call, current_func_name):
+    """Symbolically execute every path starting at block
+
+    Pending blocks and branches are kept on an explicit worklist rather than
+    the Python call stack, so the depth of a path is not bounded by the
+    recursion limit. The order is global_params.SEARCH, except for the
+    branches deferred to a longer solver budget, explored last.
+    """
+    base_scopes = solver.num_scopes()
+    base_length = len(params.path_conditions_and_vars["path_condition"])
+    explore(BlockTask(params, block, pre_block, depth, func_call, current_func_name))
+    explore_deferred(base_scopes, base_length)
+
+
+def explore(task):
+    if global_params.SEARCH == "dfs":
+        explore_depth_first(task)
+    else:
+        explore_with_searcher(task, make_searcher(global_params.SEARCH))
+
+
+def explore_deferred(base_scopes, base_length):
+    """Retry the deferred branches with longer budgets, exploring the feasible ones
+
+    A side is resumed with its path condition, past the first base_length
+    conditions already in the solver, in a scope above base_scopes. Loop
+    counters are shared like in depth first search, the edge into the JUMPI
+    block counting once more while the side is explored. Branches deferred
+    again on its paths wait for the tier after the one it was decided with.
+    The detectors see the state they had when the side was deferred, not the
+    one the paths explored since left, which is put back afterwards with what
+    the side resolved (see merge_detector_state).
+    """
+    while deferred:
+        tier, (branch, branch_expression, state) = deferred.pop()
+        current = detector_state()
+        restore_detector_state(state)
+        conditions = branch.params.path_conditions_and_vars["path_condition"]
+        visited_edges[branch.edge] = visited_edges.get(branch.edge, 0) + 1
         try:
-            if solver.check() == unsat:
-                log.debug("INFEASIBLE PATH DETECTED")
-            else:
-                left_branch = vertices[block].get_jump_target()
-                
-                new_params = params.copy()
-                new_params.global_state["pc"] = left_branch
-                new_params.path_conditions_and_vars["path_condition"].append(
-                    branch_expression
-                )
-                sym_exec_block(
-                    new_params, left_branch, block, depth, func_call, current_func_name
-                )
+            solver.push()
+            solver.add(conditions[base_length:])
+            if is_feasible(branch, branch_expression, tier):
+                explore(branch_successor(branch, branch_expression))
         except TimeoutError:
             raise
         except Exception:
             if global_params.DEBUG_MODE:
                 traceback.print_exc()
+        finally:
+            if solver.num_scopes() > base_scopes:
+                solver.pop(solver.num_scopes() - base_scopes)
+            visited_edges[branch.edge] -= 1
+            restore_detector_state(merge_detector_state(current, detector_state()))
+
+
+def detector_state():
+    """The globals the detectors read and update along a path"""
+    return (
+        _from,
+        _to,
+        _tokenId,
+        count,
+        owner,
+        pre_func_name,
+        sstore_mark,
+        current_func,
+    )
+
+
+def restore_detector_state(state):
+    global _from
+    global _to
+    global _tokenId
+    global count
+    global owner
+    global pre_func_name
+    global sstore_mark
+    global current_func
 
-        solver.pop()  # POP SOLVER CONTEXT
+    (
+        _from,
+        _to,
+        _tokenId,
+        count,
+        owner,
+        pre_func_name,
+        sstore_mark,
+        current_func,
+    ) = state
 
-        solver.push()  # SET A BOUNDARY FOR SOLVER
-        negated_branch_expression = Not(branch_expression)
-        solver.add(negated_branch_expression)
 
-        log.debug("Negated branch expression: " + str(negated_branch_expression))
+def merge_detector_state(state, side):
+    """The detector state after a deferred side, state being the one before it
 
+    The paths explored since the deferral keep what they left. What they
+    left unresolved (no _from, _to, _tokenId or owner, no SSTORE seen)
+    takes what the side found, as if it had been explored before them.
+    """
+    merged = list(state)
+    # _from, _to, _tokenId and owner, see detector_state
+    for i in (0, 1, 2, 4):
+        if merged[i] is None:
+            merged[i] = side[i]
+    # sstore_mark
+    merged[6] = merged[6] or side[6]
+    return tuple(merged)
+
+
+def explore_depth_first(task):
+    worklist = [task]
+    while worklist:
+        task = worklist.pop()
         try:
-            if solver.check() == unsat:
-                # Note that this check can be optimized. I.e. if the previous check succeeds,
-                # no need to check for the negated condition, but we can immediately go into
-                # the else branch
-                log.debug("INFEASIBLE PATH DETECTED")
-            else:
-                right_branch = vertices[block].get_falls_to()
-                new_params = params.copy()
-                new_params.global_state["pc"] = right_branch
-                new_params.path_conditions_and_vars["path_condition"].append(
-                    negated_branch_expression
-                )
-                sym_exec_block(
-                    new_params, right_branch, block, depth, func_call, current_func_name
-                )
+            task.run(worklist)
         except TimeoutError:
             raise
         except Exception:
+            while worklist and not isinstance(worklist[-1], BranchEnd):
+                worklist.pop()
+            if not worklist:
+                raise
             if global_params.DEBUG_MODE:
                 traceback.print_exc()
-        solver.pop()  # POP SOLVER CONTEXT
-        updated_count_number = visited_edges[current_edge] - 1
-        visited_edges.update({current_edge: updated_count_number})
+
+
+def make_searcher(strategy):
+    if strategy == "bfs":
+        return BFSSearcher()
+    elif strategy == "random-path":
+        return RandomPathSearcher()
+    elif strategy == "coverage-new-block":
+        return CoverageNewBlockSearcher(visited_blocks)
+    elif strategy == "shortest-to-log":
+        log_blocks = [
+            block
+            for block, vertex in vertices.items()
+            if any(instr.name == "LOG4" for instr in vertex.get_instructions())
+        ]
+        return ShortestToLogSearcher(distances_to(log_blocks, edges))
+    raise ValueError("Unknown search strategy: %s" % strategy)
+
+
+def check_branch(branch):
+    """Return the path taking one side of a JUMPI, None if it is infeasible"""
+    if branch.negated:
+        branch_expression = Not(branch.branch_expression)
+        log.debug("Negated branch expression: %s", branch_expression)
     else:
-        updated_count_number = visited_edges[current_edge] - 1
-        visited_edges.update({current_edge: updated_count_number})
-        raise Exception("Unknown Jump-Type")
+        branch_expression = branch.branch_expression
+    try:
+        feasible = is_feasible(branch, branch_expression)
+        if not feasible:
+            if feasible is not None:
+                log.debug("INFEASIBLE PATH DETECTED")
+            return None
+        return branch_successor(branch, branch_expression)
+    except TimeoutError:
+        raise
+    except Exception:
+        if global_params.DEBUG_MODE:
+            traceback.print_exc()
+        return None
+
+
+class BranchFrame:
+    """A JUMPI whose paths are still being explored outside of depth first search
+
+    pending counts the paths below it that have not finished. visited_edges counts the
+    edge into the JUMPI block until they are all done, as in depth first
+    search where the count is dropped after both branches.
+    """
+
+    __slots__ = ("edge", "parent", "pending")
+
+    def __init__(self, edge, parent):
+        self.edge = edge
+        self.parent = parent
+        self.pending = 0
+
+
+def release_frame(frame):
+    """Account for a finished path or frame below frame"""
+    while frame is not None:
+        frame.pending -= 1
+        if frame.pending:
+            return
+        updated_count_number = visited_edges[frame.edge] - 1
+        visited_edges.update({frame.edge: updated_count_number})
+        frame = frame.parent
+
+
+def explore_with_searcher(task, searcher):
+    """Explore the paths from task in the order the searcher picks them
+
+    Paths are resumed in any order, so the solver is switched to the path
+    condition of a path before it runs: the constraints it shares with the
+    previous path keep their scopes, the others are popped and the new ones
+    pushed one scope each. What the block itself adds to the solver goes to
+    a scope of its own. Loop counters are shared like in depth first search.
+    """
+    base_scopes = solver.num_scopes()
+    base_length = len(task.params.path_conditions_and_vars["path_condition"])
+    # conditions currently in the solver, one scope each above base_scopes
+    active = []
+
+    searcher.push(task)
+    try:
+        while len(searcher):
+            task = searcher.pop()
+            conditions = task.params.path_conditions_and_vars["path_condition"]
+            if solver.num_scopes() > base_scopes + len(active):
+                solver.pop(solver.num_scopes() - base_scopes - len(active))
+            common = 0
+            while (
+                common < len(active)
+                and base_length + common < len(conditions)
+                and active[common] is conditions[base_length + common]
+            ):
+                common += 1
+            if common < len(active):
+                solver.pop(len(active) - common)
+                del active[common:]
+            for condition in conditions[base_length + common :]:
+                solver.push()
+                solver.add(condition)
+                active.append(condition)
+            solver.push()
+
+            successors = []
+            try:
+                task.run(successors)
+            except TimeoutError:
+                raise
+            except Exception:
+                if task.frame is None:
+                    raise
+                if global_params.DEBUG_MODE:
+                    traceback.print_exc()
+                release_frame(task.frame)
+                continue
+
+            if not successors:
+                release_frame(task.frame)
+            elif isinstance(successors[0], BranchTask):
+                branch = successors[0]
+                frame = BranchFrame(branch.edge, task.frame)
+                negated = copy.copy(branch)
+                negated.negated = True
+                for side in (branch, negated):
+                    new_task = check_branch(side)
+                    if new_task is not None:
+                        new_task.frame = frame
+                        frame.pending += 1
+                        searcher.push(new_task)
+                if not frame.pending:
+                    frame.pending = 1
+                    release_frame(frame)
+            else:
+                successors[0].frame = task.frame
+                searcher.push(successors[0])
+    finally:
+        if solver.num_scopes() > base_scopes:
+            solver.pop(solver.num_scopes() - base_scopes)
 
 
 # Symbolically executing an instruction
 def sym_exec_ins(params, block, instr, func_call, current_func_name):
-    global MSIZE
     global visited_pcs
     global solver
     global vertices
-    global edges
-    global blocks
     global g_src_map
-    global g_slot_map
-    global calls_affect_state
     global instructions
     global _from
-    global _to
-    global _tokenId
-    global count
     global owner
-    global return_owner
     global test_results
     global sstore_mark
     global current_func
 
     stack = params.stack
-    mem = params.mem
-    memory = params.memory
     global_state = params.global_state
-    sha3_list = params.sha3_list
-    path_conditions_and_vars = params.path_conditions_and_vars
-    analysis = params.analysis
-    calls = params.calls
-    overflow_pcs = params.overflow_pcs
 
     visited_pcs.add(global_state["pc"])
 
-    instr_parts = str.split(instr, " ")
-    
-    opcode = instr_parts[0]
+    opcode = instr.name
 
     if opcode == "INVALID":
         return
@@ -1289,1545 +1907,1964 @@ def sym_exec_ins(params, block, instr, func_call, current_func_name):
     # )
     sleepmint_analysis(opcode, stack, solver, _from, owner, test_results, sstore_mark, current_func)
     
-    # block coverage
-    total_blocks = len(vertices)
     visited_blocks.add(block)
-    block_coverage = len(visited_blocks) / total_blocks * 100
-
-    # instruction coverage
-    perc = float(len(visited_pcs)) / len(instructions.keys()) * 100
-    # update per 5% change in code coverage
-    if int(perc) % 5 == 0:
-        live.update(
-            generate_table(
-                opcode,
-                block_coverage,
-                global_state["pc"],
-                perc,
-                g_src_map,
-                global_problematic_pcs,
-                current_func_name,
-            ),
-            refresh=True,
-        )
+    # sampled by the dashboard, see render_dashboard
+    progress.pc = global_state["pc"]
+    progress.opcode = opcode
+    progress.function = current_func_name
 
     log.debug("===============" + current_func_name + "===============")
-    log.debug("EXECUTING: " + instr)
+    log.debug("EXECUTING: %s", instr)
 
-    #
-    #  0s: Stop and Arithmetic Operations
-    #
-    
-    if opcode == "STOP":
-        global_state["pc"] = global_state["pc"] + 1
-        return
-    elif opcode == "ADD":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            # Type conversion is needed when they are mismatched
-            if isReal(first) and isSymbolic(second):
-                first = BitVecVal(first, 256)
-                computed = first + second
-            elif isSymbolic(first) and isReal(second):
-                second = BitVecVal(second, 256)
-                computed = first + second
-            else:
-                # both are real and we need to manually modulus with 2 ** 256
-                # if both are symbolic z3 takes care of modulus automatically
-                computed = (first + second) % (2**256)
-            computed = simplify(computed) if is_expr(computed) else computed
-
-            check_revert = False
-            if jump_type[block] == "conditional":
-                jump_target = vertices[block].get_jump_target()
-                falls_to = vertices[block].get_falls_to()
+    handler = opcode_handlers[instr.opcode]
+    if handler is None:
+        log.info("UNKNOWN INSTRUCTION: " + opcode)
+        if global_params.UNIT_TEST == 2 or global_params.UNIT_TEST == 3:
+            log.critical("Unknown instruction: %s" % opcode)
+            exit(UNKNOWN_INSTRUCTION)
+        raise Exception("UNKNOWN INSTRUCTION: " + opcode)
+    handler(params, block, instr, func_call, current_func_name)
+
+
+#
+#  0s: Stop and Arithmetic Operations
+#
+def exec_stop(params, block, instr, func_call, current_func_name):
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    return
+
+
+def exec_add(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        # Type conversion is needed when they are mismatched
+        if isReal(first) and isSymbolic(second):
+            first = BitVecVal(first, 256)
+            computed = first + second
+        elif isSymbolic(first) and isReal(second):
+            second = BitVecVal(second, 256)
+            computed = first + second
+        else:
+            # both are real and we need to manually modulus with 2 ** 256
+            # if both are symbolic z3 takes care of modulus automatically
+            computed = (first + second) % (2**256)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+
+        check_revert = False
+        if jump_type[block] == "conditional":
+            jump_target = vertices[block].get_jump_target()
+            falls_to = vertices[block].get_falls_to()
+            check_revert = any(
+                [
+                    True
+                    for instruction in vertices[jump_target].get_instructions()
+                    if instruction.name == "REVERT"
+                ]
+            )
+            if not check_revert:
                 check_revert = any(
                     [
                         True
-                        for instruction in vertices[jump_target].get_instructions()
-                        if instruction.startswith("REVERT")
+                        for instruction in vertices[falls_to].get_instructions()
+                        if instruction.name == "REVERT"
                     ]
                 )
-                if not check_revert:
-                    check_revert = any(
-                        [
-                            True
-                            for instruction in vertices[falls_to].get_instructions()
-                            if instruction.startswith("REVERT")
-                        ]
-                    )
 
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "MUL":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isReal(first) and isSymbolic(second):
-                first = BitVecVal(first, 256)
-            elif isSymbolic(first) and isReal(second):
-                second = BitVecVal(second, 256)
-            computed = first * second & UNSIGNED_BOUND_NUMBER
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "SUB":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isReal(first) and isSymbolic(second):
-                first = BitVecVal(first, 256)
-                computed = first - second
-            elif isSymbolic(first) and isReal(second):
-                second = BitVecVal(second, 256)
-                computed = first - second
-            else:
-                computed = (first - second) % (2**256)
-            computed = simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_mul(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isReal(first) and isSymbolic(second):
+            first = BitVecVal(first, 256)
+        elif isSymbolic(first) and isReal(second):
+            second = BitVecVal(second, 256)
+        computed = first * second & UNSIGNED_BOUND_NUMBER
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
 
-            check_revert = False
-            if jump_type[block] == "conditional":
-                jump_target = vertices[block].get_jump_target()
-                falls_to = vertices[block].get_falls_to()
+
+def exec_sub(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isReal(first) and isSymbolic(second):
+            first = BitVecVal(first, 256)
+            computed = first - second
+        elif isSymbolic(first) and isReal(second):
+            second = BitVecVal(second, 256)
+            computed = first - second
+        else:
+            computed = (first - second) % (2**256)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+
+        check_revert = False
+        if jump_type[block] == "conditional":
+            jump_target = vertices[block].get_jump_target()
+            falls_to = vertices[block].get_falls_to()
+            check_revert = any(
+                [
+                    True
+                    for instruction in vertices[jump_target].get_instructions()
+                    if instruction.name == "REVERT"
+                ]
+            )
+            if not check_revert:
                 check_revert = any(
                     [
                         True
-                        for instruction in vertices[jump_target].get_instructions()
-                        if instruction.startswith("REVERT")
+                        for instruction in vertices[falls_to].get_instructions()
+                        if instruction.name == "REVERT"
                     ]
                 )
-                if not check_revert:
-                    check_revert = any(
-                        [
-                            True
-                            for instruction in vertices[falls_to].get_instructions()
-                            if instruction.startswith("REVERT")
-                        ]
-                    )
 
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "DIV":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isAllReal(first, second):
-                if second == 0:
-                    computed = 0
-                else:
-                    first = to_unsigned(first)
-                    second = to_unsigned(second)
-                    computed = first / second
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_div(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isAllReal(first, second):
+            if second == 0:
+                computed = 0
             else:
-                first = to_symbolic(first)
-                second = to_symbolic(second)
-                solver.push()
-                solver.add(Not(second == 0))
-                if check_sat(solver) == unsat:
-                    computed = 0
-                else:
-                    computed = UDiv(first, second)
-                solver.pop()
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+                first = to_unsigned(first)
+                second = to_unsigned(second)
+                computed = first / second
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "SDIV":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isAllReal(first, second):
-                first = to_signed(first)
-                second = to_signed(second)
-                if second == 0:
-                    computed = 0
-                elif first == -(2**255) and second == -1:
-                    computed = -(2**255)
-                else:
-                    sign = -1 if (first / second) < 0 else 1
-                    computed = sign * (abs(first) / abs(second))
+            first = to_symbolic(first)
+            second = to_symbolic(second)
+            if check_sat(solver, Not(second == 0)) == unsat:
+                computed = 0
             else:
-                first = to_symbolic(first)
-                second = to_symbolic(second)
-                solver.push()
-                solver.add(Not(second == 0))
-                if check_sat(solver) == unsat:
-                    computed = 0
-                else:
-                    solver.push()
-                    solver.add(Not(And(first == -(2**255), second == -1)))
-                    if check_sat(solver) == unsat:
-                        computed = -(2**255)
-                    else:
-                        solver.push()
-                        solver.add(first / second < 0)
-                        sign = -1 if check_sat(solver) == sat else 1
-
-                        def z3_abs(x):
-                            return If(x >= 0, x, -x)
-
-                        first = z3_abs(first)
-                        second = z3_abs(second)
-                        computed = sign * (first / second)
-                        solver.pop()
-                    solver.pop()
-                solver.pop()
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "MOD":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isAllReal(first, second):
-                if second == 0:
-                    computed = 0
-                else:
-                    first = to_unsigned(first)
-                    second = to_unsigned(second)
-                    computed = first % second & UNSIGNED_BOUND_NUMBER
+                computed = UDiv(first, second)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
 
-            else:
-                first = to_symbolic(first)
-                second = to_symbolic(second)
 
-                solver.push()
-                solver.add(Not(second == 0))
-                if check_sat(solver) == unsat:
-                    # it is provable that second is indeed equal to zero
-                    computed = 0
-                else:
-                    computed = URem(first, second)
-                solver.pop()
+def exec_sdiv(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
 
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isAllReal(first, second):
+            first = to_signed(first)
+            second = to_signed(second)
+            if second == 0:
+                computed = 0
+            elif first == -(2**255) and second == -1:
+                computed = -(2**255)
+            else:
+                sign = -1 if (first / second) < 0 else 1
+                computed = sign * (abs(first) / abs(second))
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "SMOD":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isAllReal(first, second):
-                if second == 0:
-                    computed = 0
-                else:
-                    first = to_signed(first)
-                    second = to_signed(second)
-                    sign = -1 if first < 0 else 1
-                    computed = sign * (abs(first) % abs(second))
+            first = to_symbolic(first)
+            second = to_symbolic(second)
+            nonzero = Not(second == 0)
+            if check_sat(solver, nonzero) == unsat:
+                computed = 0
             else:
-                first = to_symbolic(first)
-                second = to_symbolic(second)
-
-                solver.push()
-                solver.add(Not(second == 0))
-                if check_sat(solver) == unsat:
-                    # it is provable that second is indeed equal to zero
-                    computed = 0
+                no_overflow = Not(And(first == -(2**255), second == -1))
+                if check_sat(solver, nonzero, no_overflow) == unsat:
+                    computed = -(2**255)
                 else:
-                    solver.push()
-                    solver.add(first < 0)  # check sign of first element
-                    sign = (
-                        BitVecVal(-1, 256)
-                        if check_sat(solver) == sat
-                        else BitVecVal(1, 256)
-                    )
-                    solver.pop()
+                    conditions = (nonzero, no_overflow, first / second < 0)
+                    sign = -1 if check_sat(solver, *conditions) == sat else 1
 
                     def z3_abs(x):
                         return If(x >= 0, x, -x)
 
                     first = z3_abs(first)
                     second = z3_abs(second)
+                    computed = sign * (first / second)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
 
-                    computed = sign * (first % second)
-                solver.pop()
 
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "ADDMOD":
-        if len(stack) > 2:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            third = stack.pop(0)
+def exec_mod(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
 
-            if isAllReal(first, second, third):
-                if third == 0:
-                    computed = 0
-                else:
-                    computed = (first + second) % third
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isAllReal(first, second):
+            if second == 0:
+                computed = 0
             else:
-                first = to_symbolic(first)
-                second = to_symbolic(second)
-                solver.push()
-                solver.add(Not(third == 0))
-                if check_sat(solver) == unsat:
-                    computed = 0
-                else:
-                    first = ZeroExt(256, first)
-                    second = ZeroExt(256, second)
-                    third = ZeroExt(256, third)
-                    computed = (first + second) % third
-                    computed = Extract(255, 0, computed)
-                solver.pop()
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+                first = to_unsigned(first)
+                second = to_unsigned(second)
+                computed = first % second & UNSIGNED_BOUND_NUMBER
+
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "MULMOD":
-        if len(stack) > 2:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            third = stack.pop(0)
+            first = to_symbolic(first)
+            second = to_symbolic(second)
 
-            if isAllReal(first, second, third):
-                if third == 0:
-                    computed = 0
-                else:
-                    computed = (first * second) % third
+            if check_sat(solver, Not(second == 0)) == unsat:
+                # it is provable that second is indeed equal to zero
+                computed = 0
             else:
-                first = to_symbolic(first)
-                second = to_symbolic(second)
-                solver.push()
-                solver.add(Not(third == 0))
-                if check_sat(solver) == unsat:
-                    computed = 0
-                else:
-                    first = ZeroExt(256, first)
-                    second = ZeroExt(256, second)
-                    third = ZeroExt(256, third)
-                    computed = URem(first * second, third)
-                    computed = Extract(255, 0, computed)
-                solver.pop()
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "EXP":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            base = stack.pop(0)
-            exponent = stack.pop(0)
-            # Type conversion is needed when they are mismatched
-            if isAllReal(base, exponent):
-                computed = pow(base, exponent, 2**256)
+                computed = URem(first, second)
+
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_smod(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isAllReal(first, second):
+            if second == 0:
+                computed = 0
             else:
-                # The computed value is unknown, this is because power is
-                # not supported in bit-vector theory
-                new_var_name = gen.gen_arbitrary_var()
-                computed = BitVec(new_var_name, 256)
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+                first = to_signed(first)
+                second = to_signed(second)
+                sign = -1 if first < 0 else 1
+                computed = sign * (abs(first) % abs(second))
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "SIGNEXTEND":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isAllReal(first, second):
-                if first >= 32 or first < 0:
-                    computed = second
-                else:
-                    signbit_index_from_right = 8 * first + 7
-                    if second & (1 << signbit_index_from_right):
-                        computed = second | (2**256 - (1 << signbit_index_from_right))
-                    else:
-                        computed = second & ((1 << signbit_index_from_right) - 1)
+            first = to_symbolic(first)
+            second = to_symbolic(second)
+
+            if check_sat(solver, Not(second == 0)) == unsat:
+                # it is provable that second is indeed equal to zero
+                computed = 0
             else:
-                first = to_symbolic(first)
-                second = to_symbolic(second)
-                solver.push()
-                solver.add(Not(Or(first >= 32, first < 0)))
-                if check_sat(solver) == unsat:
-                    computed = second
-                else:
-                    signbit_index_from_right = 8 * first + 7
-                    solver.push()
-                    solver.add(second & (1 << signbit_index_from_right) == 0)
-                    if check_sat(solver) == unsat:
-                        computed = second | (2**256 - (1 << signbit_index_from_right))
-                    else:
-                        computed = second & ((1 << signbit_index_from_right) - 1)
-                    solver.pop()
-                solver.pop()
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    #
-    #  10s: Comparison and Bitwise Logic Operations
-    #
-    elif opcode == "LT":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
+                sign = (
+                    BitVecVal(-1, 256)
+                    # check sign of first element
+                    if check_sat(solver, Not(second == 0), first < 0) == sat
+                    else BitVecVal(1, 256)
+                )
 
-            if isAllReal(first, second):
-                first = to_unsigned(first)
-                second = to_unsigned(second)
-                if first < second:
-                    computed = 1
-                else:
-                    computed = 0
+                def z3_abs(x):
+                    return If(x >= 0, x, -x)
+
+                first = z3_abs(first)
+                second = z3_abs(second)
+
+                computed = sign * (first % second)
+
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_addmod(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 2:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        third = stack.pop()
+
+        if isAllReal(first, second, third):
+            if third == 0:
+                computed = 0
             else:
-                computed = If(ULT(first, second), BitVecVal(1, 256), BitVecVal(0, 256))
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+                computed = (first + second) % third
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "GT":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
+            first = to_symbolic(first)
+            second = to_symbolic(second)
+            if check_sat(solver, Not(third == 0)) == unsat:
+                computed = 0
+            else:
+                first = ZeroExt(256, first)
+                second = ZeroExt(256, second)
+                third = ZeroExt(256, third)
+                computed = (first + second) % third
+                computed = Extract(255, 0, computed)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
 
-            if isAllReal(first, second):
-                first = to_unsigned(first)
-                second = to_unsigned(second)
-                if first > second:
-                    computed = 1
-                else:
-                    computed = 0
+
+def exec_mulmod(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 2:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        third = stack.pop()
+
+        if isAllReal(first, second, third):
+            if third == 0:
+                computed = 0
             else:
-                computed = If(UGT(first, second), BitVecVal(1, 256), BitVecVal(0, 256))
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+                computed = (first * second) % third
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "SLT":  # Not fully faithful to signed comparison
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isAllReal(first, second):
-                first = to_signed(first)
-                second = to_signed(second)
-                if first < second:
-                    computed = 1
-                else:
-                    computed = 0
+            first = to_symbolic(first)
+            second = to_symbolic(second)
+            if check_sat(solver, Not(third == 0)) == unsat:
+                computed = 0
             else:
-                computed = If(first < second, BitVecVal(1, 256), BitVecVal(0, 256))
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+                first = ZeroExt(256, first)
+                second = ZeroExt(256, second)
+                third = ZeroExt(256, third)
+                computed = URem(first * second, third)
+                computed = Extract(255, 0, computed)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_exp(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        base = stack.pop()
+        exponent = stack.pop()
+        # Type conversion is needed when they are mismatched
+        if isAllReal(base, exponent):
+            computed = pow(base, exponent, 2**256)
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "SGT":  # Not fully faithful to signed comparison
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isAllReal(first, second):
-                first = to_signed(first)
-                second = to_signed(second)
-                if first > second:
-                    computed = 1
-                else:
-                    computed = 0
+            # The computed value is unknown, this is because power is
+            # not supported in bit-vector theory
+            new_var_name = gen.gen_arbitrary_var()
+            computed = BitVec(new_var_name, 256)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_signextend(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isAllReal(first, second):
+            if first >= 32 or first < 0:
+                computed = second
             else:
-                computed = If(first > second, BitVecVal(1, 256), BitVecVal(0, 256))
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "EQ":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            if isAllReal(first, second):
-                if first == second:
-                    computed = 1
+                signbit_index_from_right = 8 * first + 7
+                if second & (1 << signbit_index_from_right):
+                    computed = second | (2**256 - (1 << signbit_index_from_right))
                 else:
-                    computed = 0
-            else:
-                computed = If(first == second, BitVecVal(1, 256), BitVecVal(0, 256))
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+                    computed = second & ((1 << signbit_index_from_right) - 1)
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "ISZERO":
-        # Tricky: this instruction works on both boolean and integer,
-        # when we have a symbolic expression, type error might occur
-        # Currently handled by try and catch
-        if len(stack) > 0:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            if isReal(first):
-                if first == 0:
-                    computed = 1
+            first = to_symbolic(first)
+            second = to_symbolic(second)
+            if check_sat(solver, Not(Or(first >= 32, first < 0))) == unsat:
+                computed = second
+            else:
+                signbit_index_from_right = 8 * first + 7
+                if (
+                    check_sat(
+                        solver,
+                        Not(Or(first >= 32, first < 0)),
+                        second & (1 << signbit_index_from_right) == 0,
+                    )
+                    == unsat
+                ):
+                    computed = second | (2**256 - (1 << signbit_index_from_right))
                 else:
-                    computed = 0
+                    computed = second & ((1 << signbit_index_from_right) - 1)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+#
+#  10s: Comparison and Bitwise Logic Operations
+#
+def exec_lt(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+
+        if isAllReal(first, second):
+            first = to_unsigned(first)
+            second = to_unsigned(second)
+            if first < second:
+                computed = 1
             else:
-                computed = If(first == 0, BitVecVal(1, 256), BitVecVal(0, 256))
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "AND":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
-            computed = first & second
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+                computed = 0
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "OR":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
+            computed = If(ULT(first, second), BitVecVal(1, 256), BitVecVal(0, 256))
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
 
-            computed = first | second
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+def exec_gt(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
 
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+
+        if isAllReal(first, second):
+            first = to_unsigned(first)
+            second = to_unsigned(second)
+            if first > second:
+                computed = 1
+            else:
+                computed = 0
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "XOR":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            second = stack.pop(0)
+            computed = If(UGT(first, second), BitVecVal(1, 256), BitVecVal(0, 256))
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
 
-            computed = first ^ second
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
 
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "NOT":
-        if len(stack) > 0:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            computed = (~first) & UNSIGNED_BOUND_NUMBER
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "BYTE":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            first = stack.pop(0)
-            byte_index = 32 - first - 1
-            second = stack.pop(0)
+def exec_slt(params, block, instr, func_call, current_func_name):
+    # Not fully faithful to signed comparison
+    stack = params.stack
+    global_state = params.global_state
 
-            if isAllReal(first, second):
-                if first >= 32 or first < 0:
-                    computed = 0
-                else:
-                    computed = second & (255 << (8 * byte_index))
-                    computed = computed >> (8 * byte_index)
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isAllReal(first, second):
+            first = to_signed(first)
+            second = to_signed(second)
+            if first < second:
+                computed = 1
             else:
-                first = to_symbolic(first)
-                second = to_symbolic(second)
-                solver.push()
-                solver.add(Not(Or(first >= 32, first < 0)))
-                if check_sat(solver) == unsat:
-                    computed = 0
-                else:
-                    computed = second & (255 << (8 * byte_index))
-                    computed = computed >> (8 * byte_index)
-                solver.pop()
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
+                computed = 0
         else:
-            raise ValueError("STACK underflow")
-    #
-    # 20s: SHA3/KECCAK256
-    #
-    elif opcode in ["KECCAK256", "SHA3"]:
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            s0 = stack.pop(0)  # 0
-            s1 = stack.pop(0)  # 64
-            slot = None
-            if isAllReal(s0, s1):
-                # simulate the hashing of sha3
-                data = [str(x) for x in memory[s0 : s0 + s1]]
-
-                # *Slot id in memory[63] <= MSTORE(64, slot)
-                slot = memory[63]
-                position = "".join(data)
-                position = re.sub("[\s+]", "", position)
-                position = zlib.compress(six.b(position), 9)
-                position = base64.b64encode(position)
-                position = position.decode("utf-8", "strict")
-                if position in sha3_list:
-                    stack.insert(0, sha3_list[position])
-                else:
-                    new_var_name = gen.gen_arbitrary_var()
-                    new_var = BitVec(new_var_name, 256)
-                    sha3_list[position] = new_var
-                    stack.insert(0, new_var)
-            else:
-                # push into the execution a fresh symbolic variable
-                new_var_name = gen.gen_arbitrary_var()
-                new_var = BitVec(new_var_name, 256)
-                path_conditions_and_vars[new_var_name] = new_var
-                stack.insert(0, new_var)
-            # find special stack&mem events during SE
-            if global_state["mint"]["MSTORE_2"] == True:
-                global_state["mint"]["hash"] = stack[0]
-                global_state["mint"]["MSTORE_2"] = False
-            elif global_state["approve"]["MSTORE_2"] == True:
-                global_state["approve"]["hash"] = stack[0]
-                global_state["approve"]["MSTORE_2"] = False
-            elif global_state["approve"]["MSTORE_owner"] == True:
-                global_state["approve"]["owner_hash"] = stack[0]
-                global_state["approve"]["MSTORE_owner"] = False
-            elif global_state["burn"]["MSTORE_2"] == True:
-                global_state["burn"]["hash"] = stack[0]
-                global_state["burn"]["MSTORE_2"] = False
-            elif global_state["setApprovalForAll"]["MSTORE_3"] == True:
-                global_state["setApprovalForAll"]["hash"] = stack[0]
-                global_state["setApprovalForAll"]["MSTORE_3"] = False
-            elif global_state["transfer"]["MSTORE_owner"] == True:
-                global_state["transfer"]["owner_hash"] = stack[0]
-                global_state["transfer"]["MSTORE_owner"] = False
-            elif global_state["transfer"]["MSTORE_2"] == True:
-                global_state["approve"]["hash"] = stack[0]
-                global_state["transfer"]["MSTORE_2"] = False
+            computed = If(first < second, BitVecVal(1, 256), BitVecVal(0, 256))
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
 
-        else:
-            raise ValueError("STACK underflow")
-    #
-    # 30s: Environment Information
-    #
-    elif opcode == "ADDRESS":  # get address of currently executing account
-        global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, path_conditions_and_vars["Ia"])
-    elif opcode == "BALANCE":
-        if len(stack) > 0:
-            global_state["pc"] = global_state["pc"] + 1
-            address = stack.pop(0)
 
-            new_var_name = gen.gen_balance_var()
-            if new_var_name in path_conditions_and_vars:
-                new_var = path_conditions_and_vars[new_var_name]
-            else:
-                new_var = BitVec(new_var_name, 256)
-                path_conditions_and_vars[new_var_name] = new_var
-            if isReal(address):
-                hashed_address = "concrete_address_" + str(address)
+def exec_sgt(params, block, instr, func_call, current_func_name):
+    # Not fully faithful to signed comparison
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isAllReal(first, second):
+            first = to_signed(first)
+            second = to_signed(second)
+            if first > second:
+                computed = 1
             else:
-                hashed_address = str(address)
-            global_state["balance"][hashed_address] = new_var
-            stack.insert(0, new_var)
+                computed = 0
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "CALLER":  # get caller address
-        # that is directly responsible for this execution
-        global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["sender_address"])
-        # print("CALLER: ", stack)
-    elif opcode == "ORIGIN":  # get execution origination address
-        global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["origin"])
-    elif opcode == "CALLVALUE":  # get value of this transaction
-        global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["value"])
-        # buy function feature: msg.value to transfer the token
+            computed = If(first > second, BitVecVal(1, 256), BitVecVal(0, 256))
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
 
-    elif opcode == "CALLDATALOAD":  # from inputter data from environment
-        if len(stack) > 0:
-            global_state["pc"] = global_state["pc"] + 1
-            position = stack.pop(0)
-            if g_src_map:
-                source_code = g_src_map.get_source_code(global_state["pc"] - 1)
-                if (
-                    source_code.startswith("function")
-                    and isReal(position)
-                    and current_func_name in g_src_map.func_name_to_params
-                ):
-                    params = g_src_map.func_name_to_params[current_func_name]
-                    param_idx = (position - 4) // 32
-                    for param in params:
-                        if param_idx == param["position"]:
-                            new_var_name = param["name"]
-                            g_src_map.var_names.append(new_var_name)
-                else:
-                    new_var_name = gen.gen_data_var(position)
-            else:
-                new_var_name = gen.gen_data_var(position)
-            if new_var_name in path_conditions_and_vars:
-                new_var = path_conditions_and_vars[new_var_name]
+
+def exec_eq(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+        if isAllReal(first, second):
+            if first == second:
+                computed = 1
             else:
-                new_var = BitVec(new_var_name, 256)
-                path_conditions_and_vars[new_var_name] = new_var
-            stack.insert(0, new_var)
-            count += 1
-            if count == 1:
-                _from = stack[0]
-            elif count == 2:
-                _to = stack[0]
-            elif count == 3:
-                _tokenId = stack[0]
+                computed = 0
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "CALLDATASIZE":
+            computed = If(first == second, BitVecVal(1, 256), BitVecVal(0, 256))
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_iszero(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    # Tricky: this instruction works on both boolean and integer,
+    # when we have a symbolic expression, type error might occur
+    # Currently handled by try and catch
+    if len(stack) > 0:
         global_state["pc"] = global_state["pc"] + 1
-        new_var_name = gen.gen_data_size()
-        if new_var_name in path_conditions_and_vars:
-            new_var = path_conditions_and_vars[new_var_name]
+        first = stack.pop()
+        if isReal(first):
+            if first == 0:
+                computed = 1
+            else:
+                computed = 0
         else:
-            new_var = BitVec(new_var_name, 256)
-            path_conditions_and_vars[new_var_name] = new_var
-        stack.insert(0, new_var)
-    elif opcode == "CALLDATACOPY":  # Copy inputter data to memory
-        #  TODO: Don't know how to simulate this yet
-        if len(stack) > 2:
-            global_state["pc"] = global_state["pc"] + 1
-            stack.pop(0)
-            stack.pop(0)
-            stack.pop(0)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "CODESIZE":
+            computed = If(first == 0, BitVecVal(1, 256), BitVecVal(0, 256))
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_and(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
         global_state["pc"] = global_state["pc"] + 1
-        if g_disasm_file.endswith(".disasm"):
-            evm_file_name = g_disasm_file[:-7]
+        first = stack.pop()
+        second = stack.pop()
+        computed = first & second
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_or(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+
+        computed = first | second
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_xor(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        second = stack.pop()
+
+        computed = first ^ second
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_not(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 0:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        computed = (~first) & UNSIGNED_BOUND_NUMBER
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_byte(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        first = stack.pop()
+        byte_index = 32 - first - 1
+        second = stack.pop()
+
+        if isAllReal(first, second):
+            if first >= 32 or first < 0:
+                computed = 0
+            else:
+                computed = second & (255 << (8 * byte_index))
+                computed = computed >> (8 * byte_index)
         else:
-            evm_file_name = g_disasm_file
-        with open(evm_file_name, "r") as evm_file:
-            evm = evm_file.read()[:-1]
-            code_size = len(evm) / 2
-            stack.insert(0, code_size)
-    elif opcode == "CODECOPY":
-        if len(stack) > 2:
-            global_state["pc"] = global_state["pc"] + 1
-            mem_location = stack.pop(0)
-            code_from = stack.pop(0)
-            no_bytes = stack.pop(0)
-            current_miu_i = global_state["miu_i"]
-
-            if isAllReal(mem_location, current_miu_i, code_from, no_bytes):
-                temp = int(math.ceil((mem_location + no_bytes) / float(32)))
-                if temp > current_miu_i:
-                    current_miu_i = temp
-
-                if g_disasm_file.endswith(".disasm"):
-                    evm_file_name = g_disasm_file[:-7]
-                else:
-                    evm_file_name = g_disasm_file
-                with open(evm_file_name, "r") as evm_file:
-                    evm = evm_file.read()[:-1]
-                    start = code_from * 2
-                    end = start + no_bytes * 2
-                    code = evm[start:end]
-                mem[mem_location] = int(code, 16)
+            first = to_symbolic(first)
+            second = to_symbolic(second)
+            if check_sat(solver, Not(Or(first >= 32, first < 0))) == unsat:
+                computed = 0
             else:
-                new_var_name = gen.gen_code_var("Ia", code_from, no_bytes)
-                if new_var_name in path_conditions_and_vars:
-                    new_var = path_conditions_and_vars[new_var_name]
-                else:
-                    new_var = BitVec(new_var_name, 256)
-                    path_conditions_and_vars[new_var_name] = new_var
+                computed = second & (255 << (8 * byte_index))
+                computed = computed >> (8 * byte_index)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
 
-                temp = ((mem_location + no_bytes) / 32) + 1
-                current_miu_i = to_symbolic(current_miu_i)
-                expression = current_miu_i < temp
-                solver.push()
-                solver.add(expression)
-                if MSIZE:
-                    if check_sat(solver) != unsat:
-                        current_miu_i = If(expression, temp, current_miu_i)
-                solver.pop()
-                mem.clear()  # very conservative
-                mem[str(mem_location)] = new_var
-            global_state["miu_i"] = current_miu_i
+
+#
+# 20s: SHA3/KECCAK256
+#
+def exec_keccak256(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    mem = params.mem
+    global_state = params.global_state
+    sha3_list = params.sha3_list
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        s0 = stack.pop()  # 0
+        s1 = stack.pop()  # 64
+        if isAllReal(s0, s1) and s1 <= MAX_KEY_SIZE:
+            position = mem.key(s0, s1)
+            if isinstance(position, bytes):
+                # concrete input, the real digest (e.g. the slot of a mapping entry)
+                stack.push(keccak256(position))
+            elif position in sha3_list:
+                # simulate the hashing of sha3, equal contents get the same variable
+                stack.push(sha3_list[position])
+            else:
+                new_var_name = gen.gen_arbitrary_var()
+                new_var = BitVec(new_var_name, 256)
+                sha3_list[position] = new_var
+                stack.push(new_var)
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "RETURNDATACOPY":
-        if len(stack) > 2:
-            global_state["pc"] += 1
-            stack.pop(0)
-            stack.pop(0)
-            stack.pop(0)
+            # push into the execution a fresh symbolic variable
+            new_var_name = gen.gen_arbitrary_var()
+            new_var = BitVec(new_var_name, 256)
+            path_conditions_and_vars[new_var_name] = new_var
+            stack.push(new_var)
+        # find special stack&mem events during SE
+        if global_state["mint"]["MSTORE_2"] == True:
+            global_state["mint"]["hash"] = stack.peek()
+            global_state["mint"]["MSTORE_2"] = False
+        elif global_state["approve"]["MSTORE_2"] == True:
+            global_state["approve"]["hash"] = stack.peek()
+            global_state["approve"]["MSTORE_2"] = False
+        elif global_state["approve"]["MSTORE_owner"] == True:
+            global_state["approve"]["owner_hash"] = stack.peek()
+            global_state["approve"]["MSTORE_owner"] = False
+        elif global_state["burn"]["MSTORE_2"] == True:
+            global_state["burn"]["hash"] = stack.peek()
+            global_state["burn"]["MSTORE_2"] = False
+        elif global_state["setApprovalForAll"]["MSTORE_3"] == True:
+            global_state["setApprovalForAll"]["hash"] = stack.peek()
+            global_state["setApprovalForAll"]["MSTORE_3"] = False
+        elif global_state["transfer"]["MSTORE_owner"] == True:
+            global_state["transfer"]["owner_hash"] = stack.peek()
+            global_state["transfer"]["MSTORE_owner"] = False
+        elif global_state["transfer"]["MSTORE_2"] == True:
+            global_state["approve"]["hash"] = stack.peek()
+            global_state["transfer"]["MSTORE_2"] = False
+
+    else:
+        raise ValueError("STACK underflow")
+
+
+#
+# 30s: Environment Information
+#
+def exec_address(params, block, instr, func_call, current_func_name):
+    # get address of currently executing account
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(path_conditions_and_vars["Ia"])
+
+
+def exec_balance(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    if len(stack) > 0:
+        global_state["pc"] = global_state["pc"] + 1
+        address = stack.pop()
+
+        new_var_name = gen.gen_balance_var()
+        if new_var_name in path_conditions_and_vars:
+            new_var = path_conditions_and_vars[new_var_name]
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "RETURNDATASIZE":
-        global_state["pc"] += 1
-        new_var_name = gen.gen_arbitrary_var()
+            new_var = BitVec(new_var_name, 256)
+            path_conditions_and_vars[new_var_name] = new_var
+        if isReal(address):
+            hashed_address = "concrete_address_" + str(address)
+        else:
+            hashed_address = expr_key(address)
+        global_state["balance"][hashed_address] = new_var
+        stack.push(new_var)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_caller(params, block, instr, func_call, current_func_name):
+    # get caller address
+    stack = params.stack
+    global_state = params.global_state
+
+    # that is directly responsible for this execution
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["sender_address"])
+    # print("CALLER: ", stack)
+
+
+def exec_origin(params, block, instr, func_call, current_func_name):
+    # get execution origination address
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["origin"])
+
+
+def exec_callvalue(params, block, instr, func_call, current_func_name):
+    # get value of this transaction
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["value"])
+    # buy function feature: msg.value to transfer the token
+
+
+def exec_calldataload(params, block, instr, func_call, current_func_name):
+    # from inputter data from environment
+    global _from
+    global _to
+    global _tokenId
+    global count
+
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    if len(stack) > 0:
+        global_state["pc"] = global_state["pc"] + 1
+        position = stack.pop()
+        if g_src_map:
+            source_code = g_src_map.get_source_code(global_state["pc"] - 1)
+            if (
+                source_code.startswith("function")
+                and isReal(position)
+                and current_func_name in g_src_map.func_name_to_params
+            ):
+                params = g_src_map.func_name_to_params[current_func_name]
+                param_idx = (position - 4) // 32
+                for param in params:
+                    if param_idx == param["position"]:
+                        new_var_name = param["name"]
+                        g_src_map.var_names.append(new_var_name)
+            else:
+                new_var_name = gen.gen_data_var(position)
+        else:
+            new_var_name = gen.gen_data_var(position)
+        if new_var_name in path_conditions_and_vars:
+            new_var = path_conditions_and_vars[new_var_name]
+        else:
+            new_var = BitVec(new_var_name, 256)
+            path_conditions_and_vars[new_var_name] = new_var
+        stack.push(new_var)
+        count += 1
+        if count == 1:
+            _from = stack.peek()
+        elif count == 2:
+            _to = stack.peek()
+        elif count == 3:
+            _tokenId = stack.peek()
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_calldatasize(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    global_state["pc"] = global_state["pc"] + 1
+    new_var_name = gen.gen_data_size()
+    if new_var_name in path_conditions_and_vars:
+        new_var = path_conditions_and_vars[new_var_name]
+    else:
         new_var = BitVec(new_var_name, 256)
-        stack.insert(0, new_var)
-    elif opcode == "GASPRICE":
+        path_conditions_and_vars[new_var_name] = new_var
+    stack.push(new_var)
+
+
+def exec_calldatacopy(params, block, instr, func_call, current_func_name):
+    # Copy inputter data to memory
+    stack = params.stack
+    global_state = params.global_state
+
+    #  TODO: Don't know how to simulate this yet
+    if len(stack) > 2:
         global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["gas_price"])
-    elif opcode == "EXTCODESIZE":
-        if len(stack) > 0:
-            global_state["pc"] = global_state["pc"] + 1
-            address = stack.pop(0)
+        stack.pop()
+        stack.pop()
+        stack.pop()
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_codesize(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    code_size = len(g_bytecode) // 2
+    stack.push(code_size)
+
+
+def exec_codecopy(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    mem = params.mem
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
 
-            # not handled yet
-            new_var_name = gen.gen_code_size_var(address)
+    if len(stack) > 2:
+        global_state["pc"] = global_state["pc"] + 1
+        mem_location = stack.pop()
+        code_from = stack.pop()
+        no_bytes = stack.pop()
+        current_miu_i = global_state["miu_i"]
+
+        if isAllReal(mem_location, current_miu_i, code_from, no_bytes):
+            temp = int(math.ceil((mem_location + no_bytes) / float(32)))
+            if temp > current_miu_i:
+                current_miu_i = temp
+
+            start = code_from * 2
+            end = start + no_bytes * 2
+            code = g_bytecode[start:end]
+            mem[mem_location] = int(code, 16)
+        else:
+            new_var_name = gen.gen_code_var("Ia", code_from, no_bytes)
             if new_var_name in path_conditions_and_vars:
                 new_var = path_conditions_and_vars[new_var_name]
             else:
                 new_var = BitVec(new_var_name, 256)
                 path_conditions_and_vars[new_var_name] = new_var
-            stack.insert(0, new_var)
+
+            temp = ((mem_location + no_bytes) / 32) + 1
+            current_miu_i = to_symbolic(current_miu_i)
+            expression = current_miu_i < temp
+            if MSIZE:
+                if check_sat(solver, expression) != unsat:
+                    current_miu_i = If(expression, temp, current_miu_i)
+            mem.clear()  # very conservative
+            mem[expr_key(mem_location)] = new_var
+        global_state["miu_i"] = current_miu_i
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_returndatacopy(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 2:
+        global_state["pc"] += 1
+        stack.pop()
+        stack.pop()
+        stack.pop()
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_returndatasize(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] += 1
+    new_var_name = gen.gen_arbitrary_var()
+    new_var = BitVec(new_var_name, 256)
+    stack.push(new_var)
+
+
+def exec_gasprice(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["gas_price"])
+
+
+def exec_extcodesize(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    if len(stack) > 0:
+        global_state["pc"] = global_state["pc"] + 1
+        address = stack.pop()
+
+        # not handled yet
+        new_var_name = gen.gen_code_size_var(address)
+        if new_var_name in path_conditions_and_vars:
+            new_var = path_conditions_and_vars[new_var_name]
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "EXTCODECOPY":
-        if len(stack) > 3:
-            global_state["pc"] = global_state["pc"] + 1
-            address = stack.pop(0)
-            mem_location = stack.pop(0)
-            code_from = stack.pop(0)
-            no_bytes = stack.pop(0)
-            current_miu_i = global_state["miu_i"]
+            new_var = BitVec(new_var_name, 256)
+            path_conditions_and_vars[new_var_name] = new_var
+        stack.push(new_var)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_extcodecopy(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    mem = params.mem
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
 
-            new_var_name = gen.gen_code_var(address, code_from, no_bytes)
+    if len(stack) > 3:
+        global_state["pc"] = global_state["pc"] + 1
+        address = stack.pop()
+        mem_location = stack.pop()
+        code_from = stack.pop()
+        no_bytes = stack.pop()
+        current_miu_i = global_state["miu_i"]
+
+        new_var_name = gen.gen_code_var(address, code_from, no_bytes)
+        if new_var_name in path_conditions_and_vars:
+            new_var = path_conditions_and_vars[new_var_name]
+        else:
+            new_var = BitVec(new_var_name, 256)
+            path_conditions_and_vars[new_var_name] = new_var
+
+        temp = ((mem_location + no_bytes) / 32) + 1
+        current_miu_i = to_symbolic(current_miu_i)
+        expression = current_miu_i < temp
+        if MSIZE:
+            if check_sat(solver, expression) != unsat:
+                current_miu_i = If(expression, temp, current_miu_i)
+        mem.clear()  # very conservative
+        mem[expr_key(mem_location)] = new_var
+        global_state["miu_i"] = current_miu_i
+    else:
+        raise ValueError("STACK underflow")
+
+
+#
+#  40s: Block Information
+#
+def exec_blockhash(params, block, instr, func_call, current_func_name):
+    # information from block header
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    if len(stack) > 0:
+        global_state["pc"] = global_state["pc"] + 1
+        stack.pop()
+        new_var_name = "IH_blockhash"
+        if new_var_name in path_conditions_and_vars:
+            new_var = path_conditions_and_vars[new_var_name]
+        else:
+            new_var = BitVec(new_var_name, 256)
+            path_conditions_and_vars[new_var_name] = new_var
+        stack.push(new_var)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_coinbase(params, block, instr, func_call, current_func_name):
+    # information from block header
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["currentCoinbase"])
+
+
+def exec_timestamp(params, block, instr, func_call, current_func_name):
+    # information from block header
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["currentTimestamp"])
+
+
+def exec_number(params, block, instr, func_call, current_func_name):
+    # information from block header
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["currentNumber"])
+
+
+def exec_difficulty(params, block, instr, func_call, current_func_name):
+    # information from block header
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["currentDifficulty"])
+
+
+def exec_gaslimit(params, block, instr, func_call, current_func_name):
+    # information from block header
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["currentGasLimit"])
+
+
+#
+#  50s: Stack, Memory, Storage, and Flow Information
+#
+def exec_pop(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 0:
+        global_state["pc"] = global_state["pc"] + 1
+        stack.pop()
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_mload(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    mem = params.mem
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    if len(stack) > 0:
+        global_state["pc"] = global_state["pc"] + 1
+        address = stack.pop()
+        current_miu_i = global_state["miu_i"]
+        if isAllReal(address, current_miu_i) and address in mem:
+            temp = int(math.ceil((address + 32) / float(32)))
+            if temp > current_miu_i:
+                current_miu_i = temp
+            value = mem[address]
+            stack.push(value)
+        else:
+            temp = ((address + 31) / 32) + 1
+            current_miu_i = to_symbolic(current_miu_i)
+            expression = current_miu_i < temp
+            if MSIZE:
+                if check_sat(solver, expression) != unsat:
+                    # this means that it is possibly that current_miu_i < temp
+                    current_miu_i = If(expression, temp, current_miu_i)
+            new_var_name = gen.gen_mem_var(address)
             if new_var_name in path_conditions_and_vars:
                 new_var = path_conditions_and_vars[new_var_name]
             else:
                 new_var = BitVec(new_var_name, 256)
                 path_conditions_and_vars[new_var_name] = new_var
+            stack.push(new_var)
+            if isReal(address):
+                mem[address] = new_var
+            else:
+                mem[expr_key(address)] = new_var
+        global_state["miu_i"] = current_miu_i
+    else:
+        raise ValueError("STACK underflow")
 
-            temp = ((mem_location + no_bytes) / 32) + 1
-            current_miu_i = to_symbolic(current_miu_i)
+
+def exec_mstore(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    mem = params.mem
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        stored_address = stack.pop()
+        stored_value = stack.pop()
+        # MSTORE slotid to MEM32
+
+        current_miu_i = global_state["miu_i"]
+        if isReal(stored_address):
+            # preparing data for hashing later
+            mem.write_word(stored_address, stored_value)
+        if isAllReal(stored_address, current_miu_i):
+            temp = int(math.ceil((stored_address + 32) / float(32)))
+            if temp > current_miu_i:
+                current_miu_i = temp
+            # note that the stored_value could be symbolic
+            mem[stored_address] = stored_value
+        else:
+            temp = ((stored_address + 31) / 32) + 1
+            expression = current_miu_i < temp
+            if MSIZE:
+                if check_sat(solver, expression) != unsat:
+                    # this means that it is possibly that current_miu_i < temp
+                    current_miu_i = If(expression, temp, current_miu_i)
+            mem.clear()  # very conservative
+            mem[expr_key(stored_address)] = stored_value
+        global_state["miu_i"] = current_miu_i
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_mstore8(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    mem = params.mem
+    global_state = params.global_state
+
+    if len(stack) > 1:
+        global_state["pc"] = global_state["pc"] + 1
+        stored_address = stack.pop()
+        temp_value = stack.pop()
+        stored_value = temp_value % 256  # get the least byte
+        if isReal(stored_address):
+            mem.write_byte(stored_address, stored_value)
+        current_miu_i = global_state["miu_i"]
+        if isAllReal(stored_address, current_miu_i):
+            temp = int(math.ceil((stored_address + 1) / float(32)))
+            if temp > current_miu_i:
+                current_miu_i = temp
+            # note that the stored_value could be symbolic
+            mem[stored_address] = stored_value
+        else:
+            temp = (stored_address / 32) + 1
+            if isReal(current_miu_i):
+                current_miu_i = BitVecVal(current_miu_i, 256)
             expression = current_miu_i < temp
-            solver.push()
-            solver.add(expression)
             if MSIZE:
-                if check_sat(solver) != unsat:
+                if check_sat(solver, expression) != unsat:
+                    # this means that it is possibly that current_miu_i < temp
                     current_miu_i = If(expression, temp, current_miu_i)
-            solver.pop()
             mem.clear()  # very conservative
-            mem[str(mem_location)] = new_var
-            global_state["miu_i"] = current_miu_i
-        else:
-            raise ValueError("STACK underflow")
-    #
-    #  40s: Block Information
-    #
-    elif opcode == "BLOCKHASH":  # information from block header
-        if len(stack) > 0:
-            global_state["pc"] = global_state["pc"] + 1
-            stack.pop(0)
-            new_var_name = "IH_blockhash"
-            if new_var_name in path_conditions_and_vars:
-                new_var = path_conditions_and_vars[new_var_name]
-            else:
-                new_var = BitVec(new_var_name, 256)
-                path_conditions_and_vars[new_var_name] = new_var
-            stack.insert(0, new_var)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "COINBASE":  # information from block header
-        global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["currentCoinbase"])
-    elif opcode == "TIMESTAMP":  # information from block header
-        global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["currentTimestamp"])
-    elif opcode == "NUMBER":  # information from block header
-        global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["currentNumber"])
-    elif opcode == "DIFFICULTY":  # information from block header
-        global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["currentDifficulty"])
-    elif opcode == "GASLIMIT":  # information from block header
+            mem[expr_key(stored_address)] = stored_value
+        global_state["miu_i"] = current_miu_i
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_sload(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    if len(stack) > 0:
         global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["currentGasLimit"])
-    #
-    #  50s: Stack, Memory, Storage, and Flow Information
-    #
-    elif opcode == "POP":
-        if len(stack) > 0:
-            global_state["pc"] = global_state["pc"] + 1
-            stack.pop(0)
+        position = stack.pop()
+
+        if isReal(position) and position in global_state["Ia"]:
+            value = global_state["Ia"][position]
+            stack.push(value)
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "MLOAD":
-        if len(stack) > 0:
-            global_state["pc"] = global_state["pc"] + 1
-            address = stack.pop(0)
-            current_miu_i = global_state["miu_i"]
-            if isAllReal(address, current_miu_i) and address in mem:
-                temp = int(math.ceil((address + 32) / float(32)))
-                if temp > current_miu_i:
-                    current_miu_i = temp
-                value = mem[address]
-                stack.insert(0, value)
+            if expr_key(position) in global_state["Ia"]:
+                value = global_state["Ia"][expr_key(position)]
+                stack.push(value)
             else:
-                temp = ((address + 31) / 32) + 1
-                current_miu_i = to_symbolic(current_miu_i)
-                expression = current_miu_i < temp
-                solver.push()
-                solver.add(expression)
-                if MSIZE:
-                    if check_sat(solver) != unsat:
-                        # this means that it is possibly that current_miu_i < temp
-                        current_miu_i = If(expression, temp, current_miu_i)
-                solver.pop()
-                new_var_name = gen.gen_mem_var(address)
+                if is_expr(position):
+                    position = cached_simplify(position)
+                if g_src_map:
+                    # ?Prev Edition to get param name
+                    new_var_name = g_src_map.get_source_code(global_state["pc"] - 1)
+                    operators = "[-+*/%|&^!><=]"
+                    new_var_name = (
+                        re.compile(operators).split(new_var_name)[0].strip()
+                    )
+                    # judge the load operation of storage varible
+                    new_var_name = g_src_map.get_parameter_or_state_var(
+                        new_var_name
+                    )
+                    if new_var_name:
+                        new_var_name = gen.gen_owner_store_var(
+                            position, new_var_name
+                        )
+                    else:
+                        new_var_name = gen.gen_owner_store_var(position)
+                else:
+                    new_var_name = gen.gen_owner_store_var(position)
+
                 if new_var_name in path_conditions_and_vars:
                     new_var = path_conditions_and_vars[new_var_name]
                 else:
                     new_var = BitVec(new_var_name, 256)
                     path_conditions_and_vars[new_var_name] = new_var
-                stack.insert(0, new_var)
-                if isReal(address):
-                    mem[address] = new_var
+                stack.push(new_var)
+                if isReal(position):
+                    global_state["Ia"][position] = new_var
                 else:
-                    mem[str(address)] = new_var
-            global_state["miu_i"] = current_miu_i
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "MSTORE":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            stored_address = stack.pop(0)
-            stored_value = stack.pop(0)
-            # MSTORE slotid to MEM32
-
-            current_miu_i = global_state["miu_i"]
-            if isReal(stored_address):
-                # preparing data for hashing later
-                old_size = len(memory) // 32
-                new_size = ceil32(stored_address + 32) // 32
-                mem_extend = (new_size - old_size) * 32
-                memory.extend([0] * mem_extend)
-                value = stored_value
-
-                for i in range(31, -1, -1):
-                    memory[stored_address + i] = value % 256
-                    value /= 256
-            if isAllReal(stored_address, current_miu_i):
-                temp = int(math.ceil((stored_address + 32) / float(32)))
-                if temp > current_miu_i:
-                    current_miu_i = temp
-                # note that the stored_value could be symbolic
-                mem[stored_address] = stored_value
-            else:
-                temp = ((stored_address + 31) / 32) + 1
-                expression = current_miu_i < temp
-                solver.push()
-                solver.add(expression)
-                if MSIZE:
-                    if check_sat(solver) != unsat:
-                        # this means that it is possibly that current_miu_i < temp
-                        current_miu_i = If(expression, temp, current_miu_i)
-                solver.pop()
-                mem.clear()  # very conservative
-                mem[str(stored_address)] = stored_value
-            global_state["miu_i"] = current_miu_i
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "MSTORE8":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            stored_address = stack.pop(0)
-            temp_value = stack.pop(0)
-            stored_value = temp_value % 256  # get the least byte
-            current_miu_i = global_state["miu_i"]
-            if isAllReal(stored_address, current_miu_i):
-                temp = int(math.ceil((stored_address + 1) / float(32)))
-                if temp > current_miu_i:
-                    current_miu_i = temp
-                # note that the stored_value could be symbolic
-                mem[stored_address] = stored_value
-            else:
-                temp = (stored_address / 32) + 1
-                if isReal(current_miu_i):
-                    current_miu_i = BitVecVal(current_miu_i, 256)
-                expression = current_miu_i < temp
-                solver.push()
-                solver.add(expression)
-                if MSIZE:
-                    if check_sat(solver) != unsat:
-                        # this means that it is possibly that current_miu_i < temp
-                        current_miu_i = If(expression, temp, current_miu_i)
-                solver.pop()
-                mem.clear()  # very conservative
-                mem[str(stored_address)] = stored_value
-            global_state["miu_i"] = current_miu_i
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "SLOAD":
-        if len(stack) > 0:
-            global_state["pc"] = global_state["pc"] + 1
-            position = stack.pop(0)
+                    global_state["Ia"][expr_key(position)] = new_var
+        if global_state["burn"]["hash"] != None:
+            global_state["burn"]["sload"] = stack.peek()
+        # print("SLOAD: ", stack.peek())
+    else:
+        raise ValueError("STACK underflow")
 
-            if isReal(position) and position in global_state["Ia"]:
-                value = global_state["Ia"][position]
-                stack.insert(0, value)
-            else:
-                if str(position) in global_state["Ia"]:
-                    value = global_state["Ia"][str(position)]
-                    stack.insert(0, value)
-                else:
-                    if is_expr(position):
-                        position = simplify(position)
-                    if g_src_map:
-                        # ?Prev Edition to get param name
-                        new_var_name = g_src_map.get_source_code(global_state["pc"] - 1)
-                        operators = "[-+*/%|&^!><=]"
-                        new_var_name = (
-                            re.compile(operators).split(new_var_name)[0].strip()
-                        )
-                        # judge the load operation of storage varible
-                        new_var_name = g_src_map.get_parameter_or_state_var(
-                            new_var_name
-                        )
-                        if new_var_name:
-                            new_var_name = gen.gen_owner_store_var(
-                                position, new_var_name
-                            )
-                        else:
-                            new_var_name = gen.gen_owner_store_var(position)
-                    else:
-                        new_var_name = gen.gen_owner_store_var(position)
 
-                    if new_var_name in path_conditions_and_vars:
-                        new_var = path_conditions_and_vars[new_var_name]
-                    else:
-                        new_var = BitVec(new_var_name, 256)
-                        path_conditions_and_vars[new_var_name] = new_var
-                    stack.insert(0, new_var)
-                    if isReal(position):
-                        global_state["Ia"][position] = new_var
-                    else:
-                        global_state["Ia"][str(position)] = new_var
-            if global_state["burn"]["hash"] != None:
-                global_state["burn"]["sload"] = stack[0]
-            # print("SLOAD: ", stack[0])
-        else:
-            raise ValueError("STACK underflow")
+def exec_sstore(params, block, instr, func_call, current_func_name):
+    global sstore_mark
 
-    elif opcode == "SSTORE":
-        sstore_mark = True
-        if len(stack) > 1:
-            for call_pc in calls:
-                calls_affect_state[call_pc] = True
-            global_state["pc"] = global_state["pc"] + 1
-            stored_address = stack.pop(0)
-            stored_value = stack.pop(0)
+    stack = params.stack
+    global_state = params.global_state
+    calls = params.calls
 
-            if isReal(stored_address):
-                # note that the stored_value could be unknown
-                global_state["Ia"][stored_address] = stored_value
-            else:
-                # note that the stored_value could be unknown
-                global_state["Ia"][str(stored_address)] = stored_value
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "JUMP":
-        if len(stack) > 0:
-            target_address = stack.pop(0)
-            if isSymbolic(target_address):
-                try:
-                    target_address = int(str(simplify(target_address)))
-                except:
-                    raise TypeError("Target address must be an integer")
-            vertices[block].set_jump_target(target_address)
-            if target_address not in edges[block]:
-                edges[block].append(target_address)
+    sstore_mark = True
+    if len(stack) > 1:
+        for call_pc in calls:
+            calls_affect_state[call_pc] = True
+        global_state["pc"] = global_state["pc"] + 1
+        stored_address = stack.pop()
+        stored_value = stack.pop()
+
+        if isReal(stored_address):
+            # note that the stored_value could be unknown
+            global_state["Ia"][stored_address] = stored_value
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "JUMPI":
-        # We need to prepare two branches
-        if len(stack) > 1:
-            target_address = stack.pop(0)
+            # note that the stored_value could be unknown
+            global_state["Ia"][expr_key(stored_address)] = stored_value
+    else:
+        raise ValueError("STACK underflow")
 
-            if isSymbolic(target_address):
-                try:
-                    target_address = int(str(simplify(target_address)))
-                except:
-                    raise TypeError("Target address must be an integer")
-            vertices[block].set_jump_target(target_address)
-            flag = stack.pop(0)
-            branch_expression = BitVecVal(0, 1) == BitVecVal(1, 1)
-            if isReal(flag):
-                if flag != 0:
-                    branch_expression = True
-            else:
-                branch_expression = flag != 0
-            vertices[block].set_branch_expression(branch_expression)
-            if target_address not in edges[block]:
-                edges[block].append(target_address)
+
+def exec_jump(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+
+    if len(stack) > 0:
+        target_address = stack.pop()
+        if isSymbolic(target_address):
+            try:
+                target_address = int(expr_key(cached_simplify(target_address)))
+            except:
+                raise TypeError("Target address must be an integer")
+        vertices[block].set_jump_target(target_address)
+        if target_address not in edges[block]:
+            edges[block].append(target_address)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_jumpi(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+
+    # We need to prepare two branches
+    if len(stack) > 1:
+        target_address = stack.pop()
+
+        if isSymbolic(target_address):
+            try:
+                target_address = int(expr_key(cached_simplify(target_address)))
+            except:
+                raise TypeError("Target address must be an integer")
+        vertices[block].set_jump_target(target_address)
+        flag = stack.pop()
+        branch_expression = BitVecVal(0, 1) == BitVecVal(1, 1)
+        if isReal(flag):
+            if flag != 0:
+                branch_expression = True
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "PC":
-        stack.insert(0, global_state["pc"])
-        global_state["pc"] = global_state["pc"] + 1
-    elif opcode == "MSIZE":
-        global_state["pc"] = global_state["pc"] + 1
-        msize = 32 * global_state["miu_i"]
-        stack.insert(0, msize)
-    elif opcode == "GAS":
-        # In general, we do not have this precisely. It depends on both
-        # the initial gas and the amount has been depleted
-        # we need o think about this in the future, in case precise gas
-        # can be tracked
-        global_state["pc"] = global_state["pc"] + 1
-        new_var_name = gen.gen_gas_var()
+            branch_expression = flag != 0
+        vertices[block].set_branch_expression(branch_expression)
+        if target_address not in edges[block]:
+            edges[block].append(target_address)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_pc(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    stack.push(global_state["pc"])
+    global_state["pc"] = global_state["pc"] + 1
+
+
+def exec_msize(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    msize = 32 * global_state["miu_i"]
+    stack.push(msize)
+
+
+def exec_gas(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    # In general, we do not have this precisely. It depends on both
+    # the initial gas and the amount has been depleted
+    # we need o think about this in the future, in case precise gas
+    # can be tracked
+    global_state["pc"] = global_state["pc"] + 1
+    new_var_name = gen.gen_gas_var()
+    new_var = BitVec(new_var_name, 256)
+    path_conditions_and_vars[new_var_name] = new_var
+    stack.push(new_var)
+
+
+def exec_jumpdest(params, block, instr, func_call, current_func_name):
+    global_state = params.global_state
+
+    # Literally do nothing
+    global_state["pc"] = global_state["pc"] + 1
+
+
+#
+#  60s & 70s: Push Operations
+#
+def exec_push(params, block, instr, func_call, current_func_name):
+    # this is a push instruction
+    stack = params.stack
+    global_state = params.global_state
+
+    position = instr.push_size()
+    global_state["pc"] = global_state["pc"] + 1 + position
+    pushed_value = instr.operand
+    if global_params.UNIT_TEST == 3:  # test evm symbolic
+        pushed_value = BitVecVal(pushed_value, 256)
+    stack.push(pushed_value)
+
+
+#
+#  80s: Duplication Operations
+#
+def exec_dup(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    position = instr.opcode - DUP1 + 1
+    if len(stack) >= position:
+        stack.dup(position)
+    else:
+        raise ValueError("STACK underflow")
+
+
+#
+#  90s: Swap Operations
+#
+def exec_swap(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    position = instr.opcode - SWAP1 + 1
+    if len(stack) > position:
+        stack.swap(position)
+        # *Delete => SWAP, others => DUP2
+        if stack.peek(1) == global_state["burn"]["sload"]:
+            global_state["burn"]["valid"] = True
+            global_state["burn"]["trigger"] = False
+    else:
+        raise ValueError("STACK underflow")
+
+
+#
+#  a0s: Logging Operations
+#
+def exec_log(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    # We do not simulate these log operations
+    num_of_pops = 2 + instr.opcode - LOG0
+    while num_of_pops > 0:
+        stack.pop()
+        num_of_pops -= 1
+
+
+#
+#  f0s: System Operations
+#
+def exec_create(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 2:
+        global_state["pc"] += 1
+        stack.pop()
+        stack.pop()
+        stack.pop()
+        new_var_name = gen.gen_arbitrary_var()
         new_var = BitVec(new_var_name, 256)
-        path_conditions_and_vars[new_var_name] = new_var
-        stack.insert(0, new_var)
-    elif opcode == "JUMPDEST":
-        # Literally do nothing
-        global_state["pc"] = global_state["pc"] + 1
-    #
-    #  60s & 70s: Push Operations
-    #
-    elif opcode.startswith("PUSH", 0):  # this is a push instruction
-        position = int(opcode[4:], 10)
-        global_state["pc"] = global_state["pc"] + 1 + position
-        pushed_value = int(instr_parts[1], 16)
-        stack.insert(0, pushed_value)
-        if global_params.UNIT_TEST == 3:  # test evm symbolic
-            stack[0] = BitVecVal(stack[0], 256)
-    #
-    #  80s: Duplication Operations
-    #
-    elif opcode.startswith("DUP", 0):
-        global_state["pc"] = global_state["pc"] + 1
-        position = int(opcode[3:], 10) - 1
-        if len(stack) > position:
-            duplicate = stack[position]
-            stack.insert(0, duplicate)
-        else:
-            raise ValueError("STACK underflow")
+        stack.push(new_var)
+    else:
+        raise ValueError("STACK underflow")
 
-    #
-    #  90s: Swap Operations
-    #
-    elif opcode.startswith("SWAP", 0):
-        global_state["pc"] = global_state["pc"] + 1
-        position = int(opcode[4:], 10)
-        if len(stack) > position:
-            temp = stack[position]
-            stack[position] = stack[0]
-            stack[0] = temp
-            # *Delete => SWAP, others => DUP2
-            if stack[1] == global_state["burn"]["sload"]:
-                global_state["burn"]["valid"] = True
-                global_state["burn"]["trigger"] = False
-        else:
-            raise ValueError("STACK underflow")
 
-    #
-    #  a0s: Logging Operations
-    #
-    elif opcode in ("LOG0", "LOG1", "LOG2", "LOG3", "LOG4"):
+def exec_call(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+    calls = params.calls
+
+    # TODO: Need to handle miu_i
+    if len(stack) > 6:
+        calls.append(global_state["pc"])
+        for call_pc in calls:
+            if call_pc not in calls_affect_state:
+                calls_affect_state[call_pc] = False
         global_state["pc"] = global_state["pc"] + 1
-        # We do not simulate these log operations
-        num_of_pops = 2 + int(opcode[3:])
-        while num_of_pops > 0:
-            stack.pop(0)
-            num_of_pops -= 1
-
-    #
-    #  f0s: System Operations
-    #
-    elif opcode in ["CREATE", "CREATE2"]:
-        if len(stack) > 2:
-            global_state["pc"] += 1
-            stack.pop(0)
-            stack.pop(0)
-            stack.pop(0)
-            new_var_name = gen.gen_arbitrary_var()
-            new_var = BitVec(new_var_name, 256)
-            stack.insert(0, new_var)
+        outgas = stack.pop()
+        recipient = stack.pop()
+        transfer_amount = stack.pop()
+        start_data_input = stack.pop()
+        size_data_input = stack.pop()
+        start_data_output = stack.pop()
+        size_data_ouput = stack.pop()
+
+        # in the paper, it is shaky when the size of data output is
+        # min of stack[6] and the | o |
+
+        if isReal(transfer_amount):
+            if transfer_amount == 0:
+                stack.push(1)  # x = 0
+                return
+
+        # Let us ignore the call depth
+        balance_ia = global_state["balance"]["Ia"]
+        is_enough_fund = transfer_amount <= balance_ia
+
+        if check_sat(solver, is_enough_fund) == unsat:
+            # this means not enough fund, thus the execution will result in exception
+            stack.push(0)  # x = 0
         else:
-            raise ValueError("STACK underflow")
-    elif opcode == "CALL":
-        # TODO: Need to handle miu_i
-        if len(stack) > 6:
-            calls.append(global_state["pc"])
-            for call_pc in calls:
-                if call_pc not in calls_affect_state:
-                    calls_affect_state[call_pc] = False
-            global_state["pc"] = global_state["pc"] + 1
-            outgas = stack.pop(0)
-            recipient = stack.pop(0)
-            transfer_amount = stack.pop(0)
-            start_data_input = stack.pop(0)
-            size_data_input = stack.pop(0)
-            start_data_output = stack.pop(0)
-            size_data_ouput = stack.pop(0)
-
-            # in the paper, it is shaky when the size of data output is
-            # min of stack[6] and the | o |
-
-            if isReal(transfer_amount):
-                if transfer_amount == 0:
-                    stack.insert(0, 1)  # x = 0
-                    return
-
-            # Let us ignore the call depth
-            balance_ia = global_state["balance"]["Ia"]
-            is_enough_fund = transfer_amount <= balance_ia
-            solver.push()
+            # the execution is possibly okay
+            stack.push(1)  # x = 1
             solver.add(is_enough_fund)
-
-            if check_sat(solver) == unsat:
-                # this means not enough fund, thus the execution will result in exception
-                solver.pop()
-                stack.insert(0, 0)  # x = 0
+            path_conditions_and_vars["path_condition"].append(is_enough_fund)
+            last_idx = len(path_conditions_and_vars["path_condition"]) - 1
+            # analysis["time_dependency_bug"][last_idx] = global_state["pc"] - 1
+            new_balance_ia = balance_ia - transfer_amount
+            global_state["balance"]["Ia"] = new_balance_ia
+            address_is = path_conditions_and_vars["Is"]
+            address_is = address_is & CONSTANT_ONES_159
+            boolean_expression = recipient != address_is
+            if check_sat(solver, boolean_expression) == unsat:
+                new_balance_is = global_state["balance"]["Is"] + transfer_amount
+                global_state["balance"]["Is"] = new_balance_is
             else:
-                # the execution is possibly okay
-                stack.insert(0, 1)  # x = 1
-                solver.pop()
-                solver.add(is_enough_fund)
-                path_conditions_and_vars["path_condition"].append(is_enough_fund)
-                last_idx = len(path_conditions_and_vars["path_condition"]) - 1
-                # analysis["time_dependency_bug"][last_idx] = global_state["pc"] - 1
-                new_balance_ia = balance_ia - transfer_amount
-                global_state["balance"]["Ia"] = new_balance_ia
-                address_is = path_conditions_and_vars["Is"]
-                address_is = address_is & CONSTANT_ONES_159
-                boolean_expression = recipient != address_is
-                solver.push()
-                solver.add(boolean_expression)
-                if check_sat(solver) == unsat:
-                    solver.pop()
-                    new_balance_is = global_state["balance"]["Is"] + transfer_amount
-                    global_state["balance"]["Is"] = new_balance_is
+                if isReal(recipient):
+                    new_address_name = "concrete_address_" + str(recipient)
                 else:
-                    solver.pop()
-                    if isReal(recipient):
-                        new_address_name = "concrete_address_" + str(recipient)
-                    else:
-                        new_address_name = gen.gen_arbitrary_address_var()
-                    old_balance_name = gen.gen_arbitrary_var()
-                    old_balance = BitVec(old_balance_name, 256)
-                    path_conditions_and_vars[old_balance_name] = old_balance
-                    constraint = old_balance >= 0
-                    solver.add(constraint)
-                    path_conditions_and_vars["path_condition"].append(constraint)
-                    new_balance = old_balance + transfer_amount
-                    global_state["balance"][new_address_name] = new_balance
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "CALLCODE":
-        # TODO: Need to handle miu_i
-        if len(stack) > 6:
-            calls.append(global_state["pc"])
-            for call_pc in calls:
-                if call_pc not in calls_affect_state:
-                    calls_affect_state[call_pc] = False
-            global_state["pc"] = global_state["pc"] + 1
-            outgas = stack.pop(0)
-            recipient = stack.pop(0)  # this is not used as recipient
-
-            transfer_amount = stack.pop(0)
-            start_data_input = stack.pop(0)
-            size_data_input = stack.pop(0)
-            start_data_output = stack.pop(0)
-            size_data_ouput = stack.pop(0)
-            # in the paper, it is shaky when the size of data output is
-            # min of stack[6] and the | o |
-
-            if isReal(transfer_amount):
-                if transfer_amount == 0:
-                    stack.insert(0, 1)  # x = 0
-                    return
-
-            # Let us ignore the call depth
-            balance_ia = global_state["balance"]["Ia"]
-            is_enough_fund = transfer_amount <= balance_ia
-            solver.push()
-            solver.add(is_enough_fund)
+                    new_address_name = gen.gen_arbitrary_address_var()
+                old_balance_name = gen.gen_arbitrary_var()
+                old_balance = BitVec(old_balance_name, 256)
+                path_conditions_and_vars[old_balance_name] = old_balance
+                constraint = old_balance >= 0
+                solver.add(constraint)
+                path_conditions_and_vars["path_condition"].append(constraint)
+                new_balance = old_balance + transfer_amount
+                global_state["balance"][new_address_name] = new_balance
+    else:
+        raise ValueError("STACK underflow")
 
-            if check_sat(solver) == unsat:
-                # this means not enough fund, thus the execution will result in exception
-                solver.pop()
-                stack.insert(0, 0)  # x = 0
-            else:
-                # the execution is possibly okay
-                stack.insert(0, 1)  # x = 1
-                solver.pop()
-                solver.add(is_enough_fund)
-                path_conditions_and_vars["path_condition"].append(is_enough_fund)
-                last_idx = len(path_conditions_and_vars["path_condition"]) - 1
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode in ("DELEGATECALL", "STATICCALL"):
-        if len(stack) > 5:
-            global_state["pc"] += 1
-            stack.pop(0)
-            recipient = stack.pop(0)
-
-            stack.pop(0)
-            stack.pop(0)
-            stack.pop(0)
-            stack.pop(0)
-            new_var_name = gen.gen_arbitrary_var()
-            new_var = BitVec(new_var_name, 256)
-            stack.insert(0, new_var)
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode in ("RETURN", "REVERT"):
-        # TODO: Need to handle miu_i
-        if len(stack) > 1:
-            if opcode == "REVERT":
-                revertible_overflow_pcs.update(overflow_pcs)
-                global_state["pc"] = global_state["pc"] + 1
-            stack.pop(0)
-            stack.pop(0)
-            # TODO
-            pass
-        else:
-            raise ValueError("STACK underflow")
-    elif opcode == "SELFDESTRUCT":
+
+def exec_callcode(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+    calls = params.calls
+
+    # TODO: Need to handle miu_i
+    if len(stack) > 6:
+        calls.append(global_state["pc"])
+        for call_pc in calls:
+            if call_pc not in calls_affect_state:
+                calls_affect_state[call_pc] = False
         global_state["pc"] = global_state["pc"] + 1
-        recipient = stack.pop(0)
-        transfer_amount = global_state["balance"]["Ia"]
-        global_state["balance"]["Ia"] = 0
-        if isReal(recipient):
-            new_address_name = "concrete_address_" + str(recipient)
+        outgas = stack.pop()
+        recipient = stack.pop()  # this is not used as recipient
+
+        transfer_amount = stack.pop()
+        start_data_input = stack.pop()
+        size_data_input = stack.pop()
+        start_data_output = stack.pop()
+        size_data_ouput = stack.pop()
+        # in the paper, it is shaky when the size of data output is
+        # min of stack[6] and the | o |
+
+        if isReal(transfer_amount):
+            if transfer_amount == 0:
+                stack.push(1)  # x = 0
+                return
+
+        # Let us ignore the call depth
+        balance_ia = global_state["balance"]["Ia"]
+        is_enough_fund = transfer_amount <= balance_ia
+
+        if check_sat(solver, is_enough_fund) == unsat:
+            # this means not enough fund, thus the execution will result in exception
+            stack.push(0)  # x = 0
         else:
-            new_address_name = gen.gen_arbitrary_address_var()
-        old_balance_name = gen.gen_arbitrary_var()
-        old_balance = BitVec(old_balance_name, 256)
-        path_conditions_and_vars[old_balance_name] = old_balance
-        constraint = old_balance >= 0
-        solver.add(constraint)
-        path_conditions_and_vars["path_condition"].append(constraint)
-        new_balance = old_balance + transfer_amount
-        global_state["balance"][new_address_name] = new_balance
-        # TODO
-        return
+            # the execution is possibly okay
+            stack.push(1)  # x = 1
+            solver.add(is_enough_fund)
+            path_conditions_and_vars["path_condition"].append(is_enough_fund)
+            last_idx = len(path_conditions_and_vars["path_condition"]) - 1
+    else:
+        raise ValueError("STACK underflow")
 
-    # brand new opcodes
-    elif opcode == "SHL":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            # *For selector to shift left 224 bits
-            # EXP
-            base = 2
-            exponent = stack.pop(0)
-            # Type conversion is needed when they are mismatched
-            if isAllReal(base, exponent):
-                computed = pow(base, exponent, 2**256)
-            else:
-                # The computed value is unknown, this is because power is
-                # not supported in bit-vector theory
-                new_var_name = gen.gen_arbitrary_var()
-                computed = BitVec(new_var_name, 256)
-            computed = simplify(computed) if is_expr(computed) else computed
-
-            # MUL
-            first = computed
-            second = stack.pop(0)
-            if isReal(first) and isSymbolic(second):
-                first = BitVecVal(first, 256)
-            elif isSymbolic(first) and isReal(second):
-                second = BitVecVal(second, 256)
-            computed = first * second & UNSIGNED_BOUND_NUMBER
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-            if second == global_params.ONERC721RECEIVED_SELECTOR:
-                global_params.ONERC721RECEIVED_SELECTOR_SHL = computed
-
-            # *Simpler model
-            # first = stack.pop(0)
-            # second = stack.pop(0)
-            # # Type conversion is needed when they are mismatched
-            # if isReal(first) and isSymbolic(second):
-            #     first = BitVecVal(first, 256)
-            #     computed = first + second
-            # elif isSymbolic(first) and isReal(second):
-            #     second = BitVecVal(second, 256)
-            #     computed = first + second
-            # else:
-            #     # both are real and we need to manually modulus with 2 ** 256
-            #     # if both are symbolic z3 takes care of modulus automatically
-            #     computed = mod((second + 2 ^ first), 2 ^ 256)
-
-            # computed = simplify(computed) if is_expr(computed) else computed
-            # stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
 
-    elif opcode == "SHR":
-        if len(stack) > 1:
-            global_state["pc"] = global_state["pc"] + 1
-            # # EXP
-            # base = 2
-            # exponent = stack.pop(0)
-            # # Type conversion is needed when they are mismatched
-            # if isAllReal(base, exponent):
-            #     computed = pow(base, exponent, 2**256)
-            # else:
-            #     # The computed value is unknown, this is because power is
-            #     # not supported in bit-vector theory
-            #     new_var_name = gen.gen_arbitrary_var()
-            #     computed = BitVec(new_var_name, 256)
-            # computed = simplify(computed) if is_expr(computed) else computed
-
-            # # DIV
-            # first = computed
-            # second = stack.pop(0)
-            # if isAllReal(first, second):
-            #     if second == 0:
-            #         computed = 0
-            #     else:
-            #         first = to_unsigned(first)
-            #         second = to_unsigned(second)
-            #         computed = first / second
-            # else:
-            #     first = to_symbolic(first)
-            #     second = to_symbolic(second)
-            #     solver.push()
-            #     solver.add(Not(second == 0))
-            #     if check_sat(solver) == unsat:
-            #         computed = 0
-            #     else:
-            #         computed = UDiv(first, second)
-            #     solver.pop()
-            # computed = simplify(computed) if is_expr(computed) else computed
-            # stack.insert(0, computed)
-
-            # *Simpler model
-            first = stack.pop(0)
-            second = stack.pop(0)
-            # Type conversion is needed when they are mismatched
-            if isReal(first) and isSymbolic(second):
-                first = BitVecVal(first, 256)
-                computed = first + second
-            elif isSymbolic(first) and isReal(second):
-                second = BitVecVal(second, 256)
-                computed = first + second
-            else:
-                # both are real and we need to manually modulus with 2 ** 256
-                # if both are symbolic z3 takes care of modulus automatically
-                computed = mod((second + 2 ^ first), 2 ^ 256)
+def exec_delegatecall(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
 
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
+    if len(stack) > 5:
+        global_state["pc"] += 1
+        stack.pop()
+        recipient = stack.pop()
+
+        stack.pop()
+        stack.pop()
+        stack.pop()
+        stack.pop()
+        new_var_name = gen.gen_arbitrary_var()
+        new_var = BitVec(new_var_name, 256)
+        stack.push(new_var)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_return(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+    overflow_pcs = params.overflow_pcs
 
-    elif opcode == "SAR":
-        if len(stack) > 1:
+    # TODO: Need to handle miu_i
+    if len(stack) > 1:
+        if instr.name == "REVERT":
+            revertible_overflow_pcs.update(overflow_pcs)
             global_state["pc"] = global_state["pc"] + 1
-            # # EXP
-            # base = 2
-            # exponent = stack.pop(0)
-            # # Type conversion is needed when they are mismatched
-            # if isAllReal(base, exponent):
-            #     computed = pow(base, exponent, 2**256)
-            # else:
-            #     # The computed value is unknown, this is because power is
-            #     # not supported in bit-vector theory
-            #     new_var_name = gen.gen_arbitrary_var()
-            #     computed = BitVec(new_var_name, 256)
-            # computed = simplify(computed) if is_expr(computed) else computed
-
-            # # not equivalent to SDIV
-            # first = computed
-            # second = stack.pop(0)
-            # if isAllReal(first, second):
-            #     first = to_unsigned(first)
-            #     second = to_signed(second)
-            #     if second == 0:
-            #         computed = 0
-            #     elif first == -(2**255) and second == -1:
-            #         computed = -(2**255)
-            #     else:
-            #         sign = -1 if (first / second) < 0 else 1
-            #         computed = sign * (abs(first) / abs(second))
-            # else:
-            #     first = to_symbolic(first)
-            #     second = to_symbolic(second)
-            #     solver.push()
-            #     solver.add(Not(second == 0))
-            #     if check_sat(solver) == unsat:
-            #         computed = 0
-            #     else:
-            #         solver.push()
-            #         solver.add(Not(And(first == -(2**255), second == -1)))
-            #         if check_sat(solver) == unsat:
-            #             computed = -(2**255)
-            #         else:
-            #             solver.push()
-            #             solver.add(first / second < 0)
-            #             sign = -1 if check_sat(solver) == sat else 1
-
-            #             def z3_abs(x):
-            #                 return If(x >= 0, x, -x)
-
-            #             first = z3_abs(first)
-            #             second = z3_abs(second)
-            #             computed = sign * (first / second)
-            #             solver.pop()
-            #         solver.pop()
-            #     solver.pop()
-            # computed = simplify(computed) if is_expr(computed) else computed
-            # stack.insert(0, computed)
-
-            # *Simpler model
-            first = stack.pop(0)
-            second = stack.pop(0)
-            # Type conversion is needed when they are mismatched
-            if isReal(first) and isSymbolic(second):
-                first = BitVecVal(first, 256)
-                computed = first + second
-            elif isSymbolic(first) and isReal(second):
-                second = BitVecVal(second, 256)
-                computed = first + second
-            else:
-                # both are real and we need to manually modulus with 2 ** 256
-                # if both are symbolic z3 takes care of modulus automatically
-                computed = mod((second + 2 ^ first), 2 ^ 256)
+        stack.pop()
+        stack.pop()
+        # TODO
+        pass
+    else:
+        raise ValueError("STACK underflow")
 
-            computed = simplify(computed) if is_expr(computed) else computed
-            stack.insert(0, computed)
-        else:
-            raise ValueError("STACK underflow")
 
-    elif opcode == "SELFBALANCE":
-        # address(this).balance
+def exec_selfdestruct(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+    path_conditions_and_vars = params.path_conditions_and_vars
+
+    global_state["pc"] = global_state["pc"] + 1
+    recipient = stack.pop()
+    transfer_amount = global_state["balance"]["Ia"]
+    global_state["balance"]["Ia"] = 0
+    if isReal(recipient):
+        new_address_name = "concrete_address_" + str(recipient)
+    else:
+        new_address_name = gen.gen_arbitrary_address_var()
+    old_balance_name = gen.gen_arbitrary_var()
+    old_balance = BitVec(old_balance_name, 256)
+    path_conditions_and_vars[old_balance_name] = old_balance
+    constraint = old_balance >= 0
+    solver.add(constraint)
+    path_conditions_and_vars["path_condition"].append(constraint)
+    new_balance = old_balance + transfer_amount
+    global_state["balance"][new_address_name] = new_balance
+    # TODO
+    return
+
+
+# brand new opcodes
+def exec_shl(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
         global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["currentSelfBalance"])
-
-    elif opcode == "CHAINID":
-        # chain_id = {  1 // mainnet
-        #    {  2 // Morden testnet (disused)
-        #    {  2 // Expanse mainnet
-        #    {  3 // Ropsten testnet
-        #    {  4 // Rinkeby testnet
-        #    {  5 // Goerli testnet
-        #    { 42 // Kovan testnet
-        #    { ...
+        # *For selector to shift left 224 bits
+        # EXP
+        base = 2
+        exponent = stack.pop()
+        # Type conversion is needed when they are mismatched
+        if isAllReal(base, exponent):
+            computed = pow(base, exponent, 2**256)
+        else:
+            # The computed value is unknown, this is because power is
+            # not supported in bit-vector theory
+            new_var_name = gen.gen_arbitrary_var()
+            computed = BitVec(new_var_name, 256)
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+
+        # MUL
+        first = computed
+        second = stack.pop()
+        if isReal(first) and isSymbolic(second):
+            first = BitVecVal(first, 256)
+        elif isSymbolic(first) and isReal(second):
+            second = BitVecVal(second, 256)
+        computed = first * second & UNSIGNED_BOUND_NUMBER
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+        if second == global_params.ONERC721RECEIVED_SELECTOR:
+            global_params.ONERC721RECEIVED_SELECTOR_SHL = computed
+
+        # *Simpler model
+        # first = stack.pop()
+        # second = stack.pop()
+        # # Type conversion is needed when they are mismatched
+        # if isReal(first) and isSymbolic(second):
+        #     first = BitVecVal(first, 256)
+        #     computed = first + second
+        # elif isSymbolic(first) and isReal(second):
+        #     second = BitVecVal(second, 256)
+        #     computed = first + second
+        # else:
+        #     # both are real and we need to manually modulus with 2 ** 256
+        #     # if both are symbolic z3 takes care of modulus automatically
+        #     computed = mod((second + 2 ^ first), 2 ^ 256)
+
+        # computed = cached_simplify(computed) if is_expr(computed) else computed
+        # stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_shr(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
         global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["currentChainId"])
+        # # EXP
+        # base = 2
+        # exponent = stack.pop()
+        # # Type conversion is needed when they are mismatched
+        # if isAllReal(base, exponent):
+        #     computed = pow(base, exponent, 2**256)
+        # else:
+        #     # The computed value is unknown, this is because power is
+        #     # not supported in bit-vector theory
+        #     new_var_name = gen.gen_arbitrary_var()
+        #     computed = BitVec(new_var_name, 256)
+        # computed = cached_simplify(computed) if is_expr(computed) else computed
+
+        # # DIV
+        # first = computed
+        # second = stack.pop()
+        # if isAllReal(first, second):
+        #     if second == 0:
+        #         computed = 0
+        #     else:
+        #         first = to_unsigned(first)
+        #         second = to_unsigned(second)
+        #         computed = first / second
+        # else:
+        #     first = to_symbolic(first)
+        #     second = to_symbolic(second)
+        #     solver.push()
+        #     solver.add(Not(second == 0))
+        #     if check_sat(solver) == unsat:
+        #         computed = 0
+        #     else:
+        #         computed = UDiv(first, second)
+        #     solver.pop()
+        # computed = cached_simplify(computed) if is_expr(computed) else computed
+        # stack.push(computed)
+
+        # *Simpler model
+        first = stack.pop()
+        second = stack.pop()
+        # Type conversion is needed when they are mismatched
+        if isReal(first) and isSymbolic(second):
+            first = BitVecVal(first, 256)
+            computed = first + second
+        elif isSymbolic(first) and isReal(second):
+            second = BitVecVal(second, 256)
+            computed = first + second
+        else:
+            # both are real and we need to manually modulus with 2 ** 256
+            # if both are symbolic z3 takes care of modulus automatically
+            computed = mod((second + 2 ^ first), 2 ^ 256)
 
-    elif opcode == "BASEFEE":
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
+    else:
+        raise ValueError("STACK underflow")
+
+
+def exec_sar(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    if len(stack) > 1:
         global_state["pc"] = global_state["pc"] + 1
-        stack.insert(0, global_state["currentBaseFee"])
+        # # EXP
+        # base = 2
+        # exponent = stack.pop()
+        # # Type conversion is needed when they are mismatched
+        # if isAllReal(base, exponent):
+        #     computed = pow(base, exponent, 2**256)
+        # else:
+        #     # The computed value is unknown, this is because power is
+        #     # not supported in bit-vector theory
+        #     new_var_name = gen.gen_arbitrary_var()
+        #     computed = BitVec(new_var_name, 256)
+        # computed = cached_simplify(computed) if is_expr(computed) else computed
+
+        # # not equivalent to SDIV
+        # first = computed
+        # second = stack.pop()
+        # if isAllReal(first, second):
+        #     first = to_unsigned(first)
+        #     second = to_signed(second)
+        #     if second == 0:
+        #         computed = 0
+        #     elif first == -(2**255) and second == -1:
+        #         computed = -(2**255)
+        #     else:
+        #         sign = -1 if (first / second) < 0 else 1
+        #         computed = sign * (abs(first) / abs(second))
+        # else:
+        #     first = to_symbolic(first)
+        #     second = to_symbolic(second)
+        #     solver.push()
+        #     solver.add(Not(second == 0))
+        #     if check_sat(solver) == unsat:
+        #         computed = 0
+        #     else:
+        #         solver.push()
+        #         solver.add(Not(And(first == -(2**255), second == -1)))
+        #         if check_sat(solver) == unsat:
+        #             computed = -(2**255)
+        #         else:
+        #             solver.push()
+        #             solver.add(first / second < 0)
+        #             sign = -1 if check_sat(solver) == sat else 1
+
+        #             def z3_abs(x):
+        #                 return If(x >= 0, x, -x)
+
+        #             first = z3_abs(first)
+        #             second = z3_abs(second)
+        #             computed = sign * (first / second)
+        #             solver.pop()
+        #         solver.pop()
+        #     solver.pop()
+        # computed = cached_simplify(computed) if is_expr(computed) else computed
+        # stack.push(computed)
+
+        # *Simpler model
+        first = stack.pop()
+        second = stack.pop()
+        # Type conversion is needed when they are mismatched
+        if isReal(first) and isSymbolic(second):
+            first = BitVecVal(first, 256)
+            computed = first + second
+        elif isSymbolic(first) and isReal(second):
+            second = BitVecVal(second, 256)
+            computed = first + second
+        else:
+            # both are real and we need to manually modulus with 2 ** 256
+            # if both are symbolic z3 takes care of modulus automatically
+            computed = mod((second + 2 ^ first), 2 ^ 256)
 
+        computed = cached_simplify(computed) if is_expr(computed) else computed
+        stack.push(computed)
     else:
-        log.info("UNKNOWN INSTRUCTION: " + opcode)
-        if global_params.UNIT_TEST == 2 or global_params.UNIT_TEST == 3:
-            log.critical("Unknown instruction: %s" % opcode)
-            exit(UNKNOWN_INSTRUCTION)
-        raise Exception("UNKNOWN INSTRUCTION: " + opcode)
+        raise ValueError("STACK underflow")
+
+
+def exec_selfbalance(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    # address(this).balance
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["currentSelfBalance"])
+
+
+def exec_chainid(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    # chain_id = {  1 // mainnet
+    #    {  2 // Morden testnet (disused)
+    #    {  2 // Expanse mainnet
+    #    {  3 // Ropsten testnet
+    #    {  4 // Rinkeby testnet
+    #    {  5 // Goerli testnet
+    #    { 42 // Kovan testnet
+    #    { ...
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["currentChainId"])
+
+
+def exec_basefee(params, block, instr, func_call, current_func_name):
+    stack = params.stack
+    global_state = params.global_state
+
+    global_state["pc"] = global_state["pc"] + 1
+    stack.push(global_state["currentBaseFee"])
+
+
+# opcode => handler executing the instruction, indexed by the opcode byte
+opcode_handlers = [None] * 256
+
+
+def register_handler(opcode, handler):
+    """Install the handler of an opcode, e.g. to instrument or replace its semantics
+
+    A handler is called by sym_exec_ins as
+    handler(params, block, instr, func_call, current_func_name), after the
+    coverage bookkeeping and the sleepmint analysis of the instruction.
+    It advances global_state["pc"] itself.
+
+    Args:
+        opcode (int or str): the opcode byte or its name, e.g. 0x55 or "SSTORE"
+        handler (callable): the new handler, None to make the opcode unknown
+
+    Returns:
+        callable: the replaced handler, so a wrapper can delegate to it
+    """
+    if isinstance(opcode, str):
+        opcode = OPCODES[opcode]
+    previous = opcode_handlers[opcode]
+    opcode_handlers[opcode] = handler
+    return previous
+
+
+def register_default_handlers():
+    """Install the handlers of every opcode sym_exec_ins executes"""
+    for name, handler in {
+        "STOP": exec_stop,
+        "ADD": exec_add,
+        "MUL": exec_mul,
+        "SUB": exec_sub,
+        "DIV": exec_div,
+        "SDIV": exec_sdiv,
+        "MOD": exec_mod,
+        "SMOD": exec_smod,
+        "ADDMOD": exec_addmod,
+        "MULMOD": exec_mulmod,
+        "EXP": exec_exp,
+        "SIGNEXTEND": exec_signextend,
+        "LT": exec_lt,
+        "GT": exec_gt,
+        "SLT": exec_slt,
+        "SGT": exec_sgt,
+        "EQ": exec_eq,
+        "ISZERO": exec_iszero,
+        "AND": exec_and,
+        "OR": exec_or,
+        "XOR": exec_xor,
+        "NOT": exec_not,
+        "BYTE": exec_byte,
+        "KECCAK256": exec_keccak256,
+        "ADDRESS": exec_address,
+        "BALANCE": exec_balance,
+        "CALLER": exec_caller,
+        "ORIGIN": exec_origin,
+        "CALLVALUE": exec_callvalue,
+        "CALLDATALOAD": exec_calldataload,
+        "CALLDATASIZE": exec_calldatasize,
+        "CALLDATACOPY": exec_calldatacopy,
+        "CODESIZE": exec_codesize,
+        "CODECOPY": exec_codecopy,
+        "RETURNDATACOPY": exec_returndatacopy,
+        "RETURNDATASIZE": exec_returndatasize,
+        "GASPRICE": exec_gasprice,
+        "EXTCODESIZE": exec_extcodesize,
+        "EXTCODECOPY": exec_extcodecopy,
+        "BLOCKHASH": exec_blockhash,
+        "COINBASE": exec_coinbase,
+        "TIMESTAMP": exec_timestamp,
+        "NUMBER": exec_number,
+        "DIFFICULTY": exec_difficulty,
+        "GASLIMIT": exec_gaslimit,
+        "POP": exec_pop,
+        "MLOAD": exec_mload,
+        "MSTORE": exec_mstore,
+        "MSTORE8": exec_mstore8,
+        "SLOAD": exec_sload,
+        "SSTORE": exec_sstore,
+        "JUMP": exec_jump,
+        "JUMPI": exec_jumpi,
+        "PC": exec_pc,
+        "MSIZE": exec_msize,
+        "GAS": exec_gas,
+        "JUMPDEST": exec_jumpdest,
+        "CREATE": exec_create,
+        "CREATE2": exec_create,
+        "CALL": exec_call,
+        "CALLCODE": exec_callcode,
+        "DELEGATECALL": exec_delegatecall,
+        "STATICCALL": exec_delegatecall,
+        "RETURN": exec_return,
+        "REVERT": exec_return,
+        "SELFDESTRUCT": exec_selfdestruct,
+        "SHL": exec_shl,
+        "SHR": exec_shr,
+        "SAR": exec_sar,
+        "SELFBALANCE": exec_selfbalance,
+        "CHAINID": exec_chainid,
+        "BASEFEE": exec_basefee,
+    }.items():
+        register_handler(name, handler)
+    for opcode in range(PUSH0, PUSH32 + 1):
+        register_handler(opcode, exec_push)
+    for opcode in range(DUP1, DUP1 + 16):
+        register_handler(opcode, exec_dup)
+    for opcode in range(SWAP1, SWAP1 + 16):
+        register_handler(opcode, exec_swap)
+    for opcode in range(LOG0, LOG0 + 5):
+        register_handler(opcode, exec_log)
+
+
+register_default_handlers()
 
 
 class TimeoutError(Exception):
@@ -2886,8 +3923,15 @@ def analyze():
     run_build_cfg_and_analyze(timeout_cb=timeout_cb)
 
 
-def run(disasm_file=None, source_file=None, source_map=None, slot_map=None):
-    """Run specific contracts with the given sources and extracted slot map"""
+def run(
+    disasm_file=None, source_file=None, source_map=None, slot_map=None, bytecode=""
+):
+    """Run specific contracts with the given sources and extracted slot map
+
+    disasm_file only names the report and result files of the contract, the
+    CFG is built from the runtime bytecode in memory.
+    """
+    global g_bytecode
     global g_disasm_file
     global g_source_file
     global g_src_map
@@ -2895,6 +3939,7 @@ def run(disasm_file=None, source_file=None, source_map=None, slot_map=None):
     global begin
     global g_slot_map
 
+    g_bytecode = bytecode
     g_disasm_file = disasm_file
     g_source_file = source_file
     g_src_map = source_map
@@ -2906,6 +3951,12 @@ def run(disasm_file=None, source_file=None, source_map=None, slot_map=None):
         begin = time.time()
         log.info("\t============ Results of %s===========" % source_map.cname)
         analyze()
+        log.info("Solver query cache: " + query_cache.stats())
+        log.info("Expression cache: " + expr_cache.stats())
+        log.info("Solver checks: %s" % solver_stats)
+        log.info("Branches decided: %s" % tier_stats)
+        if global_params.PORTFOLIO:
+            log.info("Portfolio: %s" % portfolio_stats)
         ret = Identifier.detect_defects(
             instructions,
             results,
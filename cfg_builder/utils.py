@@ -8,7 +8,10 @@ import subprocess
 
 import six
 from z3 import *
-from z3.z3util import get_vars
+
+import global_params
+from cfg_builder.evm_stack import EVMStack
+from cfg_builder.expr_cache import cached_get_vars as get_vars, expr_key
 
 
 def ceil32(x):
@@ -49,22 +52,20 @@ def to_signed(number):
         return number
 
 
-def check_sat(solver, pop_if_exception=True):
-    try:
-        ret = solver.check()
-        if ret == unknown:
-            raise Z3Exception(solver.reason_unknown())
-    except Exception as e:
-        if pop_if_exception:
-            solver.pop()
-        raise e
+def check_sat(solver, *conditions):
+    """Check the constraints of a PathSolver with conditions, raising when undecided"""
+    ret = solver.check(*conditions)
+    if ret == unknown:
+        raise Z3Exception(solver.reason_unknown())
     return ret
 
 
 def custom_deepcopy(input):
     output = {}
     for key in input:
-        if isinstance(input[key], list):
+        if isinstance(input[key], EVMStack):
+            output[key] = input[key].copy()
+        elif isinstance(input[key], list):
             output[key] = list(input[key])
         elif isinstance(input[key], dict):
             output[key] = custom_deepcopy(input[key])
@@ -343,7 +344,7 @@ def find_owner_name(contract):
     owner_name = None
     functions_list = ["transferFrom", "safeTransferFrom"]
     visited_functiosn = []
-    with open("temp.json", "r", encoding="utf-8") as f:
+    with open(global_params.AST_JSON, "r", encoding="utf-8") as f:
         content = json.loads(f.read())
         
         contracts = content["contractsByName"]
@@ -389,7 +390,7 @@ def find_return_owner():
     return_owner = None
     functions_list = ["ownerOf", "_ownerOf"]
 
-    with open("temp.json", "r", encoding="utf-8") as f:
+    with open(global_params.AST_JSON, "r", encoding="utf-8") as f:
         content = json.loads(f.read())
         contracts = content["contractsByName"]
             
@@ -436,7 +437,7 @@ def find_return_owner_LV():
     return_owner = None
     functions_list = ["ownerOf", "_ownerOf"]
 
-    with open("temp.json", "r", encoding="utf-8") as f:
+    with open(global_params.AST_JSON, "r", encoding="utf-8") as f:
         content = json.loads(f.read())
         contracts = content["contractsByName"]
             
@@ -480,7 +481,7 @@ def find_return_owner_LV():
 
 def get_target_functions(target_contract = ""):
     target_function_hash = {}
-    with open("temp.json", "r", encoding="utf-8") as f:
+    with open(global_params.AST_JSON, "r", encoding="utf-8") as f:
         content = json.loads(f.read())
         contracts = content["contractsByName"]
         function_info = {}
@@ -561,7 +562,7 @@ def get_target_functions(target_contract = ""):
 
 def get_target_functions_LV(target_contract = ""):
     target_function_hash = {}
-    with open("temp.json", "r", encoding="utf-8") as f:
+    with open(global_params.AST_JSON, "r", encoding="utf-8") as f:
         content = json.loads(f.read())
         contracts = content["contractsByName"]
         function_info = {}
@@ -1,3 +1,6 @@
+from cfg_builder.expr_cache import expr_key
+
+
 class Generator:
     """Generate variables and identifiers for symbolic execution"""
 
@@ -22,7 +25,7 @@ class Generator:
         return "Id_size"
 
     def gen_mem_var(self, address):
-        return "mem_" + str(address)
+        return "mem_" + expr_key(address)
 
     def gen_arbitrary_var(self):
         self.count += 1
@@ -33,7 +36,7 @@ class Generator:
         return "some_address_" + str(self.count)
 
     def gen_owner_store_var(self, position, var_name=""):
-        return "Ia_store-%s-%s" % (str(position), var_name)
+        return "Ia_store-%s-%s" % (expr_key(position), var_name)
 
     def gen_gas_var(self):
         self.count += 1
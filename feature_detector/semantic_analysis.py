@@ -2,6 +2,7 @@ import logging
 
 import global_params
 from cfg_builder.opcodes import *
+from cfg_builder.path_solver import PathSolver
 from cfg_builder.utils import *
 
 log = logging.getLogger(__name__)
@@ -26,83 +27,75 @@ def calculate_gas(opcode, stack, mem, global_state, analysis, solver):
     # In some opcodes, gas cost is not only depend on opcode itself but also current state of evm
     # For symbolic variables, we only add base cost part for simplicity
     if opcode in ("LOG0", "LOG1", "LOG2", "LOG3", "LOG4") and len(stack) > 1:
-        if isReal(stack[1]):
-            gas_increment += GCOST["Glogdata"] * stack[1]
+        if isReal(stack.peek(1)):
+            gas_increment += GCOST["Glogdata"] * stack.peek(1)
     elif opcode == "EXP" and len(stack) > 1:
-        if isReal(stack[1]) and stack[1] > 0:
+        if isReal(stack.peek(1)) and stack.peek(1) > 0:
             gas_increment += GCOST["Gexpbyte"] * (
-                1 + math.floor(math.log(stack[1], 256))
+                1 + math.floor(math.log(stack.peek(1), 256))
             )
     elif opcode == "EXTCODECOPY" and len(stack) > 2:
-        if isReal(stack[2]):
-            gas_increment += GCOST["Gcopy"] * math.ceil(stack[2] / 32)
+        if isReal(stack.peek(2)):
+            gas_increment += GCOST["Gcopy"] * math.ceil(stack.peek(2) / 32)
     elif opcode in ("CALLDATACOPY", "CODECOPY") and len(stack) > 3:
-        if isReal(stack[3]):
-            gas_increment += GCOST["Gcopy"] * math.ceil(stack[3] / 32)
+        if isReal(stack.peek(3)):
+            gas_increment += GCOST["Gcopy"] * math.ceil(stack.peek(3) / 32)
     elif opcode == "SSTORE" and len(stack) > 1:
-        if isReal(stack[1]):
+        if isReal(stack.peek(1)):
             try:
                 try:
-                    storage_value = global_state["Ia"][int(stack[0])]
+                    storage_value = global_state["Ia"][int(stack.peek())]
                 except Exception:
-                    storage_value = global_state["Ia"][str(stack[0])]
+                    storage_value = global_state["Ia"][expr_key(stack.peek())]
                 # when we change storage value from zero to non-zero
-                if storage_value == 0 and stack[1] != 0:
+                if storage_value == 0 and stack.peek(1) != 0:
                     gas_increment += GCOST["Gsset"]
                 else:
                     gas_increment += GCOST["Gsreset"]
             except Exception:  # when storage address at considered key is empty
-                if stack[1] != 0:
+                if stack.peek(1) != 0:
                     gas_increment += GCOST["Gsset"]
-                elif stack[1] == 0:
+                elif stack.peek(1) == 0:
                     gas_increment += GCOST["Gsreset"]
         else:
             try:
                 try:
-                    storage_value = global_state["Ia"][int(stack[0])]
+                    storage_value = global_state["Ia"][int(stack.peek())]
                 except Exception:
-                    storage_value = global_state["Ia"][str(stack[0])]
-                solver.push()
-                solver.add(Not(And(storage_value == 0, stack[1] != 0)))
-                if solver.check() == unsat:
+                    storage_value = global_state["Ia"][expr_key(stack.peek())]
+                if (
+                    solver.check(Not(And(storage_value == 0, stack.peek(1) != 0)))
+                    == unsat
+                ):
                     gas_increment += GCOST["Gsset"]
                 else:
                     gas_increment += GCOST["Gsreset"]
-                solver.pop()
-            except Exception as e:
-                if str(e) == "canceled":
-                    solver.pop()
-                solver.push()
-                solver.add(Not(stack[1] != 0))
-                if solver.check() == unsat:
+            except Exception:
+                if solver.check(Not(stack.peek(1) != 0)) == unsat:
                     gas_increment += GCOST["Gsset"]
                 else:
                     gas_increment += GCOST["Gsreset"]
-                solver.pop()
     elif opcode == "SUICIDE" and len(stack) > 1:
-        if isReal(stack[1]):
-            address = stack[1] % 2**160
+        if isReal(stack.peek(1)):
+            address = stack.peek(1) % 2**160
             if address not in global_state:
                 gas_increment += GCOST["Gnewaccount"]
         else:
-            address = str(stack[1])
+            address = str(stack.peek(1))
             if address not in global_state:
                 gas_increment += GCOST["Gnewaccount"]
     elif opcode in ("CALL", "CALLCODE", "DELEGATECALL") and len(stack) > 2:
         # Not fully correct yet
         gas_increment += GCOST["Gcall"]
-        if isReal(stack[2]):
-            if stack[2] != 0:
+        if isReal(stack.peek(2)):
+            if stack.peek(2) != 0:
                 gas_increment += GCOST["Gcallvalue"]
         else:
-            solver.push()
-            solver.add(Not(stack[2] != 0))
-            if check_sat(solver) == unsat:
+            if check_sat(solver, Not(stack.peek(2) != 0)) == unsat:
                 gas_increment += GCOST["Gcallvalue"]
-            solver.pop()
-    elif opcode == "SHA3" and isReal(stack[1]):
+    elif opcode == "SHA3" and isReal(stack.peek(1)):
         pass  # Not handle
-    elif opcode == "KECCAK256" and isReal(stack[1]):
+    elif opcode == "KECCAK256" and isReal(stack.peek(1)):
         pass
 
     # Calculate gas memory, add it to total gas used
@@ -135,8 +128,8 @@ def semantic_analysis(
 
     # MSTORE slotid to MEM32
     if opcode == "MSTORE":
-        stored_address = stack[0]
-        stored_value = stack[1]
+        stored_address = stack.peek()
+        stored_value = stack.peek(1)
 
         if isReal(stored_address):
             value = stored_value
@@ -170,8 +163,8 @@ def semantic_analysis(
                     global_state["setApprovalForAll"]["MSTORE_3"] = True
 
     elif opcode == "SSTORE":
-        stored_address = stack[0]
-        stored_value = stack[1]
+        stored_address = stack.peek()
+        stored_value = stack.peek(1)
 
         # *Risky Mutable Proxy DEFECT
         if g_src_map:
@@ -181,10 +174,9 @@ def semantic_analysis(
                     and "START" not in current_func_name.upper()
                     and "SETPROXY" in current_func_name.upper()
                 ):
-                    solver = Solver()
-                    solver.set("timeout", global_params.TIMEOUT)
-                    solver.add([global_state["Ia"][stored_address] != stored_value])
-                    if solver.check() == sat:
+                    solver = PathSolver()
+                    changed = global_state["Ia"][stored_address] != stored_value
+                    if solver.check(changed) == sat:
                         global_problematic_pcs["proxy_defect"].append(
                             global_state["pc"]
                         )
@@ -212,14 +204,10 @@ def semantic_analysis(
                         elif is_storage_var(var):
                             if str(global_state["mint"]["hash"]) in str(var):
                                 new_path_condition.append(var != BitVecVal(0, 256))
-                solver = Solver()
-                solver.set("timeout", global_params.TIMEOUT)
-
+                solver = PathSolver()
                 solver.add(path_condition)
-                solver.push()
-                solver.add(new_path_condition)
                 # *True => problematic mint
-                if solver.check() == sat:
+                if solver.check(*new_path_condition) == sat:
                     for pc in global_state["standard_violation"]["mint_pc"]:
                         global_problematic_pcs["violation_defect"].append(pc)
 
@@ -237,11 +225,9 @@ def semantic_analysis(
                             var_name = get_storage_var_name(var)
                             # *onlyOwner
                             if var_name == "":
-                                if pos in g_slot_map.simpler_slot_map:
-                                    var_names = g_slot_map.simpler_slot_map[pos]
-                                    for var_name in var_names:
-                                        if "owner" in var_name.lower():
-                                            owner = True
+                                for var_name in g_slot_map.var_names(pos):
+                                    if "owner" in var_name.lower():
+                                        owner = True
                             else:
                                 if "owner" in var_name:
                                     owner = True
@@ -276,8 +262,7 @@ def semantic_analysis(
                 #     revert ApprovalCallerNotOwnerNorApproved();
                 # }
                 path_condition = path_conditions_and_vars["path_condition"]
-                solver = Solver()
-                solver.set("timeout", global_params.TIMEOUT)
+                solver = PathSolver()
                 solver.add(path_condition)
                 new_path_condition = []
                 check_to = False
@@ -296,20 +281,20 @@ def semantic_analysis(
                             ) in str(var):
                                 # *Step1: Do not approve to current owner
                                 # *Cannot through solver checking
-                                solver.push()
-                                solver.add([var == global_state["approve"]["to"]])
-                                if not (solver.check() == sat):
+                                if not (
+                                    solver.check(var == global_state["approve"]["to"])
+                                    == sat
+                                ):
                                     check_to = True
-                                solver.pop()
 
                         elif str(var) == str(global_state["sender_address"]):
                             # *Step2 msg.sender == owner
                             # TODO isApprovedForAll(owner, _msgSender())
-                            solver.push()
-                            solver.add([var != global_state["approve"]["to"]])
-                            if not (solver.check() == sat):
+                            if not (
+                                solver.check(var != global_state["approve"]["to"])
+                                == sat
+                            ):
                                 check_permission = True
-                            solver.pop()
 
                 if not (check_to and check_permission):
                     for pc in global_state["standard_violation"]["approve_pc"]:
@@ -359,9 +344,8 @@ def semantic_analysis(
                 src_c = g_src_map.get_source_code(global_state["pc"] - 4)
                 if src_c.startswith("for"):
                     instr = instructions[global_state["pc"] - 4]
-                    instr_parts = str.split(instr, " ")
-                    opcode = instr_parts[0]
-                    pushed_value = int(instr_parts[1], 16)
+                    opcode = instr.name
+                    pushed_value = instr.operand
                     global_state["ERC721_reentrancy"]["key"] = pushed_value
 
     elif opcode == "JUMP":
@@ -395,10 +379,8 @@ def semantic_analysis(
                                     new_path_condition.append(
                                         var == global_state["Ia"][pos]
                                     )
-                                    solver = Solver()
-                                    solver.set("timeout", global_params.TIMEOUT)
-                                    solver.add(new_path_condition)
-                                    if not (solver.check() == unsat):
+                                    solver = PathSolver()
+                                    if not (solver.check(*new_path_condition) == unsat):
                                         global_state["ERC721_reentrancy"]["var"].append(
                                             var_name
                                         )
@@ -411,9 +393,9 @@ def semantic_analysis(
                 ) and current_func_name:
                     global_state["mint"]["trigger"] = True
                     # TODO check the parameter of _mint, default sequence(token_owner,token_id)
-                    global_state["mint"]["to"] = stack[2]
-                    global_state["mint"]["token_id"] = stack[1]
-                    global_state["mint"]["quantity"] = stack[1]
+                    global_state["mint"]["to"] = stack.peek(2)
+                    global_state["mint"]["token_id"] = stack.peek(1)
+                    global_state["mint"]["quantity"] = stack.peek(1)
                     global_state["standard_violation"]["mint_pc"].append(
                         global_state["pc"]
                     )
@@ -432,8 +414,8 @@ def semantic_analysis(
                 elif source_code.startswith("approve") and current_func_name:
                     global_state["approve"]["trigger"] = True
                     # TODO check the parameter of approve, default sequence(operator, token_id)
-                    global_state["approve"]["to"] = stack[2]
-                    global_state["approve"]["token_id"] = stack[1]
+                    global_state["approve"]["to"] = stack.peek(2)
+                    global_state["approve"]["token_id"] = stack.peek(1)
                     global_state["standard_violation"]["approve_pc"].append(
                         global_state["pc"]
                     )
@@ -441,8 +423,8 @@ def semantic_analysis(
 
                 elif source_code.startswith("setApprovalForAll") and current_func_name:
                     global_state["setApprovalForAll"]["trigger"] = True
-                    global_state["setApprovalForAll"]["operator"] = stack[2]
-                    global_state["setApprovalForAll"]["approved"] = stack[1]
+                    global_state["setApprovalForAll"]["operator"] = stack.peek(2)
+                    global_state["setApprovalForAll"]["approved"] = stack.peek(1)
                     global_state["standard_violation"]["setApprovalForAll_pc"].append(
                         global_state["pc"]
                     )
@@ -452,7 +434,7 @@ def semantic_analysis(
                 elif source_code.startswith("_burn") and current_func_name:
                     global_state["burn"]["trigger"] = True
                     # TODO check the parameter of burn, default sequence(token_id)
-                    global_state["burn"]["token_id"] = stack[1]
+                    global_state["burn"]["token_id"] = stack.peek(1)
                     global_state["burn"]["pc"] = global_state["pc"]
 
     elif opcode == "CALL":
@@ -472,8 +454,8 @@ def check_reentrancy_bug(g_src_map, global_state, stack, mem):
     # stack[8] represents the hash of onERC721Received
     # *Read memory from 160 to 224/mem_64 => 160, 164 + mem_mem_64 => 224
     # *The values should be the shift-lefted value of OnERC721Received selector
-    start_data_input = stack[3]
-    size_data_input = stack[4]
+    start_data_input = stack.peek(3)
+    size_data_input = stack.peek(4)
     if (
         str(start_data_input) == "mem_64"
         or mem[start_data_input] == global_params.ONERC721RECEIVED_SELECTOR_SHL
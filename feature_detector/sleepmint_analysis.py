@@ -3,15 +3,15 @@ import re
 TRANSFER_EVENT_HASH = 100389287136786176327247604509743168900146139575972864366142685224231313322991
 
 def sleepmint_analysis(opcode, stack, solver, _from, owner, test_results, sstore_mark, current_func):
-    if opcode == "LOG4" and stack[2] == TRANSFER_EVENT_HASH:
+    if opcode == "LOG4" and stack.peek(2) == TRANSFER_EVENT_HASH:
         if not sstore_mark:
             test_results[2][0] = 1
             temp = current_func + ":standard1"
             if temp not in test_results[2]:
                 test_results[2].append(temp)
             return
-        # if stack[3] == 0:
-        #     to = stack[4]
+        # if stack.peek(3) == 0:
+        #     to = stack.peek(4)
         #     bvs = []
         #     for arg in to.children():
         #         children = arg.children()
@@ -66,13 +66,10 @@ def sleepmint_analysis(opcode, stack, solver, _from, owner, test_results, sstore
 
         if "(address,address,uint256)" in current_func or "(address, address, uint256)" in current_func:
             expr = If(Extract(159, 0, _from) != Extract(159, 0, owner), 1, 0) != 0
-            solver.push()
-            solver.add(expr)
 
-            if solver.check() == unsat:
+            if solver.check(expr) == unsat:
                 pass
             else:
                 test_results[0][0] = 1
                 if current_func not in test_results[0]:
-                    test_results[0].append(current_func)
-            solver.pop()
\ No newline at end of file
+                    test_results[0].append(current_func)
\ No newline at end of file
@@ -6,12 +6,30 @@ REPORT_MODE = 0
 # print everything in the console
 PRINT_MODE = 0
 
+# no live tables of the exploration, for batch runs and servers
+HEADLESS = 0
+
 # enable log file to print all exception
 DEBUG_MODE = 0
 
 # Timeout for z3 in ms
 TIMEOUT = 1000
 
+# budget (in ms) a solver query is tried with first, a query it cannot decide is
+# retried with ten times the budget, and so on up to TIMEOUT (0: every query is
+# given TIMEOUT at once)
+SHORT_TIMEOUT = 100
+
+# what to do with a branch the short budget cannot decide: "defer" it to a
+# longer budget once the decided paths are explored, or "explore" it right away
+UNKNOWN_POLICY = "defer"
+
+# number of solver configurations raced in separate processes on the queries
+# the analysis process cannot decide within PORTFOLIO_THRESHOLD ms, with the
+# rest of their budget; 0 to keep every query in the analysis process
+PORTFOLIO = 0
+PORTFOLIO_THRESHOLD = 200
+
 # Set this flag to 2 if we want to do evm real value unit test
 # Set this flag to 3 if we want to do evm symbolic unit test
 UNIT_TEST = 0
@@ -33,11 +51,16 @@ DEPTH_LIMIT = 500
 
 GAS_LIMIT = 400000000
 
+# order of path exploration: dfs, bfs, random-path, coverage-new-block or shortest-to-log
+SEARCH = "dfs"
+
 LOOP_LIMIT = 200
 
 GENERATE_TEST_CASES = 0
 
-# Run WakeMint in parallel
+# number of worker processes exploring the function entry blocks of a contract
+# (0 or 1: explore them one after another). Either way, every one after the
+# first starts from the state the first one left
 PARALLEL = 0
 
 SOLC_SWITCH = 0
@@ -53,6 +76,47 @@ TARGET_FUNCTION = None
 
 CRAWL_DIR = "./test/"
 
+# dumped AST shared by tool.py and the AST queries in cfg_builder.utils
+AST_JSON = "temp.json"
+
+# number of worker processes in batch mode
+BATCH_WORKERS = 1
+
+# wall-clock budget for one batch target, compilation included (in secs)
+BATCH_TIMEOUT = 900
+
+# number of pre-forked worker processes in server mode
+SERVER_WORKERS = 1
+
+# wall-clock budget for one server job, compilation included (in secs)
+SERVER_TIMEOUT = 900
+
+# number of solver queries whose sat/unsat outcome is kept while analyzing a contract
+QUERY_CACHE_SIZE = 10000
+
+# number of expressions whose simplify(), get_vars() and str() are kept while
+# analyzing a contract
+EXPR_CACHE_SIZE = 100000
+
+# how PathSolver checks a condition without keeping it: "assumptions" (asserted
+# once behind a literal passed as an assumption) or "push" (in a scope of its own)
+SOLVER_MODE = "assumptions"
+
+# reuse the results of byte-identical contracts analyzed with the same parameters
+USE_CACHE = 1
+
+# directory of the on-disk caches
+CACHE_DIR = ".wakemint_cache"
+
+# size bound of the result cache (in bytes), least recently used entries go first
+RESULT_CACHE_SIZE = 256 * 1024 * 1024
+
+# bump whenever a change to the analysis changes its results
+RESULT_CACHE_VERSION = 11
+
+# size bound of the solc output cache (in bytes)
+SOLC_CACHE_SIZE = 512 * 1024 * 1024
+
 SOURCE = None
 
 # output json elements
@@ -1,6 +1,6 @@
 import json
 
-from cfg_builder.utils import run_command
+from cache import solc_cache
 from inputter.ast.ast_walker import AstWalker
 from inputter.ast.safe_fun_walker import SafeFunWalker
 
@@ -10,9 +10,10 @@ class AstHelper:
     # adapted to solidity 0.8.x
     method_to_ref_decl_ids = {}
 
-    def __init__(self, filename, remap, input_type):
+    def __init__(self, filename, remap, input_type, allow_paths=""):
         self.input_type = input_type
         self.remap = remap
+        self.options = solc_cache.solc_options(remap, allow_paths)
         self.filename = filename
         if input_type == "solidity":
             self.source_list = self.get_source_list(filename)
@@ -22,21 +23,11 @@ class AstHelper:
         self.contracts = self.extract_contract_definitions(self.source_list)
 
     def get_source_list(self, filename):
-        cmd = "solc --combined-json ast %s %s" % (
-            filename,
-            " ".join(self.remap),
-        )
-        out = run_command(cmd)
-        out = json.loads(out)
+        out = solc_cache.compile_all(filename, self.options)
         return out["sources"]
 
     def get_storage_layouts(self, filename):
-        cmd = "solc --combined-json storage-layout %s %s" % (
-            filename,
-            " ".join(self.remap),
-        )
-        out = run_command(cmd)
-        out = json.loads(out)
+        out = solc_cache.compile_all(filename, self.options)
         return out["contracts"]
 
     def extract_contract_definitions(self, sourcesList):
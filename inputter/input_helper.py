@@ -1,12 +1,12 @@
 import logging
 import os
 import re
-import subprocess
 
 import six
-from crytic_compile import CryticCompile, InvalidCompilation
 
 import global_params
+from cache import solc_cache
+from cfg_builder.disassembler import format_disassembly
 from inputter.slot_map import SlotMap
 from inputter.solc_version_switcher import *
 from inputter.source_map import SourceMap
@@ -53,6 +53,7 @@ class InputHelper:
                 - "c_name": The name of the contract.
                 - "disasm_file": The path to the disassembly file for the contract.
                 - "slot_map": The slot map for the contract.
+                - "bytecode": The runtime bytecode of the contract without its swarm hash.
         """
         inputs = []
         
@@ -65,7 +66,7 @@ class InputHelper:
         self._prepare_disasm_files_for_analysis(contracts)
         for (
             contract,
-            _,
+            bytecode,
         ) in contracts:
             c_source, cname = contract.split(":")
 
@@ -73,7 +74,13 @@ class InputHelper:
                 continue
             c_source = re.sub(self.root_path, "", c_source)
             if self.input_type == InputHelper.SOLIDITY:
-                source_map = SourceMap(contract, self.source, self.remap, "solidity")
+                source_map = SourceMap(
+                    contract,
+                    self.source,
+                    self.remap,
+                    "solidity",
+                    allow_paths=self.allow_paths,
+                )
 
             disasm_file = self._get_temporary_files(contract)["disasm"]
             inputs.append(
@@ -85,6 +92,7 @@ class InputHelper:
                     "c_name": cname,
                     "disasm_file": disasm_file,
                     "slot_map": source_map.slot_map,
+                    "bytecode": self._removeSwarmHash(bytecode),
                 }
             )
             logging.info("contract:" + contract)
@@ -103,20 +111,11 @@ class InputHelper:
 
         return self.compiled_contracts
 
-    def _extract_bin_obj(self, com: CryticCompile):
+    def _extract_bin_obj(self, out):
         contracts = []
 
-        file2units = com.compilation_units[self.target]._source_units
-
-        for filename in file2units.keys():
-            source_unit = file2units[filename]
-            for contract in source_unit._contracts_name:
-                contracts.append(
-                    (
-                        filename.relative + ":" + contract,
-                        source_unit._runtime_bytecodes[contract],
-                    )
-                )
+        for contract, artifacts in out["contracts"].items():
+            contracts.append((contract, artifacts["bin-runtime"]))
 
         return contracts
 
@@ -128,18 +127,13 @@ class InputHelper:
             if global_params.SOLC_SWITCH:
                 switcher = SolidityVersionSwitcher(self.target)
                 switcher.run()
-            options = []
-            if self.allow_paths:
-                options.append(f"--allow-paths {self.allow_paths}")
+            options = solc_cache.solc_options(self.remap, self.allow_paths)
             logging.info("Compiling solidity...")
-            logging.info("solc options: " + " ".join(options))
+            logging.info("solc options: " + options)
 
-            com = CryticCompile(
-                self.target,
-                solc_args=" ".join(options),
-                solc_remaps=self.remap,
-            )
-            contracts = self._extract_bin_obj(com)
+            # the same output feeds SourceMap, AstHelper and SlotMap
+            out = solc_cache.compile_all(self.target, options)
+            contracts = self._extract_bin_obj(out)
 
             # libs = com.filenames.difference(
             #     com.compilation_units[self.target].contracts_names_without_libraries
@@ -147,7 +141,7 @@ class InputHelper:
             # if libs:
             #     return self._link_libraries(self.source, libs)
             return contracts
-        except InvalidCompilation as err:
+        except solc_cache.CompilationError as err:
             if not self.compilation_err:
                 logging.critical(
                     "Solidity compilation failed. Please use -ce flag to see the detail."
@@ -164,21 +158,23 @@ class InputHelper:
         return evm_without_hash
 
     def _link_libraries(self, filename, libs):
-        options = []
+        options = [solc_cache.solc_options(self.remap, self.allow_paths)]
         for idx, lib in enumerate(libs):
             lib_address = "0x" + hex(idx + 1)[2:].zfill(40)
             options.append("--libraries %s:%s" % (lib, lib_address))
-        com = CryticCompile(target=self.source, solc_args=" ".join(options))
+        out = solc_cache.combined_json("bin-runtime", filename, " ".join(options))
 
-        return self._extract_bin_obj(com)
+        return self._extract_bin_obj(out)
 
     def _prepare_disasm_files_for_analysis(self, contracts):
         for contract, bytecode in contracts:
             self._prepare_disasm_file(contract, bytecode)
 
     def _prepare_disasm_file(self, target, bytecode):
-        self._write_evm_file(target, bytecode)
-        self._write_disasm_file(target)
+        # the CFG is built from the bytecode in memory, keep the files only on request
+        if self.evm:
+            self._write_evm_file(target, bytecode)
+            self._write_disasm_file(target, bytecode)
 
     def _get_temporary_files(self, target):
         return {
@@ -192,27 +188,15 @@ class InputHelper:
         with open(evm_file, "w") as of:
             of.write(self._removeSwarmHash(bytecode))
 
-    def _write_disasm_file(self, target):
-        tmp_files = self._get_temporary_files(target)
-        evm_file = tmp_files["evm"]
-        disasm_file = tmp_files["disasm"]
-        disasm_out = ""
-        try:
-            disasm_p = subprocess.Popen(
-                ["evm", "disasm", evm_file], stdout=subprocess.PIPE
-            )
-            disasm_out = disasm_p.communicate()[0].decode("utf-8", "strict")
-        except Exception:
-            logging.critical("Disassembly failed.")
-            exit()
-
+    def _write_disasm_file(self, target, bytecode):
+        disasm_file = self._get_temporary_files(target)["disasm"]
         with open(disasm_file, "w") as of:
-            of.write(disasm_out)
+            of.write(format_disassembly(self._removeSwarmHash(bytecode)))
 
     def _rm_tmp_files_of_multiple_contracts(self, contracts):
         for (
             contract,
-            _,
+            bytecode,
         ) in contracts:
             self._rm_tmp_files(contract)
 
@@ -10,6 +10,7 @@ from low_version_resource.source_map import SourceMap
 from crytic_compile import CryticCompile, InvalidCompilation
 from inputter.solc_version_switcher import *
 from inputter.slot_map import SlotMap
+from cfg_builder.disassembler import format_disassembly
 
 class InputHelper:
     BYTECODE = 0
@@ -67,11 +68,11 @@ class InputHelper:
             self._prepare_disasm_file(self.source, bytecode)
 
             disasm_file = self._get_temporary_files(self.source)['disasm']
-            inputs.append({'disasm_file': disasm_file})
+            inputs.append({'disasm_file': disasm_file, 'bytecode': self._removeSwarmHash(bytecode)})
         else:
             contracts = self._get_compiled_contracts()
             self._prepare_disasm_files_for_analysis(contracts)
-            for contract, _ in contracts:
+            for contract, bytecode in contracts:
                 c_source, cname = contract.split(':')
                 if targetContracts is not None and cname not in targetContracts:
                     continue
@@ -89,6 +90,7 @@ class InputHelper:
                     'c_name': cname,
                     'disasm_file': disasm_file,
                     "slot_map": source_map.slot_map,
+                    'bytecode': self._removeSwarmHash(bytecode),
                 })
         if targetContracts is not None and not inputs:
             raise ValueError("Targeted contracts weren't found in the source code!")
@@ -241,8 +243,10 @@ class InputHelper:
             self._prepare_disasm_file(contract, bytecode)
 
     def _prepare_disasm_file(self, target, bytecode):
-        self._write_evm_file(target, bytecode)
-        self._write_disasm_file(target)
+        # the CFG is built from the bytecode in memory, keep the files only on request
+        if self.evm:
+            self._write_evm_file(target, bytecode)
+            self._write_disasm_file(target, bytecode)
 
     def _get_temporary_files(self, target):
         return {
@@ -256,21 +260,10 @@ class InputHelper:
         with open(evm_file, 'w') as of:
             of.write(self._removeSwarmHash(bytecode))
 
-    def _write_disasm_file(self, target):
-        tmp_files = self._get_temporary_files(target)
-        evm_file = tmp_files["evm"]
-        disasm_file = tmp_files["disasm"]
-        disasm_out = ""
-        try:
-            disasm_p = subprocess.Popen(
-                ["evm", "disasm", evm_file], stdout=subprocess.PIPE)
-            disasm_out = disasm_p.communicate()[0].decode('utf-8', 'strict')
-        except:
-            logging.critical("Disassembly failed.")
-            exit()
-
+    def _write_disasm_file(self, target, bytecode):
+        disasm_file = self._get_temporary_files(target)["disasm"]
         with open(disasm_file, 'w') as of:
-            of.write(disasm_out)
+            of.write(format_disassembly(self._removeSwarmHash(bytecode)))
 
     def _rm_tmp_files_of_multiple_contracts(self, contracts):
         if self.input_type in ['standard_json', 'standard_json_output']:
@@ -1,5 +1,6 @@
 import re
 
+from cfg_builder.keccak import mapping_slot
 from inputter.ast.ast_helper import AstHelper
 
 
@@ -18,13 +19,22 @@ class SlotMap:
     proxy_index = None
 
     def __init__(
-        self, cname, parent_filename, remap, input_type="solidity", root_path=""
+        self,
+        cname,
+        parent_filename,
+        remap,
+        input_type="solidity",
+        root_path="",
+        ast_helper=None,
     ):
         self.root_path = root_path
         self.cname = cname
         if not SlotMap.parent_filename:
             SlotMap.parent_filename = parent_filename
-            if input_type == "solidity":
+            if ast_helper is not None:
+                # share the AST already extracted by SourceMap
+                SlotMap.ast_helper = ast_helper
+            elif input_type == "solidity":
                 SlotMap.ast_helper = AstHelper(
                     SlotMap.parent_filename, remap, input_type
                 )
@@ -164,6 +174,25 @@ class SlotMap:
                     simpler_slot_map[slot_id] = [key]
         return id_to_state_vars, simpler_slot_map, name_to_type
 
+    def var_names(self, position):
+        """
+        Returns the names of the state variables stored at a storage position.
+
+        A concrete position hashed from a mapping key (keccak256(key . slot))
+        resolves to the mapping declared at that slot.
+
+        Args:
+            position: A slot ID or a concrete storage position.
+
+        Returns:
+            list: A list of variable names, empty if the position is unknown.
+        """
+        if position not in self.simpler_slot_map:
+            position = mapping_slot(position)
+        if position in self.simpler_slot_map:
+            return self.simpler_slot_map[position]
+        return []
+
     def match_owner(self):
         """
         Returns a list of slot IDs that match the owner keywords in the state variables.
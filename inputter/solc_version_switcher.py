@@ -1,6 +1,8 @@
 import re
 import subprocess
 
+from cache import solc_cache
+
 
 def install_and_use_solc_version(version_info):
     installed_versions_output = subprocess.check_output(
@@ -17,6 +19,7 @@ def install_and_use_solc_version(version_info):
     #     raise ValueError(f"Version {version_info} is not available for installation.")
 
     subprocess.run(["solc-select", "use", version_info], check=True)
+    solc_cache.solc_version.cache_clear()
     print(f"Switched to version {version_info}.")
 
 
@@ -41,6 +44,7 @@ class SolidityVersionSwitcher:
     def switch_solc_version(self, version_info):
         try:
             subprocess.run(["solc-select", "use", version_info], check=True)
+            solc_cache.solc_version.cache_clear()
             print(f"Successfully switched to Solidity version {version_info}.")
         except subprocess.CalledProcessError as e:
             print(f"Failed to switch to Solidity version {version_info}. Error: {e}")
@@ -4,7 +4,7 @@ import json
 import six
 
 import global_params
-from cfg_builder.utils import run_command
+from cache import solc_cache
 from inputter.ast.ast_helper import AstHelper
 from inputter.slot_map import SlotMap
 
@@ -26,31 +26,36 @@ class Source:
 
 class SourceMap:
     parent_filename = ""
+    # solc arguments of the compilation shared with InputHelper
+    options = ""
     position_groups = {}
     sources = {}
     ast_helper = None
     slot_map = None
     func_to_sig_by_contract = {}
 
-    def __init__(self, cname, parent_filename, remap, input_type, root_path=""):
+    def __init__(
+        self, cname, parent_filename, remap, input_type, root_path="", allow_paths=""
+    ):
         self.root_path = root_path
         self.cname = cname
         self.input_type = input_type
         self.remap = remap
         if not SourceMap.parent_filename:
             SourceMap.parent_filename = parent_filename
+            SourceMap.options = solc_cache.solc_options(remap, allow_paths)
             if input_type == "solidity":
-                SourceMap.position_groups = SourceMap._load_position_groups(remap)
+                SourceMap.position_groups = SourceMap._load_position_groups()
             else:
                 # TODO add more type of inputter
                 raise Exception("There is no such type of inputter")
             SourceMap.ast_helper = AstHelper(
-                SourceMap.parent_filename, remap, input_type
+                SourceMap.parent_filename, remap, input_type, allow_paths
             )
-            SourceMap.slot_map = SlotMap(cname, parent_filename, remap)
-            SourceMap.func_to_sig_by_contract = SourceMap._get_sig_to_func_by_contract(
-                remap
+            SourceMap.slot_map = SlotMap(
+                cname, parent_filename, remap, ast_helper=SourceMap.ast_helper
             )
+            SourceMap.func_to_sig_by_contract = SourceMap._get_sig_to_func_by_contract()
         self.source = self._get_source()
         self.positions = self._get_positions()
         self.instr_positions = {}
@@ -182,24 +187,13 @@ class SourceMap:
         return locations
 
     @classmethod
-    def _get_sig_to_func_by_contract(cls, remap):
-        cmd = "solc --combined-json hashes %s %s" % (
-            cls.parent_filename,
-            " ".join(remap),
-        )
-        out = run_command(cmd)
-        out = json.loads(out)
+    def _get_sig_to_func_by_contract(cls):
+        out = solc_cache.compile_all(cls.parent_filename, cls.options)
         return out["contracts"]
 
     @classmethod
-    def _load_position_groups(cls, remap):
-        cmd = "solc --combined-json asm %s %s" % (
-            cls.parent_filename,
-            " ".join(remap),
-        )
-        
-        out = run_command(cmd)
-        out = json.loads(out)
+    def _load_position_groups(cls):
+        out = solc_cache.compile_all(cls.parent_filename, cls.options)
         # with open("try.json", "w", encoding="utf-8") as f:
         #     f.write(json.dumps(out))
         return out["contracts"]
@@ -1,4 +1,4 @@
-from low_version_resource.utils import run_command
+from cache import solc_cache
 from low_version_resource.ast_walker import AstWalker
 import json
 
@@ -23,11 +23,10 @@ class AstHelper:
 
     def get_source_list(self, filename):
         if self.allow_paths:
-            cmd = "solc --combined-json ast %s %s --allow-paths %s" % (self.remap, filename, self.allow_paths)
+            options = "%s --allow-paths %s" % (self.remap, self.allow_paths)
         else:
-            cmd = "solc --combined-json ast %s %s" % (self.remap, filename)
-        out = run_command(cmd)
-        out = json.loads(out)
+            options = "%s" % self.remap
+        out = solc_cache.compile_all(filename, options, solc_cache.LOW_VERSION_COMPILE_KINDS)
         return out["sources"]
 
     def extract_contract_definitions(self, sourcesList):
@@ -5,7 +5,7 @@ import json
 
 import global_params
 
-from low_version_resource.utils import run_command
+from cache import solc_cache
 from low_version_resource.ast_helper import AstHelper
 from inputter.slot_map import SlotMap
 
@@ -160,11 +160,10 @@ class SourceMap:
     @classmethod
     def _get_sig_to_func_by_contract(cls):
         if cls.allow_paths:
-            cmd = 'solc --combined-json hashes %s %s --allow-paths %s' % (cls.remap, cls.parent_filename, cls.allow_paths)
+            options = '%s --allow-paths %s' % (cls.remap, cls.allow_paths)
         else:
-            cmd = 'solc --combined-json hashes %s %s' % (cls.remap, cls.parent_filename)
-        out = run_command(cmd)
-        out = json.loads(out)
+            options = '%s' % cls.remap
+        out = solc_cache.compile_all(cls.parent_filename, options, solc_cache.LOW_VERSION_COMPILE_KINDS)
         return out['contracts']
 
     @classmethod
@@ -177,13 +176,10 @@ class SourceMap:
     @classmethod
     def _load_position_groups(cls):
         if cls.allow_paths:
-            cmd = "solc --combined-json asm %s %s --allow-paths %s" % (cls.remap, cls.parent_filename, cls.allow_paths)
+            options = "%s --allow-paths %s" % (cls.remap, cls.allow_paths)
         else:
-            cmd = "solc --combined-json asm %s %s" % (cls.remap, cls.parent_filename)
-        out = run_command(cmd)
-        # with open("try.json", "w", encoding="utf-8") as f:
-        #     f.write(out)
-        out = json.loads(out)
+            options = "%s" % cls.remap
+        out = solc_cache.compile_all(cls.parent_filename, options, solc_cache.LOW_VERSION_COMPILE_KINDS)
         
         return out['contracts']
 
@@ -0,0 +1,264 @@
+"""Analysis daemon: serve analysis jobs from pre-forked workers of a warm process"""
+
+import http.server
+import json
+import logging
+import multiprocessing
+import os
+import socketserver
+import sys
+import threading
+import time
+
+import global_params
+
+log = logging.getLogger(__name__)
+
+
+def parse_address(address):
+    """Split a server address into its transport and bind address
+
+    Args:
+        address (str): "host:port" for HTTP, anything else is a Unix socket path
+
+    Returns:
+        tuple: ("http", (host, port)) or ("unix", path)
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        return "http", (host or "127.0.0.1", int(port))
+    return "unix", address
+
+
+def _init_worker():
+    # the prints of sym_exec would interleave with the server log
+    global_params.HEADLESS = 1
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+
+def _worker_main(analyze, conn):
+    """Worker body: wait for a job, run it and send back its response"""
+    _init_worker()
+    try:
+        job = conn.recv()
+    except EOFError:
+        # the server is shutting down
+        return
+    conn.send(_run_job(analyze, job))
+    conn.close()
+
+
+def _run_job(analyze, job):
+    """Analyze the target of one job
+
+    Args:
+        analyze (callable): target -> (results, exit_code)
+        job (dict): "target" (source file or contract address), optionally
+            "contracts" (list of contract names) and "function" (function selector)
+
+    Returns:
+        dict: status, exit code and the results of sym_exec.run per contract
+    """
+    global_params.AST_JSON = "temp.%d.json" % os.getpid()
+    global_params.TARGET_CONTRACTS = job.get(
+        "contracts", global_params.TARGET_CONTRACTS
+    )
+    global_params.TARGET_FUNCTION = job.get("function", global_params.TARGET_FUNCTION)
+
+    begin = time.time()
+    response = {"target": job["target"]}
+    try:
+        results, exit_code = analyze(job["target"])
+        response["status"] = "ok"
+        response["exit_code"] = exit_code
+        response["results"] = results
+    except SystemExit as e:
+        response["status"] = "error"
+        response["exit_code"] = e.code
+    except Exception as e:
+        response["status"] = "error"
+        response["exit_code"] = 1
+        response["error"] = str(e)
+    finally:
+        if os.path.exists(global_params.AST_JSON):
+            os.unlink(global_params.AST_JSON)
+    response["wall_time"] = round(time.time() - begin, 2)
+    return response
+
+
+class JobPool:
+    """Runs every job in a process of its own, forked ahead of time
+
+    A worker runs a single job and is replaced by a fresh fork, since the
+    inputter keeps class-level state per contract. A job still running after
+    timeout seconds has its worker killed and gets a "timeout" response.
+    """
+
+    def __init__(self, analyze, workers=1, timeout=900):
+        self.analyze = analyze
+        self.timeout = timeout
+        self.ctx = multiprocessing.get_context("fork")
+        self.slots = threading.BoundedSemaphore(workers)
+        self.lock = threading.Lock()
+        self.idle = [self._fork() for _ in range(workers)]
+
+    def _fork(self):
+        conn, child_conn = self.ctx.Pipe()
+        process = self.ctx.Process(
+            target=_worker_main, args=(self.analyze, child_conn), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return process, conn
+
+    def apply(self, job):
+        """Run a job on an idle worker, once one of the slots is free"""
+        with self.slots:
+            with self.lock:
+                worker = self.idle.pop() if self.idle else self._fork()
+            try:
+                return self._run(worker, job)
+            finally:
+                with self.lock:
+                    self.idle.append(self._fork())
+
+    def _run(self, worker, job):
+        process, conn = worker
+        begin = time.time()
+        response = None
+        timed_out = False
+        try:
+            conn.send(job)
+            if conn.poll(self.timeout):
+                response = conn.recv()
+            else:
+                timed_out = True
+        except (EOFError, OSError):
+            # the worker died before reporting, e.g. killed by the OOM killer
+            pass
+        conn.close()
+        if response is not None:
+            process.join()
+            return response
+        process.kill()
+        process.join()
+        ast_json = "temp.%d.json" % process.pid
+        if os.path.exists(ast_json):
+            os.unlink(ast_json)
+        return {
+            "target": job["target"],
+            "status": "timeout" if timed_out else "error",
+            "exit_code": None if timed_out else process.exitcode,
+            "wall_time": round(time.time() - begin, 2),
+        }
+
+    def terminate(self):
+        with self.lock:
+            for process, conn in self.idle:
+                process.kill()
+                process.join()
+                conn.close()
+            self.idle = []
+
+
+def _handle(pool, request):
+    """Validate a decoded request and run it on the pool"""
+    if not isinstance(request, dict) or not isinstance(request.get("target"), str):
+        return {"status": "error", "error": 'Expected a JSON object with a "target"'}
+    log.info("Job: %s", request["target"])
+    response = pool.apply(request)
+    log.info("Job: %s: %s", request["target"], response["status"])
+    return response
+
+
+class UnixJobHandler(socketserver.StreamRequestHandler):
+    """One JSON job per line in, one JSON response per line out"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {"status": "error", "error": "Invalid JSON: %s" % e}
+            else:
+                response = _handle(self.server.pool, request)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class HTTPJobHandler(http.server.BaseHTTPRequestHandler):
+    """POST /analyze with a JSON job, GET /health to probe the server"""
+
+    def _reply(self, code, response):
+        body = json.dumps(response).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        else:
+            self._reply(404, {"status": "error", "error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self._reply(404, {"status": "error", "error": "Not found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            self._reply(400, {"status": "error", "error": "Invalid JSON: %s" % e})
+            return
+        response = _handle(self.server.pool, request)
+        self._reply(200 if response["status"] == "ok" else 422, response)
+
+    def log_message(self, format, *args):
+        log.debug(format, *args)
+
+
+class UnixJobServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class HTTPJobServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def serve(address, analyze, workers=1, timeout=900):
+    """Serve analysis jobs until interrupted
+
+    The calling process has already imported the analysis stack and checked its
+    dependencies. Jobs run in workers forked from it, see JobPool.
+
+    Args:
+        address (str): Unix socket path, or "host:port" to serve HTTP
+        analyze (callable): target -> (results, exit_code)
+        workers (int, optional): number of concurrent jobs. Defaults to 1.
+        timeout (int, optional): wall-clock budget per job in secs. Defaults to 900.
+    """
+    transport, bind_address = parse_address(address)
+    pool = JobPool(analyze, workers, timeout)
+    if transport == "unix":
+        if os.path.exists(bind_address):
+            os.unlink(bind_address)
+        server = UnixJobServer(bind_address, UnixJobHandler)
+    else:
+        server = HTTPJobServer(bind_address, HTTPJobHandler)
+    server.pool = pool
+    log.info("Serving on %s (%s) with %d workers", address, transport, workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.terminate()
+        if transport == "unix" and os.path.exists(bind_address):
+            os.unlink(bind_address)
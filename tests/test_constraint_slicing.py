@@ -0,0 +1,87 @@
+import pytest
+from z3 import BitVec, BitVecSort, BitVecVal, Function, sat, unsat
+
+from cfg_builder import constraint_slicing
+from cfg_builder.constraint_slicing import (
+    check_constraints,
+    independent_groups,
+    variables,
+)
+from cfg_builder.path_solver import PathSolver
+from cfg_builder.query_cache import query_cache
+
+x = BitVec("x", 256)
+y = BitVec("y", 256)
+z = BitVec("z", 256)
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    constraint_slicing.reset()
+    query_cache.reset()
+
+
+def groups_of(constraints):
+    return sorted(
+        (sorted(str(c) for c in group), sorted(names))
+        for group, names in independent_groups(constraints)
+    )
+
+
+def test_variables_include_uninterpreted_functions():
+    balance = Function("balance", BitVecSort(256), BitVecSort(256))
+    assert variables(balance(x) + y > 1) == {"balance", "x", "y"}
+    assert variables(BitVecVal(1, 256) > 0) == frozenset()
+
+
+def test_constraints_sharing_no_variable_are_independent():
+    assert groups_of([x > 1, y > 2, x < 5]) == [
+        (["x < 5", "x > 1"], ["x"]),
+        (["y > 2"], ["y"]),
+    ]
+
+
+def test_groups_are_joined_through_shared_variables():
+    # x and z only meet through the constraint on x + y and y + z
+    assert groups_of([x > 1, z > 1, x + y > 2, y + z < 9]) == [
+        (
+            sorted(str(c) for c in [x > 1, z > 1, x + y > 2, y + z < 9]),
+            ["x", "y", "z"],
+        )
+    ]
+
+
+def test_constant_constraints_form_their_own_group():
+    constant = BitVecVal(2, 256) > BitVecVal(1, 256)
+    groups = independent_groups([x > 1, constant])
+    assert ([constant], set()) in groups
+
+
+def test_an_unsat_group_makes_the_query_unsat():
+    solver = PathSolver()
+    solver.add(x > 5, y > 1)
+    assert check_constraints(solver, [x < 3])[0] == unsat
+    assert check_constraints(solver, [y < 3])[0] == sat
+
+
+def test_models_cover_every_group():
+    solver = PathSolver()
+    solver.add(x == 7)
+    solver.add(y == 9)
+    result, models = check_constraints(solver, [z > 100])
+    assert result == sat
+    values = {}
+    for names, model in models:
+        for name in names:
+            var = {"x": x, "y": y, "z": z}[name]
+            values[name] = model.eval(var).as_long()
+    assert values["x"] == 7 and values["y"] == 9 and values["z"] > 100
+
+
+def test_groups_decided_before_come_from_the_query_cache():
+    solver = PathSolver()
+    solver.add(x > 5, y > 1)
+    check_constraints(solver, [z == 1])
+    hits = query_cache.hits
+    check_constraints(solver, [z == 2])
+    assert query_cache.hits > hits
@@ -0,0 +1,81 @@
+from cfg_builder.cow_dict import CowDict
+
+
+def make_pair():
+    parent = CowDict({"stack": [1, 2], "state": {"balance": {"a": 1}}, "pc": 0})
+    return parent, parent.fork()
+
+
+def test_fork_isolates_nested_containers():
+    parent, child = make_pair()
+    child["stack"].append(3)
+    child["state"]["balance"]["a"] = 2
+    child["pc"] = 5
+    assert parent["stack"] == [1, 2]
+    assert parent["state"]["balance"] == {"a": 1}
+    assert parent["pc"] == 0
+    assert child["stack"] == [1, 2, 3]
+    assert child["state"]["balance"] == {"a": 2}
+
+
+def test_the_parent_side_is_isolated_too():
+    parent, child = make_pair()
+    parent["stack"].append(3)
+    parent["state"]["balance"]["b"] = 1
+    assert child["stack"] == [1, 2]
+    assert child["state"]["balance"] == {"a": 1}
+
+
+def test_a_value_is_copied_once():
+    parent, child = make_pair()
+    stack = child["stack"]
+    assert child["stack"] is stack
+
+
+def test_a_replaced_value_is_not_copied():
+    parent, child = make_pair()
+    stack = [7]
+    child["stack"] = stack
+    assert child["stack"] is stack
+    assert parent["stack"] == [1, 2]
+
+
+def test_values_and_items_copy_shared_values():
+    parent, child = make_pair()
+    for value in child.values():
+        if isinstance(value, list):
+            value.append(3)
+    for key, value in child.items():
+        if key == "state":
+            value["balance"]["a"] = 2
+    assert parent["stack"] == [1, 2]
+    assert parent["state"]["balance"] == {"a": 1}
+    assert child["stack"] == [1, 2, 3]
+
+
+def test_pop_and_setdefault_hand_out_copies():
+    parent, child = make_pair()
+    child.pop("stack").append(3)
+    child.setdefault("state")["balance"]["a"] = 2
+    assert "stack" not in child
+    assert parent["stack"] == [1, 2]
+    assert parent["state"]["balance"] == {"a": 1}
+    assert child.setdefault("gas", 10) == 10
+    assert "gas" not in parent
+
+
+def test_update_from_a_forked_dict_leaves_its_sibling_alone():
+    parent, child = make_pair()
+    other = CowDict()
+    other.update(child, pc=1)
+    other["stack"].append(3)
+    assert other["pc"] == 1
+    assert parent["stack"] == [1, 2]
+
+
+def test_copy_forks():
+    parent = CowDict({"stack": [1]})
+    child = parent.copy()
+    child["stack"].append(2)
+    assert isinstance(child, CowDict)
+    assert parent["stack"] == [1]
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+from z3 import BitVec
+
+from cfg_builder import sym_exec
+
+owner = BitVec("owner", 256)
+_from = BitVec("from", 256)
+_to = BitVec("to", 256)
+
+
+@pytest.fixture
+def explorer(monkeypatch):
+    monkeypatch.setattr(sym_exec, "g_src_map", None, raising=False)
+    sym_exec.initGlobalVars()
+    monkeypatch.setattr(sym_exec, "is_feasible", lambda *args: True)
+    monkeypatch.setattr(sym_exec, "branch_successor", lambda *args: None)
+
+
+def defer(state):
+    branch = SimpleNamespace(
+        params=SimpleNamespace(path_conditions_and_vars={"path_condition": []}),
+        edge=sym_exec.Edge(1, 2),
+    )
+    sym_exec.deferred.push(1, (branch, None, state))
+
+
+def test_a_deferred_side_sees_the_state_it_was_deferred_with(explorer, monkeypatch):
+    seen = []
+    monkeypatch.setattr(
+        sym_exec, "explore", lambda task: seen.append(sym_exec.detector_state())
+    )
+    defer((_from, None, None, 1, None, "f", False, "f()"))
+    sym_exec.restore_detector_state((None, None, None, 3, owner, "g", True, "g()"))
+
+    sym_exec.explore_deferred(0, 0)
+
+    assert seen == [(_from, None, None, 1, None, "f", False, "f()")]
+
+
+def test_what_later_paths_found_is_kept_after_a_deferred_side(explorer, monkeypatch):
+    def side(task):
+        # the side finds _to and stores, but no owner
+        sym_exec.restore_detector_state((_from, _to, None, 2, None, "f", True, "f()"))
+
+    monkeypatch.setattr(sym_exec, "explore", side)
+    defer((_from, None, None, 1, None, "f", False, "f()"))
+    # an owner was found on the paths explored since the deferral
+    sym_exec.restore_detector_state((None, None, None, 3, owner, "g", False, "g()"))
+
+    sym_exec.explore_deferred(0, 0)
+
+    assert sym_exec.detector_state() == (_from, _to, None, 3, owner, "g", True, "g()")
+    assert sym_exec.visited_edges[sym_exec.Edge(1, 2)] == 0
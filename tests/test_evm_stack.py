@@ -0,0 +1,49 @@
+from cfg_builder.evm_stack import EVMStack
+
+
+def make_stack(*top_first):
+    """A stack holding the items given top first"""
+    return EVMStack(reversed(top_first))
+
+
+def test_push_and_pop_at_the_top():
+    stack = EVMStack()
+    stack.push(1)
+    stack.push(2)
+    assert stack.peek() == 2
+    assert stack.pop() == 2
+    assert stack.pop() == 1
+    assert not stack
+
+
+def test_peek_counts_from_the_top():
+    stack = make_stack("a", "b", "c")
+    assert [stack.peek(depth) for depth in range(3)] == ["a", "b", "c"]
+    # plain indexing counts from the bottom
+    assert stack[0] == "c"
+
+
+def test_dup_pushes_the_nth_item():
+    stack = make_stack("a", "b", "c")
+    stack.dup(1)
+    assert stack == make_stack("a", "a", "b", "c")
+    stack.dup(4)
+    assert stack == make_stack("c", "a", "a", "b", "c")
+
+
+def test_swap_exchanges_the_top_with_the_nth_item_below():
+    stack = make_stack("a", "b", "c", "d")
+    stack.swap(1)
+    assert stack == make_stack("b", "a", "c", "d")
+    stack.swap(3)
+    assert stack == make_stack("d", "a", "c", "b")
+
+
+def test_copy_is_an_independent_evm_stack():
+    stack = make_stack("a", "b")
+    copy = stack.copy()
+    copy.push("c")
+    copy.swap(1)
+    assert isinstance(copy, EVMStack)
+    assert stack == make_stack("a", "b")
+    assert copy == make_stack("a", "c", "b")
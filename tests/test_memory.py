@@ -0,0 +1,94 @@
+from z3 import BitVec
+
+from cfg_builder.memory import PAGE_SIZE, Memory
+
+value = BitVec("value", 256)
+
+
+def test_words_are_keyed_by_address():
+    mem = Memory()
+    mem[0] = 5
+    mem["Extract(255, 0, x)"] = value
+    assert mem[0] == 5 and mem["Extract(255, 0, x)"] is value
+    assert 0 in mem and 32 not in mem
+    assert len(mem) == 2
+    mem.clear()
+    assert len(mem) == 0
+
+
+def test_a_stored_word_is_read_back_big_endian():
+    mem = Memory()
+    mem.write_word(0, 0x0102)
+    assert mem.read(0, 32) == bytes(30) + b"\x01\x02"
+    assert mem.read(30, 4) == b"\x01\x02\x00\x00"
+
+
+def test_unwritten_bytes_read_as_zero():
+    mem = Memory()
+    assert mem.read(1000, 8) == bytes(8)
+
+
+def test_words_wrap_to_256_bits():
+    mem = Memory()
+    mem.write_word(0, -1)
+    assert mem.read(0, 32) == b"\xff" * 32
+
+
+def test_a_word_may_straddle_two_pages():
+    mem = Memory()
+    mem.write_word(PAGE_SIZE - 16, 2**256 - 1)
+    assert mem.read(PAGE_SIZE - 16, 32) == b"\xff" * 32
+    assert mem.read(PAGE_SIZE - 17, 1) == b"\x00"
+    assert mem.read(PAGE_SIZE + 16, 1) == b"\x00"
+
+
+def test_only_written_pages_are_allocated():
+    mem = Memory()
+    mem.write_byte(10 * PAGE_SIZE, 0x1FF)
+    assert list(mem.pages) == [10]
+    assert mem.read(10 * PAGE_SIZE, 1) == b"\xff"
+
+
+def test_key_of_concrete_bytes_is_their_content():
+    mem = Memory()
+    mem.write_word(0, 7)
+    other = Memory()
+    other.write_word(0, 7)
+    assert mem.key(0, 32) == other.key(0, 32) == bytes(31) + b"\x07"
+
+
+def test_key_keeps_the_bytes_of_symbolic_values():
+    mem = Memory()
+    mem.write_word(0, value)
+    mem.write_byte(32, 1)
+    key = mem.key(16, 17)
+    assert isinstance(key, tuple)
+    assert key[0] == ("value", 16)
+    assert key[-1] == 1
+    # a concrete write replaces the symbolic bytes
+    mem.write_word(0, 3)
+    assert mem.key(0, 32) == bytes(31) + b"\x03"
+
+
+def test_fork_shares_pages_until_written():
+    parent = Memory()
+    parent.write_word(0, 1)
+    parent[0] = 1
+    child = parent.fork()
+    assert child.pages[0] is parent.pages[0]
+
+    child.write_word(0, 2)
+    child[0] = 2
+    assert parent.read(0, 32)[-1] == 1 and parent[0] == 1
+    assert child.read(0, 32)[-1] == 2 and child[0] == 2
+
+    parent.write_byte(31, 3)
+    assert child.read(31, 1) == b"\x02"
+
+
+def test_fork_isolates_the_symbolic_overlay():
+    parent = Memory()
+    child = parent.fork()
+    child.write_word(0, value)
+    assert isinstance(child.key(0, 32), tuple)
+    assert parent.key(0, 32) == bytes(32)
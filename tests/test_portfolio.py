@@ -0,0 +1,62 @@
+import pytest
+from z3 import ULT, And, BitVec, sat, unsat
+
+import global_params
+from cfg_builder import constraint_slicing, portfolio
+from cfg_builder.path_solver import PathSolver
+from cfg_builder.portfolio import portfolio_stats
+from cfg_builder.query_cache import QueryCache, query_cache
+
+x = BitVec("x", 24)
+y = BitVec("y", 24)
+
+# factoring 4093 * 4091 takes z3 tens of ms, well past a budget of 1 ms
+hard = [x * y == 4093 * 4091, ULT(1, x), ULT(1, y), ULT(x, 2**13), ULT(y, 2**13)]
+
+
+@pytest.fixture(autouse=True)
+def portfolio_of_two(monkeypatch):
+    monkeypatch.setattr(global_params, "PORTFOLIO", 2)
+    monkeypatch.setattr(global_params, "PORTFOLIO_THRESHOLD", 1)
+    monkeypatch.setattr(global_params, "TIMEOUT", 5000)
+    monkeypatch.setattr(global_params, "SHORT_TIMEOUT", 0)
+    constraint_slicing.reset()
+    query_cache.reset()
+    portfolio_stats.reset()
+
+
+def test_queries_decided_in_process_are_not_raced(monkeypatch):
+    monkeypatch.setattr(global_params, "PORTFOLIO_THRESHOLD", 1000)
+    result, model = QueryCache().check(hard)
+    assert result == sat
+    assert model.eval(And(hard))
+    assert portfolio_stats.queries == 0
+
+
+def test_an_undecided_query_is_raced_and_keeps_its_model():
+    result, model = QueryCache().check(hard)
+    assert result == sat
+    assert portfolio_stats.queries == 1
+    assert model is not None
+    assert model.eval(And(hard))
+
+
+def test_an_unsat_answer_of_the_portfolio_has_no_model():
+    assert portfolio.solve([x > 5, x < 3], 1000) == (unsat, None)
+
+
+def test_the_path_solver_races_after_its_incremental_check():
+    solver = PathSolver()
+    solver.add(hard)
+    assert solver.check() == sat
+    assert portfolio_stats.queries == 1
+    [(names, model)] = solver.models
+    assert names == {"x", "y"}
+    assert model.eval(And(hard))
+
+
+def test_no_query_leaves_the_process_when_disabled(monkeypatch):
+    monkeypatch.setattr(global_params, "PORTFOLIO", 0)
+    assert portfolio.local_budget(5000) == 5000
+    assert QueryCache().check(hard)[0] == sat
+    assert portfolio_stats.queries == 0
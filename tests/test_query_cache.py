@@ -0,0 +1,51 @@
+from z3 import BitVec, BitVecVal, sat, unsat
+
+import global_params
+from cfg_builder.query_cache import QueryCache
+
+x = BitVec("x", 256)
+y = BitVec("y", 256)
+
+
+def test_outcomes_are_reused_for_the_same_constraints():
+    cache = QueryCache()
+    result, model = cache.check([x > 5, x < 10])
+    assert result == sat
+    assert 5 < model.eval(x).as_long() < 10
+    assert cache.misses == 1
+
+    # rebuilt expressions are the same z3 nodes, in any order
+    assert cache.check([x < 10, x > 5]) == (sat, model)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_unsat_is_cached_without_a_model():
+    cache = QueryCache()
+    assert cache.check([x > 5, x < 3]) == (unsat, None)
+    assert cache.lookup([x < 3, x > 5]) == (unsat, None)
+
+
+def test_a_different_set_of_constraints_misses():
+    cache = QueryCache()
+    cache.check([x > 5])
+    assert cache.lookup([x > 5, y == BitVecVal(1, 256)]) is None
+    assert cache.lookup([x > 6]) is None
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(global_params, "QUERY_CACHE_SIZE", 2)
+    cache = QueryCache()
+    cache.check([x > 1])
+    cache.check([x > 2])
+    cache.lookup([x > 1])
+    cache.check([x > 3])
+    assert cache.lookup([x > 1]) is not None
+    assert cache.lookup([x > 2]) is None
+    assert cache.lookup([x > 3]) is not None
+
+
+def test_nothing_is_kept_with_a_size_of_zero(monkeypatch):
+    monkeypatch.setattr(global_params, "QUERY_CACHE_SIZE", 0)
+    cache = QueryCache()
+    cache.check([x > 1])
+    assert cache.lookup([x > 1]) is None
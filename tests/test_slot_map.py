@@ -0,0 +1,37 @@
+import pytest
+
+from cfg_builder.keccak import keccak256, mapping_slot
+from inputter.slot_map import SlotMap
+
+
+def entry(key, slot):
+    """the storage position of mapping[key], the mapping declared at slot"""
+    return keccak256(key.to_bytes(32, "big") + slot.to_bytes(32, "big"))
+
+
+@pytest.fixture
+def slot_map(monkeypatch):
+    slot_map = SlotMap.__new__(SlotMap)
+    monkeypatch.setattr(slot_map, "simpler_slot_map", {0: ["_name"], 2: ["_owners"]})
+    return slot_map
+
+
+def test_the_position_of_a_mapping_entry_is_the_real_digest():
+    # keccak256(abi.encode(0, 0)), as computed by the EVM
+    assert entry(0, 0) == int(
+        "ad3228b676f7d3cd4284a5443f17f1962b36e491b30a40b2405849e597ba5fb5", 16
+    )
+
+
+def test_a_mapping_entry_resolves_to_the_slot_of_its_mapping():
+    assert mapping_slot(entry(7, 2)) == 2
+    assert mapping_slot(entry(1, entry(7, 2))) == 2
+    assert mapping_slot(2) is None
+
+
+def test_names_of_plain_slots_and_mapping_entries(slot_map):
+    assert slot_map.var_names(0) == ["_name"]
+    assert slot_map.var_names(entry(7, 2)) == ["_owners"]
+    assert slot_map.var_names(entry(3, entry(7, 2))) == ["_owners"]
+    assert slot_map.var_names(5) == []
+    assert slot_map.var_names("some_var_3") == []
@@ -7,9 +7,13 @@ import re
 import subprocess
 import json
 import global_params
+from batch import is_address, load_targets, run_batch
+from cache import result_cache
 from crawler.crawl import crawl_contract
+from server import serve
 
 from cfg_builder import sym_exec
+from cfg_builder.search import SEARCH_STRATEGIES
 from cfg_builder.utils import run_command
 from inputter.input_helper import InputHelper
 from inputter.solc_version_switcher import *
@@ -78,22 +82,6 @@ def has_dependencies_installed():
         )
         return False
 
-    if not cmd_exists("evm"):
-        logging.critical(
-            "Please install evm from go-ethereum and make sure it is in the path."
-        )
-        return False
-    else:
-        cmd = "evm --version"
-        out = run_command(cmd).strip()
-        evm_version = re.findall(r"evm version (\d*.\d*.\d*)", out)[0]
-        tested_evm_version = "1.10.21"
-        if compare_versions(evm_version, tested_evm_version) > 0:
-            logging.warning(
-                "You are using evm version %s. The supported version is %s"
-                % (evm_version, tested_evm_version)
-            )
-
     if not cmd_exists("solc"):
         logging.critical(
             "solc is missing. Please install the solidity compiler and make sure solc is in the path."
@@ -132,14 +120,27 @@ def run_solidity_analysis(inputs):
     # for our tool, we must find some key features
     for inp in inputs:
         logging.info("contract %s:", inp["contract"])
-        with open("temp.json", "w", encoding="utf-8") as f:
-            f.write(json.dumps(inp["source_map"].ast_helper.contracts))
-        result, return_code = sym_exec.run(
-            disasm_file=inp["disasm_file"],
-            source_map=inp["source_map"],
-            slot_map=inp["slot_map"],
-            source_file=inp["source"],
-        )
+        cache_key = cached = None
+        if global_params.USE_CACHE:
+            cache_key = result_cache.result_key(inp)
+            cached = result_cache.get(cache_key)
+        if cached:
+            logging.info("Reusing the cached results of an identical contract")
+            result, return_code = cached
+            result["address"] = global_params.CONTRACT_ADDRESS
+        else:
+            with open(global_params.AST_JSON, "w", encoding="utf-8") as f:
+                f.write(json.dumps(inp["source_map"].ast_helper.contracts))
+            result, return_code = sym_exec.run(
+                disasm_file=inp["disasm_file"],
+                source_map=inp["source_map"],
+                slot_map=inp["slot_map"],
+                source_file=inp["source"],
+                bytecode=inp["bytecode"],
+            )
+            # a run cut short by GLOBAL_TIMEOUT reports what it reached in time
+            if cache_key and not sym_exec.g_timeout:
+                result_cache.put(cache_key, result, return_code)
 
         try:
             c_source = inp["c_source"]
@@ -161,7 +162,7 @@ def analyze_solidity(input_type="solidity"):
         input_type (str, optional): The type of input. Defaults to 'solidity'.
 
     Returns:
-        integer: The exit status of the execution.
+        Tuple[Dict[str, Dict[str, Any]], int]: analysis results and the exit status of the execution.
     """
     global args
     # print(global_params.SOLC_VERSION)
@@ -188,13 +189,48 @@ def analyze_solidity(input_type="solidity"):
             evm=args.evm,
             compilation_err=args.compilation_error,)
     else:
-        return
+        return None, 0
     inputs = helper.get_inputs(global_params.TARGET_CONTRACTS)
 
-    _, exit_code = run_solidity_analysis(inputs)
+    results, exit_code = run_solidity_analysis(inputs)
     helper.rm_tmp_files()
 
-    return exit_code
+    return results, exit_code
+
+
+def resolve_source(contract_address):
+    """Locate the crawled source of a mainnet contract, crawling it if needed
+
+    Args:
+        contract_address (str): the address of the contract
+
+    Returns:
+        str: path of the main source file
+    """
+    target_path = os.path.join(
+        global_params.CRAWL_DIR, contract_address, contract_address
+    )
+    if not os.path.exists(target_path + ".sol"):
+        crawl_contract(global_params.CRAWL_DIR, contract_address)
+    return target_path + ".sol"
+
+
+def analyze_target(target):
+    """Analyze one batch target (a source file or a contract address) in a worker
+
+    Args:
+        target (str): source file or contract address
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], int]: analysis results and the exit status
+    """
+    global args
+    if is_address(target):
+        global_params.CONTRACT_ADDRESS = target
+        target = resolve_source(target)
+    global_params.SOURCE = target
+    args.source = target
+    return analyze_solidity()
 
 
 def main():
@@ -223,6 +259,70 @@ def main():
         dest="contract_address",
     )
 
+    group.add_argument(
+        "-b",
+        "--batch",
+        type=str,
+        help="Analyze a corpus: a CSV of addresses or source files, a directory of .sol files, or a file list.",
+    )
+
+    group.add_argument(
+        "-srv",
+        "--serve",
+        type=str,
+        help='Run as a daemon serving analysis jobs on a Unix socket path, or over HTTP on "host:port".',
+    )
+
+    parser.add_argument(
+        "-bo",
+        "--batch-output",
+        help="JSONL file receiving one record per batch target. An existing file is resumed.",
+        action="store",
+        dest="batch_output",
+        type=str,
+        default="batch_results.jsonl",
+    )
+    parser.add_argument(
+        "-bw",
+        "--batch-workers",
+        help="Number of worker processes in batch mode",
+        action="store",
+        dest="batch_workers",
+        type=int,
+    )
+    parser.add_argument(
+        "-bt",
+        "--batch-timeout",
+        help="Wall-clock budget per batch target in secs, compilation included",
+        action="store",
+        dest="batch_timeout",
+        type=int,
+    )
+
+    parser.add_argument(
+        "-sw",
+        "--server-workers",
+        help="Number of pre-forked worker processes in server mode",
+        action="store",
+        dest="server_workers",
+        type=int,
+    )
+    parser.add_argument(
+        "-swt",
+        "--server-timeout",
+        help="Wall-clock budget per server job in secs, compilation included",
+        action="store",
+        dest="server_timeout",
+        type=int,
+    )
+
+    parser.add_argument(
+        "-nc",
+        "--no-cache",
+        help="Analyze every contract even if an identical one was analyzed before",
+        action="store_true",
+    )
+
     parser.add_argument(
         "-ap",
         "--allow-paths",
@@ -264,6 +364,37 @@ def main():
     parser.add_argument(
         "-t", "--timeout", help="Timeout for Z3 in ms.", action="store", type=int
     )
+    parser.add_argument(
+        "-st",
+        "--short-timeout",
+        help="First, shorter timeout for Z3 in ms, escalated tenfold up to --timeout",
+        action="store",
+        dest="short_timeout",
+        type=int,
+    )
+    parser.add_argument(
+        "-ou",
+        "--on-unknown",
+        help="Branches undecided within the short timeout: defer them to a longer timeout, or explore them (default: defer)",
+        choices=("defer", "explore"),
+        default="defer",
+    )
+    parser.add_argument(
+        "-pf",
+        "--portfolio",
+        help="Race the solver queries undecided after --portfolio-threshold ms in this many processes with different Z3 configurations (default: 0, disabled)",
+        action="store",
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        "-pft",
+        "--portfolio-threshold",
+        help="Time in ms a solver query is checked in the analysis process before it is raced in the portfolio (default: 200)",
+        action="store",
+        dest="portfolio_threshold",
+        type=int,
+    )
     parser.add_argument(
         "-gl",
         "--gaslimit",
@@ -289,6 +420,14 @@ def main():
         type=int,
     )
 
+    parser.add_argument(
+        "-se",
+        "--search",
+        help="Path search strategy (default: dfs)",
+        choices=SEARCH_STRATEGIES,
+        default="dfs",
+    )
+
     parser.add_argument(
         "-glt",
         "--global-timeout",
@@ -316,7 +455,7 @@ def main():
     )
 
     parser.add_argument(
-        "-e", "--evm", help="Do not remove the .evm file.", action="store_true"
+        "-e", "--evm", help="Keep the .evm file and its disassembly.", action="store_true"
     )
     parser.add_argument(
         "-j", "--json", help="Redirect results to a json file.", action="store_true"
@@ -333,11 +472,21 @@ def main():
     parser.add_argument(
         "-v", "--verbose", help="Verbose output, print everything.", action="store_true"
     )
+    parser.add_argument(
+        "-hl",
+        "--headless",
+        help="Do not draw the live tables of the exploration",
+        action="store_true",
+    )
     parser.add_argument(
         "-pl",
         "--parallel",
-        help="Run WakeMint in parallel. Note: The performance may depend on the contract",
-        action="store_true",
+        help="Explore the function entry blocks of a contract in N worker processes (all cores if N is omitted). Note: The performance may depend on the contract",
+        action="store",
+        nargs="?",
+        const=os.cpu_count(),
+        default=0,
+        type=int,
     )
     parser.add_argument(
         "-ce",
@@ -363,6 +512,12 @@ def main():
 
     if args.timeout:
         global_params.TIMEOUT = args.timeout
+    if args.short_timeout is not None:
+        global_params.SHORT_TIMEOUT = args.short_timeout
+    global_params.UNKNOWN_POLICY = args.on_unknown
+    global_params.PORTFOLIO = args.portfolio
+    if args.portfolio_threshold:
+        global_params.PORTFOLIO_THRESHOLD = args.portfolio_threshold
 
     logging.basicConfig()
     rootLogger = logging.getLogger(None)
@@ -377,9 +532,12 @@ def main():
 
     global_params.STORE_RESULT = 1 if args.json else 0
     global_params.DEBUG_MODE = 1 if args.debug else 0
+    global_params.HEADLESS = 1 if args.headless else 0
     global_params.GENERATE_TEST_CASES = 1 if args.generate_test_cases else 0
-    global_params.PARALLEL = 1 if args.parallel else 0
+    global_params.PARALLEL = args.parallel
+    global_params.SEARCH = args.search
     global_params.SOLC_SWITCH = 1 if args.automated_solc_version_switch else 0
+    global_params.USE_CACHE = 0 if args.no_cache else 1
 
     if args.solc_version:
         global_params.SOLC_VERSION = args.solc_version
@@ -393,13 +551,7 @@ def main():
     if args.source:
         global_params.SOURCE = args.source
     elif args.contract_address:
-        target_path = os.path.join(
-            global_params.CRAWL_DIR, args.contract_address, args.contract_address
-        )
-        if not os.path.exists(target_path + ".sol"):
-            crawl_contract(global_params.CRAWL_DIR, args.contract_address)
-
-        global_params.SOURCE = target_path + ".sol"
+        global_params.SOURCE = resolve_source(args.contract_address)
         args.source = global_params.SOURCE
 
     # set limit to set execution bounds
@@ -411,12 +563,39 @@ def main():
         global_params.LOOP_LIMIT = args.loop_limit
     if args.global_timeout:
         global_params.GLOBAL_TIMEOUT = args.global_timeout
+    if args.batch_workers:
+        global_params.BATCH_WORKERS = args.batch_workers
+    if args.batch_timeout:
+        global_params.BATCH_TIMEOUT = args.batch_timeout
+    if args.server_workers:
+        global_params.SERVER_WORKERS = args.server_workers
+    if args.server_timeout:
+        global_params.SERVER_TIMEOUT = args.server_timeout
 
     if not has_dependencies_installed():
         return
 
+    if args.batch:
+        failures = run_batch(
+            load_targets(args.batch),
+            analyze_target,
+            args.batch_output,
+            workers=global_params.BATCH_WORKERS,
+            timeout=global_params.BATCH_TIMEOUT,
+        )
+        exit(1 if failures else 0)
+
+    if args.serve:
+        serve(
+            args.serve,
+            analyze_target,
+            workers=global_params.SERVER_WORKERS,
+            timeout=global_params.SERVER_TIMEOUT,
+        )
+        exit(0)
+
     # analyze Solidity source code
-    exit_code = analyze_solidity()
+    _, exit_code = analyze_solidity()
     
 
     exit(exit_code)